@@ -0,0 +1,328 @@
+"""
+Benchmark harness: generates a synthetic content/ tree and times every stage of the build.
+
+Run with: python3 src/bench.py [--pages N] [--page-size BYTES] [--depth N] [--mix TYPE=WEIGHT,...]
+                              [--output results.json] [--compare baseline.json]
+
+The corpus is generated from a fixed seed, so results from different commits are comparable.
+Each stage is timed on its own over the whole corpus, so later stages re-run the earlier parsing
+steps they depend on and the stage times overlap rather than add up. The inline memo is emptied
+before each timed run, so no run reuses fragments rendered by an earlier one.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from functions import (
+    INLINE_MEMO_SIZE,
+    classify_block,
+    generate_pages_recursively,
+    markdown_to_blocks,
+    markdown_to_html_node,
+    set_inline_memo_size,
+    text_to_textnodes,
+    extract_title,
+)
+from template import Template
+
+
+DEFAULT_MIX = {
+    "paragraph": 6,
+    "header": 2,
+    "unordered_list": 2,
+    "ordered_list": 1,
+    "code": 1,
+    "quote": 1,
+}
+
+WORDS = (
+    "middle earth ring hobbit elf wizard mountain river forest shadow light journey road "
+    "council fellowship sword tower king dwarf song star morning night fire stone"
+).split()
+
+TEMPLATE = """<!doctype html>
+<html>
+  <head>
+    <title>{{ Title }}</title>
+    <link href="/index.css" rel="stylesheet" />
+  </head>
+  <body>
+    <article>{{ Content }}</article>
+  </body>
+</html>"""
+
+STAGES = [
+    "read",
+    "markdown_to_blocks",
+    "block_to_block_type",
+    "text_to_textnodes",
+    "html_tree",
+    "to_html",
+    "template",
+    "write",
+]
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown block type in mix: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def inline_text(rng, words):
+    parts = []
+    for _ in range(words):
+        word = rng.choice(WORDS)
+        roll = rng.random()
+        if roll < 0.05:
+            word = f"**{word}**"
+        elif roll < 0.10:
+            word = f"_{word}_"
+        elif roll < 0.13:
+            word = f"`{word}`"
+        elif roll < 0.17:
+            word = f"[{word}](/{rng.choice(WORDS)}/{rng.choice(WORDS)})"
+        elif roll < 0.18:
+            word = f"![{word}](/images/{rng.choice(WORDS)}.png)"
+        parts.append(word)
+    return " ".join(parts)
+
+
+def make_block(rng, block_type):
+    if block_type == "paragraph":
+        return "\n".join(inline_text(rng, rng.randint(8, 20)) for _ in range(rng.randint(1, 4)))
+    if block_type == "header":
+        return "#" * rng.randint(2, 4) + " " + inline_text(rng, rng.randint(2, 6))
+    if block_type == "unordered_list":
+        return "\n".join("- " + inline_text(rng, rng.randint(3, 10)) for _ in range(rng.randint(2, 8)))
+    if block_type == "ordered_list":
+        return "\n".join(f"{i}. " + inline_text(rng, rng.randint(3, 10)) for i in range(1, rng.randint(3, 9)))
+    if block_type == "code":
+        return "```\n" + "\n".join(f"    {rng.choice(WORDS)} = {i}" for i in range(rng.randint(2, 10))) + "\n```"
+    return "\n".join("> " + inline_text(rng, rng.randint(5, 12)) for _ in range(rng.randint(1, 4)))
+
+
+def make_page(rng, title, page_size, mix):
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    blocks = [f"# {title}"]
+    size = len(blocks[0])
+    while size < page_size:
+        block = make_block(rng, rng.choices(names, weights)[0])
+        blocks.append(block)
+        size += len(block) + 2
+    return "\n\n".join(blocks) + "\n"
+
+
+def generate_corpus(root, pages=100, page_size=4096, depth=2, mix=None, seed=0):
+    """
+    Writes a synthetic site (content/ and template.html) under a directory.
+
+    Args:
+        root (str): The directory to create the site in.
+        pages (int): The number of markdown pages.
+        page_size (int): The approximate size of each page in bytes.
+        depth (int): How many directory levels pages are spread across.
+        mix (dict, optional): Relative weights of the block types.
+        seed (int): The random seed; the same arguments always produce the same corpus.
+
+    Returns:
+        int: The total number of markdown bytes written.
+    """
+    rng = random.Random(seed)
+    mix = mix or DEFAULT_MIX
+    content_dir = os.path.join(root, "content")
+    total = 0
+    for i in range(pages):
+        directories = [f"section{(i // (4 ** level)) % 4}" for level in range(depth)]
+        page_dir = os.path.join(content_dir, *directories)
+        os.makedirs(page_dir, exist_ok=True)
+        data = make_page(rng, f"Page {i}", page_size, mix).encode("utf-8")
+        with open(os.path.join(page_dir, f"page{i}.md"), 'wb') as f:
+            f.write(data)
+        total += len(data)
+    with open(os.path.join(root, "template.html"), 'w', encoding='utf-8') as f:
+        f.write(TEMPLATE)
+    return total
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def time_stages(sources, template, out_dir):
+    """
+    Times each build stage over all sources.
+
+    Args:
+        sources (list of tuple): (path, markdown) pairs.
+        template (Template): The compiled template.
+        out_dir (str): A scratch directory for the write stage.
+
+    Returns:
+        dict: Seconds spent in each stage.
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    for path, _ in sources:
+        with open(path, 'r', encoding='utf-8') as f:
+            f.read()
+    timings["read"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    all_blocks = [markdown_to_blocks(markdown) for _, markdown in sources]
+    timings["markdown_to_blocks"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parsed = [[classify_block(block) for block in blocks] for blocks in all_blocks]
+    timings["block_to_block_type"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for page in parsed:
+        for block in page:
+            if block.block_type.value != "code":
+                for item in block.items:
+                    text_to_textnodes(item)
+    timings["text_to_textnodes"] = time.perf_counter() - start
+
+    set_inline_memo_size(INLINE_MEMO_SIZE)
+    start = time.perf_counter()
+    trees = [markdown_to_html_node(markdown, basepath=template.basepath) for _, markdown in sources]
+    timings["html_tree"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bodies = [tree.to_html() for tree in trees]
+    timings["to_html"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pages = [template.render(extract_title(markdown), body) for (_, markdown), body in zip(sources, bodies)]
+    timings["template"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i, page in enumerate(pages):
+        with open(os.path.join(out_dir, f"{i}.html"), 'w', encoding='utf-8') as f:
+            f.write(page)
+    timings["write"] = time.perf_counter() - start
+    return timings
+
+
+def run_benchmark(pages=100, page_size=4096, depth=2, mix=None, seed=0, jobs=1, workdir=None):
+    """
+    Generates a corpus, times each stage and a full build, and returns the results.
+
+    Returns:
+        dict: JSON-serialisable benchmark results.
+    """
+    with tempfile.TemporaryDirectory(dir=workdir) as root:
+        total_bytes = generate_corpus(root, pages, page_size, depth, mix, seed)
+        content_dir = os.path.join(root, "content")
+        template_path = os.path.join(root, "template.html")
+        template = Template.from_file(template_path, "/site/")
+
+        sources = []
+        for directory, _, files in os.walk(content_dir):
+            for file in sorted(files):
+                path = os.path.join(directory, file)
+                with open(path, 'r', encoding='utf-8') as f:
+                    sources.append((path, f.read()))
+
+        scratch_dir = os.path.join(root, "scratch")
+        os.makedirs(scratch_dir)
+        stages = time_stages(sources, template, scratch_dir)
+
+        set_inline_memo_size(INLINE_MEMO_SIZE)
+        start = time.perf_counter()
+        generate_pages_recursively(content_dir, template_path, os.path.join(root, "docs"), "/site/", jobs=jobs)
+        build_seconds = time.perf_counter() - start
+
+    megabytes = total_bytes / (1024 * 1024)
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "corpus": {
+            "pages": pages,
+            "page_size": page_size,
+            "depth": depth,
+            "mix": mix or DEFAULT_MIX,
+            "seed": seed,
+            "bytes": total_bytes,
+        },
+        "jobs": jobs,
+        "stages": {name: round(stages[name], 6) for name in STAGES},
+        "build_seconds": round(build_seconds, 6),
+        "pages_per_sec": round(pages / build_seconds, 2),
+        "mb_per_sec": round(megabytes / build_seconds, 3),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def compare(results, baseline, threshold=0.10):
+    """
+    Compares results against a baseline run of the same corpus.
+
+    Returns:
+        list of str: One line per stage, flagged when slower than the baseline by more than threshold.
+    """
+    lines = []
+    if results["corpus"] != baseline.get("corpus"):
+        lines.append("warning: corpus parameters differ from the baseline")
+    rows = [(name, results["stages"][name], baseline.get("stages", {}).get(name)) for name in STAGES]
+    rows.append(("build", results["build_seconds"], baseline.get("build_seconds")))
+    for name, current, previous in rows:
+        if not previous:
+            continue
+        ratio = current / previous
+        flag = "  REGRESSION" if ratio > 1 + threshold else ""
+        lines.append(f"{name:<20}{previous:>10.4f}s{current:>10.4f}s{ratio:>8.2f}x{flag}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200, help="number of pages to generate")
+    parser.add_argument("--page-size", type=int, default=8192, help="approximate page size in bytes")
+    parser.add_argument("--depth", type=int, default=2, help="directory nesting depth")
+    parser.add_argument("--mix", type=parse_mix, default=None, help="block type weights, e.g. paragraph=5,code=1")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the corpus")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="worker processes for the full build")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--compare", help="a previous JSON result to compare against")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.pages, args.page_size, args.depth, args.mix, args.seed, args.jobs)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    print(text)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print("\n".join(compare(results, baseline)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Micro-benchmark for block classification: the per-line re.match/re.sub approach the parser
+used before classify_block, against classify_block itself.
+
+Run with: python3 src/bench_blocks.py [--number N]
+"""
+import argparse
+import re
+import timeit
+
+from functions import BlockType, classify_block
+
+
+SAMPLE_BLOCKS = {
+    "paragraph": "This is a paragraph with **bold** text\nthat spans a couple of lines\nand ends here.",
+    "header": "## A section header",
+    "unordered_list": "\n".join(f"- list item number {i} with a [link](/x/{i})" for i in range(20)),
+    "ordered_list": "\n".join(f"{i}. ordered item {i}" for i in range(1, 21)),
+    "quote": "\n".join(f"> quoted line {i}" for i in range(10)),
+    "code": "```\n" + "\n".join(f"    line_{i} = {i}" for i in range(20)) + "\n```",
+}
+
+
+def legacy_block_to_block_type(text):
+    lines = text.split("\n")
+    if all(re.match(r"^\s*-\s+", line) for line in lines):
+        return BlockType.UNORDERED_LIST
+    elif all(re.match(r"^\s*\d+\.\s+", line) for line in lines):
+        return BlockType.ORDERED_LIST
+    elif all(re.match(r"^>", line) for line in lines):
+        return BlockType.QUOTE
+    elif re.match(r"^\s*```", lines[0]) and re.match(r"^\s*```", lines[-1]):
+        return BlockType.CODE
+    elif re.match(r"^\s*#+\s+", lines[0]):
+        return BlockType.HEADER
+    else:
+        return BlockType.PARAGRAPH
+
+
+def legacy_classify_and_strip(block):
+    block_type = legacy_block_to_block_type(block)
+    if block_type == BlockType.HEADER:
+        m = re.match(r"^\s*(#+)", block)
+        return block_type, [re.sub(r"^\s*#+\s+", "", block)], len(m.group(1))
+    elif block_type == BlockType.UNORDERED_LIST:
+        return block_type, [re.sub(r"^\s*-\s+", "", line) for line in block.split("\n")], 0
+    elif block_type == BlockType.ORDERED_LIST:
+        return block_type, [re.sub(r"^\s*\d+\.\s+", "", line) for line in block.split("\n")], 0
+    elif block_type == BlockType.CODE:
+        return block_type, [re.sub(r"^\s*```\s*|\s*```\s*$", "", block)], 0
+    elif block_type == BlockType.QUOTE:
+        return block_type, [re.sub(r">\s*", "", line) for line in block.split("\n")], 0
+    return block_type, [block], 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="calls per block and implementation")
+    args = parser.parse_args()
+
+    print(f"{'block':<16}{'before (us)':>12}{'after (us)':>12}{'speedup':>10}")
+    for name, block in SAMPLE_BLOCKS.items():
+        before = timeit.timeit(lambda: legacy_classify_and_strip(block), number=args.number) / args.number * 1e6
+        after = timeit.timeit(lambda: classify_block(block), number=args.number) / args.number * 1e6
+        print(f"{name:<16}{before:>12.2f}{after:>12.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Memory benchmark: tracemalloc peak while parsing 1 MB of markdown into TextNode and HtmlNode trees.
+
+Run with: python3 src/bench_memory.py [--size-mb N]
+"""
+import argparse
+import tracemalloc
+
+from functions import INLINE_MEMO_SIZE, markdown_to_html_node, set_inline_memo_size, text_to_textnodes
+
+
+SAMPLE = """## Section {i}
+
+A paragraph with **bold**, _italic_ and `code` text, plus a [link](/pages/{i}) and more words to read.
+
+- first item with a [link](/items/{i})
+- second item with **emphasis**
+- third item
+
+1. one
+2. two
+
+> A quoted line number {i}
+"""
+
+
+def make_markdown(size_bytes):
+    parts = []
+    total = 0
+    i = 0
+    while total < size_bytes:
+        part = SAMPLE.format(i=i)
+        parts.append(part)
+        total += len(part)
+        i += 1
+    return "\n".join(parts)
+
+
+def measure_peak(func, *args):
+    set_inline_memo_size(INLINE_MEMO_SIZE)
+    tracemalloc.start()
+    result = func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=1.0, help="size of the generated markdown")
+    args = parser.parse_args()
+
+    markdown = make_markdown(int(args.size_mb * 1024 * 1024))
+    size_mb = len(markdown.encode("utf-8")) / (1024 * 1024)
+    html_peak = measure_peak(markdown_to_html_node, markdown)
+    text_peak = measure_peak(lambda text: [text_to_textnodes(line) for line in text.split("\n")], markdown)
+
+    print(f"markdown size:                {size_mb:.2f} MB")
+    print(f"markdown_to_html_node peak:   {html_peak / (1024 * 1024) / size_mb:.2f} MB per MB of markdown")
+    print(f"text_to_textnodes peak:       {text_peak / (1024 * 1024) / size_mb:.2f} MB per MB of markdown")
+
+
+if __name__ == "__main__":
+    main()
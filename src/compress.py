@@ -0,0 +1,175 @@
+import gzip
+import io
+import os
+import threading
+from collections import Counter
+
+from writer import write_atomic
+
+
+COMPRESS_MIN_SIZE = 1024
+COMPRESSIBLE_EXTENSIONS = frozenset({".html", ".css", ".js", ".mjs", ".json", ".svg", ".xml", ".txt", ".md"})
+ENCODING_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+CHUNK_SIZE = 1024 * 1024
+
+
+def remove_compressed(path):
+    """
+    Removes the precompressed siblings of an output file, if any.
+
+    Args:
+        path (str): The path of the uncompressed output file.
+    """
+    for suffix in ENCODING_SUFFIXES.values():
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+class Compressor:
+    """
+    Writes precompressed siblings (index.html.gz, index.html.br) next to output files, so a static
+    origin can serve them directly. Only text formats of at least min_size bytes are compressed;
+    smaller outputs lose any stale siblings instead. Output is deterministic (gzip mtime 0), so an
+    unchanged file always compresses to the same bytes. level applies to gzip; brotli always
+    uses its maximum quality.
+
+    Compression in zlib and brotli releases the GIL, so the page writer threads and
+    compress_files() compress several files in parallel.
+    """
+
+    def __init__(self, encodings=("gzip",), min_size=COMPRESS_MIN_SIZE, level=9):
+        for encoding in encodings:
+            if encoding not in ENCODING_SUFFIXES:
+                raise ValueError(f"Unknown compression encoding: {encoding}")
+        if "br" in encodings:
+            try:
+                import brotli  # noqa: F401
+            except ImportError:
+                raise ValueError("Brotli compression needs the brotli package") from None
+        self.encodings = tuple(encodings)
+        self.min_size = min_size
+        self.level = level
+        self.compressed = 0
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f"Compressor(encodings={self.encodings!r}, min_size={self.min_size})"
+
+    def __reduce__(self):
+        return (Compressor, (self.encodings, self.min_size, self.level))
+
+    def take_stats(self):
+        """
+        Returns the number of files compressed since the last call, as "compressed".
+        """
+        with self.lock:
+            stats = Counter(compressed=self.compressed)
+            self.compressed = 0
+        return stats
+
+    def wants(self, path, size):
+        """
+        Checks whether an output of a given size should get compressed siblings.
+        """
+        return size >= self.min_size and os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+    def missing(self, path):
+        """
+        Checks whether any sibling of an output file is missing.
+        """
+        return any(not os.path.exists(path + ENCODING_SUFFIXES[encoding]) for encoding in self.encodings)
+
+    def needs(self, path):
+        """
+        Checks whether an existing output file should have siblings but lacks one, e.g. because
+        it was built before compression was enabled.
+        """
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return False
+        return self.wants(path, size) and self.missing(path)
+
+    def _gzip_file(self, fileobj):
+        # Both compress_bytes and compress_file go through GzipFile, so the header (mtime, OS
+        # byte) and therefore the sibling bytes are the same whichever path wrote them.
+        return gzip.GzipFile(filename="", mode="wb", compresslevel=self.level, fileobj=fileobj, mtime=0)
+
+    def compress_bytes(self, path, data):
+        """
+        Writes the compressed siblings of an output from its contents in memory.
+
+        Args:
+            path (str): The path of the uncompressed output file.
+            data (bytes): The contents of the output file.
+
+        Returns:
+            bool: Whether siblings were written.
+        """
+        if not self.wants(path, len(data)):
+            remove_compressed(path)
+            return False
+        for encoding in self.encodings:
+            if encoding == "gzip":
+                buffer = io.BytesIO()
+                with self._gzip_file(buffer) as gz:
+                    gz.write(data)
+                compressed = buffer.getvalue()
+            else:
+                import brotli
+
+                compressed = brotli.compress(data)
+            write_atomic(path + ENCODING_SUFFIXES[encoding], compressed)
+        with self.lock:
+            self.compressed += 1
+        return True
+
+    def compress_file(self, path):
+        """
+        Writes the compressed siblings of an output file already on disk, reading it in chunks.
+
+        Returns:
+            bool: Whether siblings were written.
+        """
+        if not self.wants(path, os.path.getsize(path)):
+            remove_compressed(path)
+            return False
+        for encoding in self.encodings:
+            target = path + ENCODING_SUFFIXES[encoding]
+            tmp_path = target + ".tmp"
+            with open(path, 'rb') as src, open(tmp_path, 'wb') as out:
+                if encoding == "gzip":
+                    with self._gzip_file(out) as gz:
+                        for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                            gz.write(chunk)
+                else:
+                    import brotli
+
+                    compressor = brotli.Compressor()
+                    for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                        out.write(compressor.process(chunk))
+                    out.write(compressor.finish())
+            os.replace(tmp_path, target)
+        with self.lock:
+            self.compressed += 1
+        return True
+
+    def compress_files(self, paths, threads=4):
+        """
+        Compresses files already on disk on a pool of threads.
+
+        Args:
+            paths (list of str): The output files to compress.
+            threads (int): The number of threads.
+
+        Returns:
+            int: The number of files that got compressed siblings.
+        """
+        if len(paths) <= 1 or threads <= 1:
+            return sum(self.compress_file(path) for path in paths)
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            return sum(executor.map(self.compress_file, paths))
@@ -0,0 +1,189 @@
+import os
+from collections import Counter
+from xml.sax.saxutils import escape, quoteattr
+
+from functions import remove_output
+from htmlnode import LeafNode, ParentNode
+from search import page_url
+from template import TemplateSet
+from writer import write_atomic
+
+
+BLOG_DIR = "blog"
+POSTS_PER_PAGE = 10
+FEED_SIZE = 20
+SITEMAP_NAME = "sitemap.xml"
+FEED_NAME = "feed.xml"
+
+
+def blog_posts(manifest, blog_dir=BLOG_DIR):
+    """
+    Returns the recorded pages of a content section, newest first, without reading any of them.
+
+    Args:
+        manifest (BuildManifest): The build manifest, with each page's "meta".
+        blog_dir (str): The section directory relative to the content directory.
+
+    Returns:
+        list of tuple: (source, entry) pairs, sorted by date (newest first), then source.
+    """
+    prefix = blog_dir.strip("/") + "/"
+    posts = [(source, entry) for source, entry in manifest.pages.items()
+             if source.replace(os.sep, "/").startswith(prefix) and source.replace(os.sep, "/") != prefix + "index.md"
+             and "meta" in entry]
+    posts.sort(key=lambda post: post[0])
+    posts.sort(key=lambda post: post[1]["meta"]["date"], reverse=True)
+    return posts
+
+
+def listing_dests(count, per_page, blog_dir, taken):
+    """
+    Returns the output paths of the listing pages for count posts: the section index first,
+    then page/2/, page/3/ and so on. When a content page already produces the section index,
+    the listing starts at page/1/ instead.
+    """
+    pages = max(1, -(-count // per_page))
+    first = f"{blog_dir}/index.html"
+    dests = [first] if first not in taken else [f"{blog_dir}/page/1/index.html"]
+    dests.extend(f"{blog_dir}/page/{number}/index.html" for number in range(2, pages + 1))
+    return dests
+
+
+def listing_html(posts, basepath, newer=None, older=None):
+    """
+    Returns the body HTML of one listing page: the posts with their dates, then links to the
+    neighbouring listing pages.
+    """
+    items = []
+    for source, entry in posts:
+        meta = entry["meta"]
+        items.append(ParentNode(tag="li", children=[
+            LeafNode(tag="a", value=meta["title"], props={"href": page_url(entry["dest"], basepath)}),
+            LeafNode(tag=None, value=" "),
+            LeafNode(tag="time", value=meta["date"][:10], props={"datetime": meta["date"]}),
+        ]))
+    children = [ParentNode(tag="ul", children=items) if items else LeafNode(tag="p", value="No posts yet.")]
+    navigation = []
+    if newer is not None:
+        navigation.append(LeafNode(tag="a", value="Newer posts", props={"href": page_url(newer, basepath)}))
+    if older is not None:
+        navigation.append(LeafNode(tag="a", value="Older posts", props={"href": page_url(older, basepath)}))
+    if navigation:
+        children.append(ParentNode(tag="nav", children=navigation))
+    return ParentNode(tag="div", children=children).to_html()
+
+
+def sitemap_xml(manifest, site_url, basepath, generated=()):
+    """
+    Returns a sitemap listing every page (with its date) and every generated listing page.
+    """
+    urls = {page_url(entry["dest"], basepath): entry.get("meta", {}).get("date") for entry in manifest.pages.values()}
+    for dest in generated:
+        if dest.endswith(".html"):
+            urls.setdefault(page_url(dest, basepath), None)
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for url in sorted(urls):
+        lastmod = f"<lastmod>{urls[url]}</lastmod>" if urls[url] else ""
+        lines.append(f"<url><loc>{escape(site_url + url)}</loc>{lastmod}</url>")
+    lines.append("</urlset>")
+    return "\n".join(lines) + "\n"
+
+
+def atom_feed(posts, site_url, basepath, title, author):
+    """
+    Returns an Atom feed of the newest FEED_SIZE posts, with author as the feed-level author
+    every entry inherits.
+    """
+    home = site_url + basepath
+    updated = posts[0][1]["meta"]["date"] if posts else "1970-01-01T00:00:00Z"
+    lines = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        '<feed xmlns="http://www.w3.org/2005/Atom">',
+        f"<title>{escape(title)}</title>",
+        f"<link href={quoteattr(home)}/>",
+        f'<link rel="self" href={quoteattr(home + FEED_NAME)}/>',
+        f"<id>{escape(home)}</id>",
+        f"<updated>{updated}</updated>",
+        f"<author><name>{escape(author)}</name></author>",
+    ]
+    for source, entry in posts[:FEED_SIZE]:
+        url = site_url + page_url(entry["dest"], basepath)
+        lines.append(f"<entry><title>{escape(entry['meta']['title'] or '')}</title><link href={quoteattr(url)}/>"
+                     f"<id>{escape(url)}</id><updated>{entry['meta']['date']}</updated></entry>")
+    lines.append("</feed>")
+    return "\n".join(lines) + "\n"
+
+
+def _write_output(path, data, compressor):
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_atomic(path, data)
+    if compressor is not None:
+        compressor.compress_bytes(path, data)
+    return True
+
+
+def write_site_meta(manifest, public_dir, content_dir, template_path, basepath, site_url=None, listing=False,
+                    per_page=POSTS_PER_PAGE, blog_dir=BLOG_DIR, compressor=None, author=None):
+    """
+    Writes the outputs built from the recorded page metadata alone: sitemap.xml and an Atom
+    feed of the blog section when site_url is given, and paginated listing pages of the blog
+    section when listing is set. No page is read; titles and dates come from the manifest, so
+    adding a post costs one page render plus this pass. Outputs whose bytes are unchanged are
+    left untouched, and generated outputs of the previous build that nothing produces any more
+    are removed; outputs a content page took over are kept. manifest.generated is updated in place.
+
+    Args:
+        manifest (BuildManifest): The manifest of the build, after the pages were generated.
+        public_dir (str): The path to the public directory.
+        content_dir (str): The content directory, to resolve the section template.
+        template_path (str): The path to the site HTML template file.
+        basepath (str): The base path the site is served from.
+        site_url (str, optional): The scheme and host the site is served from, e.g.
+            "https://example.com"; sitemaps and feeds need absolute URLs.
+        listing (bool): Whether to write the listing pages.
+        per_page (int): The number of posts per listing page.
+        blog_dir (str): The section to list, relative to the content directory.
+        compressor (Compressor, optional): Writes precompressed siblings of the outputs.
+        author (str, optional): The feed author; defaults to the "author" in the front matter
+            of content/index.md, then to the site title.
+
+    Returns:
+        Counter: The number of outputs "generated" (written because they changed).
+    """
+    stats = Counter()
+    posts = blog_posts(manifest, blog_dir)
+    outputs = {}
+    taken = {entry["dest"].replace(os.sep, "/") for entry in manifest.pages.values()}
+    if listing:
+        dests = listing_dests(len(posts), per_page, blog_dir, taken)
+        template, _ = TemplateSet(template_path, content_dir, basepath).for_page(
+            os.path.join(content_dir, blog_dir, "index.md"))
+        for number, dest in enumerate(dests):
+            newer = dests[number - 1] if number > 0 else None
+            older = dests[number + 1] if number + 1 < len(dests) else None
+            body = listing_html(posts[number * per_page:(number + 1) * per_page], basepath, newer, older)
+            title = "Blog" if number == 0 else f"Blog, page {number + 1}"
+            outputs[dest] = template.render(title, body)
+    if site_url is not None:
+        site_url = site_url.rstrip("/")
+        outputs[SITEMAP_NAME] = sitemap_xml(manifest, site_url, basepath, outputs)
+        home = manifest.pages.get("index.md")
+        title = home["meta"]["title"] if home is not None and "meta" in home else "Blog"
+        if author is None and home is not None:
+            author = home.get("front", {}).get("author")
+        outputs[FEED_NAME] = atom_feed(posts, site_url, basepath, title, str(author) if author else title)
+
+    for dest, text in outputs.items():
+        if _write_output(os.path.join(public_dir, dest), text.encode("utf-8"), compressor):
+            stats["generated"] += 1
+    for dest in manifest.generated:
+        if dest not in outputs and dest not in taken:
+            remove_output(public_dir, dest)
+    manifest.generated = sorted(outputs)
+    return stats
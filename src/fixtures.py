@@ -0,0 +1,45 @@
+import os
+
+
+def write(root, relative_path, text, mtime=None):
+    """
+    Writes a file under a test site root, creating its parent directories.
+
+    Rewriting an existing file moves its modification time a second forward, so stat-based
+    change detection sees the edit even on filesystems with coarse timestamps.
+
+    Args:
+        root: Directory the path is relative to.
+        relative_path: Path of the file below root.
+        text: Contents to write.
+        mtime: Optional modification time, in seconds, to set instead.
+
+    Returns:
+        The full path of the written file.
+    """
+    path = os.path.join(root, relative_path)
+    existed = os.path.exists(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(text)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    elif existed:
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    return path
+
+
+def read(root, relative_path):
+    """
+    Reads a built output file from the docs/ directory of a test site root.
+
+    Args:
+        root: The site root.
+        relative_path: Path of the output below docs/.
+
+    Returns:
+        The file's text.
+    """
+    with open(os.path.join(root, "docs", relative_path)) as f:
+        return f.read()
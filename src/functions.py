@@ -1,12 +1,18 @@
 
 from enum import Enum
 
-from charset_normalizer import from_path
 from textnode import TextNode, TextType
 from htmlnode import LeafNode, ParentNode
+from manifest import hash_bytes, hash_file
+from sources import parse_front_matter, read_front_matter, read_source, source_encoding, split_front_matter
+from template import TemplateSet
+from writer import WRITE_THREADS, write_atomic
+import profiling
+from collections import Counter, OrderedDict, namedtuple
 import re
 import os
-import shutil
+import threading
+import time
 
 
 class BlockType(Enum):
@@ -58,6 +64,9 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
         new_nodes.extend(current_sublist)
     return new_nodes
 
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
 def extract_markdown_images(text):
     """
     Extracts all markdown image URLs from the given text.
@@ -65,8 +74,7 @@ def extract_markdown_images(text):
     Args:
         text (str): The input text containing markdown image syntax.
     """
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    return re.findall(pattern, text)
+    return IMAGE_PATTERN.findall(text)
 
 
 
@@ -78,8 +86,25 @@ def extract_markdown_links(text):
     Args:
         text (str): The input text containing markdown link syntax.
     """
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    return re.findall(pattern, text)
+    return LINK_PATTERN.findall(text)
+
+def _split_nodes_pattern(old_nodes, pattern, text_type):
+    new_nodes = []
+    for node in old_nodes:
+        if node.text_type is not TextType.TEXT:
+            new_nodes.append(node)
+            continue
+        position = 0
+        for match in pattern.finditer(node.text):
+            if match.start() > position:
+                new_nodes.append(TextNode(node.text[position:match.start()], TextType.TEXT))
+            new_nodes.append(TextNode(match.group(1), text_type, url=match.group(2)))
+            position = match.end()
+        if position == 0:
+            new_nodes.append(node)
+        elif position < len(node.text):
+            new_nodes.append(TextNode(node.text[position:], TextType.TEXT))
+    return new_nodes
 
 def split_nodes_image(old_nodes):
     """
@@ -89,28 +114,7 @@ def split_nodes_image(old_nodes):
     Args:
         old_nodes (list of TextNode): The original list of TextNode objects to be split.    
     """
-    new_nodes = []
-    current_sublist = []
-
-    for node in old_nodes:
-        current_sublist = []
-        if node.text_type is not TextType.TEXT:
-            new_nodes.extend([node])
-            continue
-        parts = extract_markdown_images(node.text)
-        if parts == []:
-            new_nodes.extend([node])
-            continue
-        for part in parts:
-            sections = node.text.split(f"![{part[0]}]({part[1]})", 1)
-            if sections[0]:
-                current_sublist.append(TextNode(sections[0], TextType.TEXT))
-            current_sublist.append(TextNode(part[0], TextType.IMAGE, url=part[1]))
-            if sections[1] != "":
-                current_sublist.append(TextNode(sections[1], TextType.TEXT))
-        
-        new_nodes.extend(current_sublist)
-    return new_nodes
+    return _split_nodes_pattern(old_nodes, IMAGE_PATTERN, TextType.IMAGE)
 
 def split_nodes_link(old_nodes):
     """
@@ -120,32 +124,56 @@ def split_nodes_link(old_nodes):
     Args:
         old_nodes (list of TextNode): The original list of TextNode objects to be split.    
     """
-    new_nodes = []
-    current_sublist = []
+    return _split_nodes_pattern(old_nodes, LINK_PATTERN, TextType.LINK)
 
-    new_nodes = []
-    current_sublist = []
 
-    for node in old_nodes:
-        current_sublist = []
-        if node.text_type is not TextType.TEXT:
-            new_nodes.extend([node])
-            continue
-        parts = extract_markdown_links(node.text)
-        if parts == []:
-            new_nodes.extend([node])
-            continue
-        for part in parts:
-            sections = node.text.split(f"[{part[0]}]({part[1]})", 1)
-            if sections[0]:
-                current_sublist.append(TextNode(sections[0], TextType.TEXT))
-            current_sublist.append(TextNode(part[0], TextType.LINK, url=part[1]))
-            if sections[1] != "":
-                current_sublist.append(TextNode(sections[1], TextType.TEXT))
-        
-        new_nodes.extend(current_sublist)
-    return new_nodes
+INLINE_DELIMITERS = {
+    "`": TextType.CODE,
+    "**": TextType.BOLD,
+    "_": TextType.ITALIC,
+}
+INLINE_TOKEN_PATTERN = re.compile(r"`|\*\*|_|(!?)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
+def iter_inline_nodes(text):
+    """
+    Tokenizes inline markdown in a single left-to-right scan, yielding TextNode objects for
+    plain text, `code`, **bold**, _italic_, [links](url) and ![images](url).
+
+    The scan jumps from one token to the next with a compiled pattern and finds each closing
+    delimiter with str.find, so every character is examined a bounded number of times.
+    Delimited spans are not parsed further, matching the old chained split_nodes_* passes.
 
+    Args:
+        text (str): The inline markdown text.
+
+    Raises:
+        Exception: If a delimiter has no matching closing delimiter.
+    """
+    position = 0
+    text_start = 0
+    while True:
+        match = INLINE_TOKEN_PATTERN.search(text, position)
+        if match is None:
+            break
+        token = match.group(0)
+        text_type = INLINE_DELIMITERS.get(token)
+        if text_type is not None:
+            close = text.find(token, match.end())
+            if close == -1:
+                raise Exception("No matching closing delimiter found.")
+            if match.start() > text_start:
+                yield TextNode(text[text_start:match.start()], TextType.TEXT)
+            if close > match.end():
+                yield TextNode(text[match.end():close], text_type)
+            position = text_start = close + len(token)
+        else:
+            if match.start() > text_start:
+                yield TextNode(text[text_start:match.start()], TextType.TEXT)
+            link_type = TextType.IMAGE if match.group(1) else TextType.LINK
+            yield TextNode(match.group(2), link_type, url=match.group(3))
+            position = text_start = match.end()
+    if text_start < len(text):
+        yield TextNode(text[text_start:], TextType.TEXT)
 
 def text_to_textnodes(text):
     """
@@ -157,13 +185,37 @@ def text_to_textnodes(text):
     Returns:
         list of TextNode: A list containing TextNodes with the input text.
     """
-    node_list = [TextNode(text, TextType.TEXT)]
-    node_list = split_nodes_delimiter(node_list, "`", TextType.CODE)
-    node_list = split_nodes_delimiter(node_list, "**", TextType.BOLD)
-    node_list = split_nodes_delimiter(node_list, "_", TextType.ITALIC)
-    node_list = split_nodes_link(node_list)
-    node_list = split_nodes_image(node_list)
-    return node_list
+    if not text:
+        return [TextNode(text, TextType.TEXT)]
+    return list(iter_inline_nodes(text))
+
+def iter_blocks(lines):
+    """
+    Groups lines of markdown into blocks, yielding each block as soon as it is complete.
+    Blocks are separated by empty lines and stripped of surrounding newlines and spaces;
+    empty blocks are skipped.
+
+    Args:
+        lines (iterable of str): The markdown lines, with or without trailing newlines,
+            e.g. an open file.
+
+    Yields:
+        str: The markdown blocks in document order.
+    """
+    current = []
+    for line in lines:
+        line = line.rstrip("\n")
+        if line:
+            current.append(line)
+        elif current:
+            block = "\n".join(current).strip("\n ")
+            current = []
+            if block:
+                yield block
+    if current:
+        block = "\n".join(current).strip("\n ")
+        if block:
+            yield block
 
 def markdown_to_blocks(markdown):
     """
@@ -172,11 +224,55 @@ def markdown_to_blocks(markdown):
     Args:
         markdown (str): The input markdown string.
     """
-    blocks : list[str] = markdown.split("\n\n")
-    result_blocks = []
-    for block in blocks:
-        result_blocks.append(block.strip("\n "))
-    return result_blocks
+    return list(iter_blocks(markdown.split("\n")))
+
+LINE_MARKER_PATTERN = re.compile(r"\s*(?:(?P<unordered>-)|(?P<ordered>\d+\.))\s+|(?P<quote>>)\s*")
+CODE_FENCE_PATTERN = re.compile(r"\s*```")
+CODE_STRIP_PATTERN = re.compile(r"^\s*```\s*|\s*```\s*$")
+HEADER_PATTERN = re.compile(r"\s*(#+)\s+")
+
+LINE_MARKER_TYPES = {
+    "unordered": BlockType.UNORDERED_LIST,
+    "ordered": BlockType.ORDERED_LIST,
+    "quote": BlockType.QUOTE,
+}
+
+ParsedBlock = namedtuple("ParsedBlock", ["block_type", "items", "level"])
+
+def classify_block(text):
+    """
+    Classifies a markdown block and strips its markers, looking at each line once.
+
+    List and quote blocks are recognised by matching every line against a single compiled
+    marker pattern; the text after each marker is kept as an item. Code blocks are recognised
+    by their first and last lines and headers by their first line.
+
+    Args:
+        text (str): The input markdown block.
+
+    Returns:
+        ParsedBlock: The block type, its contents and the header level (0 for non-headers).
+            The contents are the list items or quote lines with markers removed, the header
+            text, the code without its fences, or the paragraph text.
+    """
+    lines = text.split("\n")
+    marker = None
+    items = []
+    for line in lines:
+        m = LINE_MARKER_PATTERN.match(line)
+        if m is None or (marker is not None and m.lastgroup != marker):
+            break
+        marker = m.lastgroup
+        items.append(line[m.end():])
+    else:
+        return ParsedBlock(LINE_MARKER_TYPES[marker], items, 0)
+
+    if CODE_FENCE_PATTERN.match(lines[0]) and CODE_FENCE_PATTERN.match(lines[-1]):
+        return ParsedBlock(BlockType.CODE, [CODE_STRIP_PATTERN.sub("", text)], 0)
+    m = HEADER_PATTERN.match(lines[0])
+    if m:
+        return ParsedBlock(BlockType.HEADER, [text[m.end():]], min(len(m.group(1)), 6))
+    return ParsedBlock(BlockType.PARAGRAPH, [text], 0)
 
 def block_to_block_type(text):
     """
@@ -188,79 +284,293 @@ def block_to_block_type(text):
     Returns:
         BlockType: The determined BlockType of the block.
     """
-    lines = text.split("\n")
+    return classify_block(text).block_type
 
-    if all(re.match(r"^\s*-\s+", line) for line in lines):
-        return BlockType.UNORDERED_LIST
-    elif all(re.match(r"^\s*\d+\.\s+", line) for line in lines):
-        return BlockType.ORDERED_LIST
-    elif all(re.match(r"^>", line) for line in lines):
-        return BlockType.QUOTE
-    elif re.match(r"^\s*```", lines[0]) and re.match(r"^\s*```", lines[-1]):
-        return BlockType.CODE
-    elif re.match(r"^\s*#+\s+", lines[0]):  
-        return BlockType.HEADER
-    else:
-        return BlockType.PARAGRAPH
 
+class InlineMemo:
+    """
+    A bounded, thread-safe LRU cache of rendered inline fragments, keyed by the inline markdown
+    text and the basepath it was rendered for. Navigation items, footers and other lines that
+    repeat across pages are then lexed and rendered once per process.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.fragments = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f"InlineMemo(maxsize={self.maxsize}, size={len(self.fragments)}, hits={self.hits}, misses={self.misses})"
+
+    def render(self, text, basepath=None):
+        """
+        Returns the HTML of an inline markdown fragment, rendering it on a miss.
+        """
+        key = (text, basepath)
+        with self.lock:
+            html = self.fragments.get(key)
+            if html is not None:
+                self.fragments.move_to_end(key)
+                self.hits += 1
+                return html
+            self.misses += 1
+        html = "".join([tn.text_node_to_html_node(basepath).to_html() for tn in iter_inline_nodes(text)])
+        with self.lock:
+            self.fragments[key] = html
+            if len(self.fragments) > self.maxsize:
+                self.fragments.popitem(last=False)
+        return html
+
+    def take_stats(self):
+        """
+        Returns the hit and miss counts since the last call, as "inline_hits" and "inline_misses".
+        """
+        with self.lock:
+            stats = Counter(inline_hits=self.hits, inline_misses=self.misses)
+            self.hits = self.misses = 0
+        return stats
+
+
+INLINE_MEMO_SIZE = 4096
+
+inline_memo = InlineMemo(INLINE_MEMO_SIZE)
+
+def set_inline_memo_size(size):
+    """
+    Replaces the process-wide inline memo with an empty one.
+
+    Args:
+        size (int): The maximum number of fragments to keep; 0 disables memoization.
+    """
+    global inline_memo
+    inline_memo = InlineMemo(size) if size > 0 else None
+
+def inline_memo_stats():
+    """
+    Returns:
+        Counter: The inline memo hits and misses since the last call.
+    """
+    return inline_memo.take_stats() if inline_memo is not None else Counter()
+
+def text_to_children(text, basepath=None):
+    """
+    Converts inline markdown text into a list of HtmlNode children. While the inline memo is
+    enabled, the fragment is rendered (or reused) as a single raw LeafNode.
+
+    Args:
+        text (str): The inline markdown text.
+        basepath (str, optional): The base path site-absolute link and image URLs are rewritten to.
+
+    Returns:
+        list of HtmlNode: The rendered inline nodes.
+    """
+    if inline_memo is not None:
+        return [LeafNode(None, inline_memo.render(text, basepath))]
+    return [tn.text_node_to_html_node(basepath) for tn in text_to_textnodes(text)]
+
+def _quote_paragraphs(items):
+    current = []
+    for item in items + [""]:
+        if item:
+            current.append(item)
+        elif current:
+            yield "\n".join(current)
+            current = []
+
+TERM_PATTERN = re.compile(r"\w\w+")
+
+class PageOutline:
+    """
+    Collects what the build needs to know about a page besides its HTML while its blocks are
+    rendered: the title, the link and image URLs as written in the markdown (before basepath
+    rewriting) and, for the search index, the set of lowercased terms in its plain text. Blocks
+    whose HTML comes from a cache are still outlined, so the result never depends on caching.
+    """
 
-def markdown_to_html_node(markdown):    
+    def __init__(self, terms=False):
+        self.title = None
+        self.links = []
+        self.terms = set() if terms else None
+
+    def __repr__(self):
+        return f"PageOutline(title={self.title!r}, links={len(self.links)})"
+
+    def add_text(self, text):
+        """
+        Adds the terms of a piece of plain text, if terms are collected.
+        """
+        if self.terms is not None:
+            self.terms.update(TERM_PATTERN.findall(text.casefold()))
+
+    def add_block(self, parsed):
+        """
+        Adds a block already classified by classify_block. The inline text of a block is only
+        lexed when terms are collected or it may contain a link.
+
+        Args:
+            parsed (ParsedBlock): The classified block.
+        """
+        block_type, items, _ = parsed
+        if block_type == BlockType.CODE:
+            self.add_text(items[0])
+            return
+        if block_type == BlockType.QUOTE:
+            items = list(_quote_paragraphs(items))
+        for item in items:
+            if self.terms is None and "](" not in item:
+                continue
+            for tn in iter_inline_nodes(item):
+                if tn.url is not None:
+                    self.links.append(tn.url)
+                if tn.text_type != TextType.IMAGE:
+                    self.add_text(tn.text)
+
+def block_to_html_node(block, basepath=None, outline=None):
+    """
+    Converts a single markdown block into an HtmlNode.
+
+    Args:
+        block (str): The markdown block.
+        basepath (str, optional): The base path site-absolute link and image URLs are rewritten to.
+        outline (PageOutline, optional): Collects the links and terms of the block.
+
+    Returns:
+        HtmlNode: The HtmlNode representation of the block.
+    """
+    parsed = classify_block(block)
+    if outline is not None:
+        outline.add_block(parsed)
+    return parsed_block_to_html_node(parsed, basepath)
+
+def parsed_block_to_html_node(parsed, basepath=None):
+    """
+    Converts a block already classified by classify_block into an HtmlNode.
+
+    Args:
+        parsed (ParsedBlock): The classified block.
+        basepath (str, optional): The base path site-absolute link and image URLs are rewritten to.
+
+    Returns:
+        HtmlNode: The HtmlNode representation of the block.
+    """
+    block_type, items, level = parsed
+    if block_type == BlockType.PARAGRAPH:
+        return ParentNode(tag="p", children=text_to_children(items[0], basepath))
+    elif block_type == BlockType.HEADER:
+        return ParentNode(tag=f"h{level}", children=text_to_children(items[0], basepath))
+    elif block_type == BlockType.UNORDERED_LIST:
+        return ParentNode(tag="ul", children=[ParentNode(tag="li", children=text_to_children(item, basepath)) for item in items])
+    elif block_type == BlockType.ORDERED_LIST:
+        return ParentNode(tag="ol", children=[ParentNode(tag="li", children=text_to_children(item, basepath)) for item in items])
+    elif block_type == BlockType.CODE:
+        return LeafNode(tag="pre", value=items[0])
+    elif block_type == BlockType.QUOTE:
+        paragraphs = [ParentNode(tag="p", children=text_to_children(paragraph, basepath)) for paragraph in _quote_paragraphs(items)]
+        return ParentNode(tag="blockquote", children=paragraphs)
+
+def markdown_to_html_node(markdown, basepath=None, outline=None):
     """
     Converts a markdown string into an HtmlNode representation.
 
     Args:
         markdown (str): The input markdown string.
+        basepath (str, optional): The base path site-absolute link and image URLs are rewritten to.
+        outline (PageOutline, optional): Collects the links and terms of the document.
 
     Returns:
         HtmlNode: The HtmlNode representation of the markdown.
     """
     
-    blocks = markdown_to_blocks(markdown)
-    html_nodes = []
-    for block in blocks:
-        block_type = block_to_block_type(block)
-        if block_type == BlockType.PARAGRAPH:
-            text_nodes = text_to_textnodes(block)
-            html_children = [tn.text_node_to_html_node() for tn in text_nodes]
-            html_nodes.append(ParentNode(tag="p", children=html_children))
-        elif block_type == BlockType.HEADER:
-            m = re.match(r"^\s*(#+)", block)
-            level = len(m.group(1)) if m else 1
-            level = min(max(level, 1), 6)
-            text_content = re.sub(r"^\s*#+\s+", "", block)
-            text_nodes = text_to_textnodes(text_content)
-            html_children = [tn.text_node_to_html_node() for tn in text_nodes]
-            html_nodes.append(ParentNode(tag=f"h{level}", children=html_children))
-        elif block_type == BlockType.UNORDERED_LIST:
-            list_items = []
-            for line in block.split("\n"):
-                item_content = re.sub(r"^\s*-\s+", "", line)
-                text_nodes = text_to_textnodes(item_content)
-                html_children = [tn.text_node_to_html_node() for tn in text_nodes]
-                list_items.append(ParentNode(tag="li", children=html_children))
-            html_nodes.append(ParentNode(tag="ul", children=list_items))
-        elif block_type == BlockType.ORDERED_LIST:
-            list_items = []
-            for line in block.split("\n"):
-                item_content = re.sub(r"^\s*\d+\.\s+", "", line)
-                text_nodes = text_to_textnodes(item_content)
-                html_children = [tn.text_node_to_html_node() for tn in text_nodes]
-                list_items.append(ParentNode(tag="li", children=html_children))
-            html_nodes.append(ParentNode(tag="ol", children=list_items))
-        elif block_type == BlockType.CODE:
-            code_content = re.sub(r"^\s*```\s*|\s*```\s*$", "", block)
-            html_nodes.append(LeafNode(tag="pre", value=code_content))
-        elif block_type == BlockType.QUOTE:
-            quote_lines = []
-            for line in block.split("\n"):
-                line_content = re.sub(r">\s*", "", line)
-                text_nodes = text_to_textnodes(line_content)
-                quote_lines.append(LeafNode(tag=None,value=line_content))
-            html_nodes.append(ParentNode(tag="blockquote", children=quote_lines))
+    html_nodes = [block_to_html_node(block, basepath, outline) for block in markdown_to_blocks(markdown)]
     if len(html_nodes) == 1:
         return html_nodes[0]
     return ParentNode(tag="div", children=html_nodes)
 
+PARSER_VERSION = 1
+
+def block_to_html(block, basepath=None, cache=None, outline=None):
+    """
+    Renders a single markdown block to an HTML string, reusing the fragment from a render cache
+    when the same block was rendered before.
+
+    Args:
+        block (str): The markdown block.
+        basepath (str, optional): The base path site-absolute link and image URLs are rewritten to.
+        cache (RenderCache, optional): The cache of rendered block fragments.
+        outline (PageOutline, optional): Collects the links and terms of the block, whether or
+            not its HTML comes from the cache.
+
+    Returns:
+        str: The rendered HTML fragment.
+    """
+    parsed = classify_block(block)
+    if outline is not None:
+        outline.add_block(parsed)
+    if cache is None:
+        return parsed_block_to_html_node(parsed, basepath).to_html()
+    key = cache.key(block, parsed.block_type, basepath)
+    html = cache.get(key)
+    if html is None:
+        html = parsed_block_to_html_node(parsed, basepath).to_html()
+        cache.put(key, html)
+    return html
+
+def markdown_to_html(markdown, basepath=None, cache=None, outline=None):
+    """
+    Renders a markdown string to HTML block by block. The output is the same as
+    markdown_to_html_node(markdown).to_html(), but unchanged blocks can come from a render cache.
+
+    Args:
+        markdown (str): The input markdown string.
+        basepath (str, optional): The base path site-absolute link and image URLs are rewritten to.
+        cache (RenderCache, optional): The cache of rendered block fragments.
+        outline (PageOutline, optional): Collects the links and terms of the document.
+
+    Returns:
+        str: The rendered HTML.
+    """
+    fragments = [block_to_html(block, basepath, cache, outline) for block in markdown_to_blocks(markdown)]
+    if len(fragments) == 1:
+        return fragments[0]
+    return "<div>" + "".join(fragments) + "</div>"
+
+def _write_block(block, fp, basepath, cache, outline):
+    if cache is None:
+        block_to_html_node(block, basepath, outline).write_html(fp)
+    else:
+        fp.write(block_to_html(block, basepath, cache, outline))
+
+def write_markdown_html(lines, fp, basepath=None, cache=None, outline=None):
+    """
+    Streams markdown lines to HTML, rendering and writing one block at a time so that memory use
+    does not grow with the size of the document. The output is the same as
+    markdown_to_html_node(markdown).to_html().
+
+    Args:
+        lines (iterable of str): The markdown lines, e.g. an open file.
+        fp (file-like): The text stream to write the HTML to.
+        basepath (str, optional): The base path site-absolute link and image URLs are rewritten to.
+        cache (RenderCache, optional): The cache of rendered block fragments.
+        outline (PageOutline, optional): Collects the links and terms of the document.
+    """
+    blocks = iter_blocks(lines)
+    first = next(blocks, None)
+    if first is None:
+        fp.write("<div></div>")
+        return
+    second = next(blocks, None)
+    if second is None:
+        _write_block(first, fp, basepath, cache, outline)
+        return
+    fp.write("<div>")
+    _write_block(first, fp, basepath, cache, outline)
+    _write_block(second, fp, basepath, cache, outline)
+    for block in blocks:
+        _write_block(block, fp, basepath, cache, outline)
+    fp.write("</div>")
+
 
 def recursive_directory_copy(src_path, dest_path):
     """
@@ -278,8 +588,153 @@ def recursive_directory_copy(src_path, dest_path):
         if os.path.isdir(s):
             recursive_directory_copy(s, d)
         else:
+            import shutil
+
             shutil.copy(s, d)
-        
+
+def copy_file(src_path, dest_path, link=False):
+    """
+    Copies a file, preserving its modification time. The data is copied with
+    os.copy_file_range where available, which lets filesystems that support it share extents
+    (reflinks) instead of duplicating data, and falls back to shutil.copyfile otherwise. The
+    copy is made as a temporary sibling that then replaces dest_path, so readers never see a
+    partially written file and an existing hardlink to the source is never written through.
+
+    Args:
+        src_path (str): The source file path.
+        dest_path (str): The destination file path.
+        link (bool): Whether to hardlink the file instead of copying it, when the filesystem allows it.
+    """
+    tmp_path = dest_path + ".tmp"
+    if os.path.lexists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        if link:
+            try:
+                os.link(src_path, tmp_path)
+            except OSError:
+                pass
+            else:
+                os.replace(tmp_path, dest_path)
+                return
+        copy_file_range = getattr(os, "copy_file_range", None)
+        copied = False
+        if copy_file_range is not None:
+            try:
+                with open(src_path, 'rb') as src, open(tmp_path, 'wb') as dest:
+                    size = os.fstat(src.fileno()).st_size
+                    offset = 0
+                    while offset < size:
+                        sent = copy_file_range(src.fileno(), dest.fileno(), size - offset)
+                        if sent == 0:
+                            break
+                        offset += sent
+                    copied = offset == size
+            except OSError:
+                copied = False
+        import shutil
+
+        if not copied:
+            shutil.copyfile(src_path, tmp_path)
+        shutil.copystat(src_path, tmp_path)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def directory_id(path):
+    """
+    Returns [st_dev, st_ino] of a directory, or None if it does not exist. A directory that
+    was deleted and created again gets a new identity.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_dev, st.st_ino]
+
+def sync_directory(src_path, dest_path, manifest=None, checksum=False, link=False, compressor=None):
+    """
+    Copies only new and changed files from one directory to another and removes previously
+    synced files whose source disappeared. Other files in the destination are left alone.
+
+    A file is unchanged when its size and modification time match the signature recorded in the
+    manifest, so an unchanged file costs a single stat. The targets are trusted to still exist
+    unless the destination directory was replaced since the manifest was recorded (see
+    directory_id), in which case each one is checked. Without a recorded signature the
+    destination file is compared instead. With checksum enabled, content hashes are compared,
+    which survives touched timestamps at the cost of reading every file.
+
+    Args:
+        src_path (str): The source directory path.
+        dest_path (str): The destination directory path.
+        manifest (BuildManifest, optional): Holds the signatures of the previous sync; updated in place.
+        checksum (bool): Whether to compare content hashes instead of size and modification time.
+        link (bool): Whether to hardlink files instead of copying them.
+        compressor (Compressor, optional): Writes precompressed siblings of copied files, and of
+            unchanged files that lack them.
+
+    Returns:
+        Counter: The number of assets "assets_copied", "assets_unchanged" and "assets_removed",
+        and the number of files "compressed".
+    """
+    stats = Counter()
+    to_compress = []
+    previous = manifest.assets if manifest is not None else {}
+    verify = manifest is None or manifest.assets_dir is None or manifest.assets_dir != directory_id(dest_path)
+    current = {}
+    stack = [""]
+    while stack:
+        relative_dir = stack.pop()
+        directory_created = False
+        with os.scandir(os.path.join(src_path, relative_dir)) as entries:
+            for entry in entries:
+                relative_path = os.path.join(relative_dir, entry.name)
+                if entry.is_dir():
+                    stack.append(relative_path)
+                    continue
+                stat = entry.stat()
+                signature = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+                if checksum:
+                    signature["hash"] = hash_file(entry.path)
+                current[relative_path] = signature
+
+                target = os.path.join(dest_path, relative_path)
+                recorded = previous.get(relative_path)
+                if recorded is not None:
+                    unchanged = ((recorded.get("hash") == signature["hash"] if checksum else recorded == signature)
+                                 and (not verify or os.path.exists(target)))
+                else:
+                    try:
+                        dest_stat = os.stat(target)
+                        unchanged = (dest_stat.st_size, dest_stat.st_mtime_ns) == (stat.st_size, stat.st_mtime_ns)
+                    except FileNotFoundError:
+                        unchanged = False
+                if unchanged:
+                    stats["assets_unchanged"] += 1
+                    if compressor is not None and compressor.needs(target):
+                        to_compress.append(target)
+                    continue
+                if not directory_created:
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    directory_created = True
+                copy_file(entry.path, target, link=link)
+                stats["assets_copied"] += 1
+                if compressor is not None:
+                    to_compress.append(target)
+
+    for relative_path in [path for path in previous if path not in current]:
+        remove_output(dest_path, relative_path)
+        stats["assets_removed"] += 1
+    if manifest is not None:
+        manifest.assets = current
+        manifest.assets_dir = directory_id(dest_path)
+    if compressor is not None:
+        compressor.compress_files(to_compress)
+        stats += compressor.take_stats()
+    return stats
+
 def extract_title(markdown):
     """
     Extracts the title from a markdown string. The title is defined as the text of the first level 1 header.
@@ -290,54 +745,656 @@ def extract_title(markdown):
     Returns:
         str: The extracted title, or an empty string if no level 1 header is found.
     """
-    lines = markdown.split("\n")
+    return find_title(markdown.split("\n"))
+
+def find_title(lines):
+    """
+    Finds the text of the first level 1 header in a sequence of markdown lines, stopping
+    as soon as it is found.
+
+    Args:
+        lines (iterable of str): The markdown lines, e.g. an open file.
+
+    Returns:
+        str: The extracted title.
+    """
     for line in lines:
         if line.startswith("# "):
             return line[2:].strip()
     raise ValueError("No level 1 header found in the markdown.")
 
+def render_page(markdown_content, template, cache=None, outline=None, title=None):
+    """
+    Renders a markdown document into a compiled HTML template. Site-absolute link and image
+    URLs in the body are rewritten for the template's basepath as they are emitted.
+
+    Args:
+        markdown_content (str): The markdown source of the page.
+        template (Template): The compiled page template.
+        cache (RenderCache, optional): The cache of rendered block fragments.
+        outline (PageOutline, optional): Collects the title, links and terms of the page.
+        title (str, optional): The page title, e.g. from front matter; by default the text of
+            the first level 1 header.
+
+    Returns:
+        str: The final HTML page.
+    """
+    if title is None:
+        with profiling.stage("title"):
+            title = extract_title(markdown_content)
+    if outline is not None:
+        outline.title = title
+    if cache is not None:
+        with profiling.stage("parse"):
+            body_html = markdown_to_html(markdown_content, template.basepath, cache, outline)
+    else:
+        with profiling.stage("parse"):
+            html_node = markdown_to_html_node(markdown_content, basepath=template.basepath, outline=outline)
+        with profiling.stage("to_html"):
+            body_html = html_node.to_html()
+    with profiling.stage("template"):
+        return template.render(title, body_html)
+
+STREAM_THRESHOLD = 4 * 1024 * 1024
+
+def stream_page(from_path, template, dest_path, cache=None, outline=None):
+    """
+    Renders a markdown file straight to its destination without holding the document or the
+    rendered page in memory. The file is read with the encoding decode_source would pick (see
+    source_encoding), then twice more: once up to its title, then block by block. Front matter
+    is skipped, and its title, if any, is used. The page is written to a temporary sibling that
+    replaces dest_path once complete, like write_atomic.
+
+    Args:
+        from_path (str): The path to the markdown file.
+        template (Template): The compiled page template.
+        dest_path (str): The path to save the generated HTML file.
+        cache (RenderCache, optional): The cache of rendered block fragments.
+        outline (PageOutline, optional): Collects the title, links and terms of the page.
+    """
+    import itertools
+
+    encoding = source_encoding(from_path)
+    with open(from_path, 'r', encoding=encoding) as f:
+        front, first = parse_front_matter(f)
+        title = front.get("title") or find_title(itertools.chain((first or "",), f))
+    if outline is not None:
+        outline.title = title
+    tmp_path = dest_path + ".tmp"
+    try:
+        with open(from_path, 'r', encoding=encoding) as f, open(tmp_path, 'w', encoding='utf-8') as out:
+            _, first = parse_front_matter(f)
+            lines = itertools.chain((first,), f) if first is not None else f
+            template.render_to(out, title, lambda fp: write_markdown_html(lines, fp, template.basepath, cache, outline))
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def output_unchanged(dest_path, data, output_hash, previous_hash=None):
+    """
+    Checks whether an output file already holds the given bytes. A recorded hash of the previous
+    output avoids reading the file back; without one, the file is read and compared.
+
+    Args:
+        dest_path (str): The path of the output file.
+        data (bytes): The newly rendered output.
+        output_hash (str): The hash of data.
+        previous_hash (str, optional): The hash recorded for the output when it was last written.
+
+    Returns:
+        bool: True if writing data would not change the file.
+    """
+    try:
+        if os.stat(dest_path).st_size != len(data):
+            return False
+    except OSError:
+        return False
+    if previous_hash is not None:
+        return previous_hash == output_hash
+    return hash_file(dest_path) == output_hash
+
+def write_page(from_path, template, dest_path, cache=None, writer=None, output_hashes=None, compressor=None,
+               outlines=None, index_terms=False):
+    """
+    Renders one markdown file with a compiled template and writes the result. Front matter is
+    stripped from the body; a "title" in it replaces the first level 1 header as the title.
+    Sources larger than STREAM_THRESHOLD bytes are streamed block by block instead of rendered
+    in memory.
+    Any failure is re-raised as a RuntimeError naming the source file.
+
+    When output_hashes is given, the page is only written if its rendered bytes differ from
+    the existing file (see output_unchanged), and the new output hash is stored in it.
+
+    Args:
+        from_path (str): The path to the markdown file.
+        template (Template): The compiled page template.
+        dest_path (str): The path to save the generated HTML file.
+        cache (RenderCache, optional): The cache of rendered block fragments.
+        writer (PageWriter, optional): Writes the page in the background instead of here;
+            streamed pages are always written directly.
+        output_hashes (dict, optional): Maps output paths to the hash of their previous contents.
+        compressor (Compressor, optional): Writes precompressed siblings of the page from the
+            rendered bytes; with a writer, the writer's own compressor is used instead.
+        outlines (dict, optional): Maps output paths to the PageOutline of their page; the
+            page's outline is stored in it.
+        index_terms (bool): Whether the outline collects the page's search terms.
+
+    Returns:
+        bool: Whether the output file was written.
+    """
+    outline = None
+    if outlines is not None:
+        outline = outlines[dest_path] = PageOutline(index_terms)
+    try:
+        with profiling.stage("page", from_path):
+            with open(from_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < STREAM_THRESHOLD:
+                    with profiling.stage("read"):
+                        markdown_content = read_source(f, size)
+            if size >= STREAM_THRESHOLD:
+                with profiling.stage("stream"):
+                    stream_page(from_path, template, dest_path, cache, outline)
+                if compressor is not None:
+                    with profiling.stage("compress"):
+                        compressor.compress_file(dest_path)
+                if output_hashes is not None:
+                    output_hashes[dest_path] = None
+                return True
+            front, markdown_content = split_front_matter(markdown_content)
+            final_html = render_page(markdown_content, template, cache, outline, front.get("title") or None)
+            if output_hashes is not None:
+                with profiling.stage("compare"):
+                    final_html = final_html.encode("utf-8")
+                    output_hash = hash_bytes(final_html)
+                    unchanged = output_unchanged(dest_path, final_html, output_hash, output_hashes.get(dest_path))
+                    output_hashes[dest_path] = output_hash
+                if unchanged:
+                    if compressor is not None and compressor.needs(dest_path):
+                        compressor.compress_bytes(dest_path, final_html)
+                    return False
+            if writer is not None:
+                with profiling.stage("enqueue"):
+                    writer.write(dest_path, final_html)
+                return True
+            data = final_html if isinstance(final_html, bytes) else final_html.encode("utf-8")
+            with profiling.stage("write"):
+                write_atomic(dest_path, data)
+            if compressor is not None:
+                with profiling.stage("compress"):
+                    compressor.compress_bytes(dest_path, data)
+            return True
+    except Exception as e:
+        raise RuntimeError(f"Failed to generate page from {from_path}: {e}") from e
+
 def generate_page(from_path, template_path, dest_path, basepath):
     """
     Generates an HTML page by combining markdown content with an HTML template.
 
     Args:
         from_path (str): The path to the markdown file.
-        template_path (str): The path to the HTML template file.
+        template_path (str): The path to the HTML template file; it may include partials.
         dest_path (str): The path to save the generated HTML file.
         basepath (str): The base path for the site.
     """
+    template, _ = TemplateSet(template_path, basepath=basepath).for_page(from_path)
+    write_page(from_path, template, dest_path)
 
-    with open(from_path, 'r', encoding='utf-8') as f:
-        markdown_content = f.read()
-    
-    title = extract_title(markdown_content)
-    html_node = markdown_to_html_node(markdown_content)
-    body_html = html_node.to_html()
-    
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template_content = f.read()
-    
-    final_html = template_content.replace("{{ Title }}", title, count=1).replace("{{ Content }}", body_html, count=1).replace("href=\"/", f"href=\"{basepath}").replace("src=\"/", f"src=\"{basepath}")
-    with open(dest_path, 'w', encoding='utf-8') as f:
-        f.write(final_html)
+_worker_templates = None
+_worker_cache = None
+_worker_writer = None
+_worker_compressor = None
 
-def generate_pages_recursively(content_dir, template_path, public_dir, basepath):
+def open_render_cache(cache_path, cache_size=None):
+    """
+    Opens the persistent block render cache for the current parser version.
+
+    Args:
+        cache_path (str): The path to the cache database, e.g. .cache/render.sqlite.
+        cache_size (int, optional): The maximum size of the cached HTML in bytes.
+
+    Returns:
+        RenderCache: The opened cache.
+    """
+    from render_cache import RenderCache
+
+    if cache_size is None:
+        return RenderCache(cache_path, PARSER_VERSION)
+    return RenderCache(cache_path, PARSER_VERSION, max_bytes=cache_size)
+
+def open_page_writer(write_threads, compressor=None):
+    """
+    Returns a PageWriter with the given number of threads, or None to write synchronously.
+    """
+    if write_threads <= 0:
+        return None
+    from writer import PageWriter
+
+    return PageWriter(write_threads, compressor=compressor)
+
+def _init_render_worker(template_path, content_dir, basepath, profile, cache_path, memo_size, write_threads, compressor):
+    global _worker_templates, _worker_cache, _worker_writer, _worker_compressor
+    _worker_templates = TemplateSet(template_path, content_dir, basepath)
+    _worker_compressor = compressor
+    _worker_writer = open_page_writer(write_threads, compressor)
+    set_inline_memo_size(memo_size)
+    if profile:
+        profiling.enable()
+    if cache_path is not None:
+        _worker_cache = open_render_cache(cache_path)
+
+def _cache_stats(cache):
+    stats = Counter(cache_hits=cache.hits, cache_misses=cache.misses)
+    cache.hits = cache.misses = 0
+    return stats
+
+def _count_write(stats, written):
+    stats["written" if written else "skipped"] += 1
+
+def _page_template(templates, page):
+    template, _ = templates.for_page(page[0], page[2] if len(page) > 2 else None)
+    return template
+
+def _render_batch(batch, output_hashes, outlines, index_terms):
+    stats = Counter()
+    for page in batch:
+        from_path, dest_path = page[:2]
+        template = _page_template(_worker_templates, page)
+        written = write_page(from_path, template, dest_path, _worker_cache, _worker_writer, output_hashes, _worker_compressor,
+                             outlines, index_terms)
+        if output_hashes is not None:
+            _count_write(stats, written)
+    if _worker_writer is not None:
+        _worker_writer.flush()
+    stats += inline_memo_stats()
+    if _worker_compressor is not None:
+        stats += _worker_compressor.take_stats()
+    if _worker_cache is not None:
+        _worker_cache.flush()
+        stats += _cache_stats(_worker_cache)
+    if profiling.active is None:
+        return [], stats, output_hashes, outlines
+    events, profiling.active.events = profiling.active.events, []
+    return events, stats, output_hashes, outlines
+
+def render_pages(pages, template_path, basepath, jobs=1, cache_path=None, cache_size=None, write_threads=WRITE_THREADS,
+                 output_hashes=None, content_dir=None, compressor=None, outlines=None,
+                 index_terms=False):
+    """
+    Renders (from_path, dest_path) pairs, either serially or across a pool of worker processes.
+    Each worker compiles every template it needs once and renders pages in batches. The output
+    is the same as rendering every page with generate_page and its resolved template.
+
+    Args:
+        pages (list of tuple): The (from_path, dest_path) pairs to render, optionally with a third
+            item naming a template chosen by front matter (see TemplateSet.for_page).
+        template_path (str): The path to the site HTML template file.
+        basepath (str): The base path for the site.
+        jobs (int): The number of worker processes; 0 means one per CPU, 1 renders in-process.
+        cache_path (str, optional): The path of a persistent block render cache to use.
+        cache_size (int, optional): The maximum size of the render cache in bytes.
+        write_threads (int): The number of threads (per process) writing pages behind rendering;
+            0 writes each page synchronously.
+        output_hashes (dict, optional): Maps output paths to the hash of their previous contents.
+            When given, only changed outputs are written and the dict is updated with the new
+            hashes (None for streamed pages).
+        content_dir (str, optional): The content directory; when given, pages use the section
+            templates found in it (see TemplateSet) instead of always the site template.
+        compressor (Compressor, optional): Writes precompressed siblings of every written page.
+        outlines (dict, optional): When given, is filled with the PageOutline of every rendered
+            page, keyed by output path.
+        index_terms (bool): Whether the outlines collect search terms.
+
+    Returns:
+        Counter: The inline memo "inline_hits" and "inline_misses", the render cache
+        "cache_hits" and "cache_misses" when a cache is used, the number of outputs
+        "written" and "skipped" when output_hashes is given, and the number of pages
+        "compressed" when a compressor is given.
+
+    Raises:
+        RuntimeError: If a page fails to render or write, naming the file.
+    """
+    stats = Counter()
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(pages) <= 1:
+        templates = TemplateSet(template_path, content_dir, basepath)
+        cache = open_render_cache(cache_path, cache_size) if cache_path is not None else None
+        writer = open_page_writer(write_threads, compressor)
+        try:
+            for page in pages:
+                from_path, dest_path = page[:2]
+                template = _page_template(templates, page)
+                written = write_page(from_path, template, dest_path, cache, writer, output_hashes, compressor, outlines,
+                                     index_terms)
+                if output_hashes is not None:
+                    _count_write(stats, written)
+            if writer is not None:
+                writer.close()
+        finally:
+            if writer is not None:
+                writer.close(raise_error=False)
+            if cache is not None:
+                stats += _cache_stats(cache)
+                cache.close()
+        if compressor is not None:
+            stats += compressor.take_stats()
+        return stats + inline_memo_stats()
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    batch_size = max(1, min(64, len(pages) // (jobs * 4)))
+    batches = [pages[i:i + batch_size] for i in range(0, len(pages), batch_size)]
+    profiler = profiling.active
+    memo_size = inline_memo.maxsize if inline_memo is not None else 0
+    initargs = (template_path, content_dir, basepath, profiler is not None, cache_path, memo_size, write_threads, compressor)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_render_worker, initargs=initargs) as executor:
+        futures = []
+        for batch in batches:
+            batch_hashes = None
+            if output_hashes is not None:
+                batch_hashes = {page[1]: output_hashes.get(page[1]) for page in batch}
+            futures.append(executor.submit(_render_batch, batch, batch_hashes, {} if outlines is not None else None,
+                                           index_terms))
+        try:
+            for future in futures:
+                events, batch_stats, batch_hashes, batch_outlines = future.result()
+                stats += batch_stats
+                if output_hashes is not None:
+                    output_hashes.update(batch_hashes)
+                if outlines is not None:
+                    outlines.update(batch_outlines)
+                if profiler is not None:
+                    profiler.merge(events)
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+    if cache_path is not None:
+        open_render_cache(cache_path, cache_size).close()
+    return stats
+
+def shard_of(source, count):
+    """
+    Assigns a page to one of count shards by a stable hash of its path, so that every build
+    process agrees on the assignment regardless of platform or discovery order.
+
+    Args:
+        source (str): The source path relative to the content directory.
+        count (int): The number of shards.
+
+    Returns:
+        int: The shard index, from 0 to count - 1.
+    """
+    return int(hash_bytes(source.replace(os.sep, "/").encode("utf-8")), 16) % count
+
+def find_markdown_pages(content_dir, public_dir):
+    """
+    Finds all markdown files in a content directory and maps each one to its HTML output path.
+
+    Args:
+        content_dir (str): The path to the content directory containing markdown files.
+        public_dir (str): The path to the public directory where generated HTML files will be saved.
+
+    Returns:
+        list of tuple: (from_path, dest_path) pairs in directory walk order.
+    """
+    pages = []
+    stack = [(content_dir, public_dir)]
+    while stack:
+        directory, dest_directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, os.path.join(dest_directory, entry.name)))
+                elif entry.name.endswith(".md"):
+                    pages.append((entry.path, os.path.join(dest_directory, entry.name[:-3] + ".html")))
+    return pages
+
+def remove_output(public_dir, dest):
+    """
+    Removes a previously generated output file and prunes any directories it leaves empty.
+
+    Args:
+        public_dir (str): The path to the public directory.
+        dest (str): The output path relative to the public directory.
+    """
+    dest_path = os.path.join(public_dir, dest)
+    if os.path.isfile(dest_path):
+        os.remove(dest_path)
+        from compress import remove_compressed
+
+        remove_compressed(dest_path)
+    directory = os.path.dirname(dest_path)
+    public_dir = os.path.abspath(public_dir)
+    while os.path.abspath(directory) != public_dir and os.path.isdir(directory) and not os.listdir(directory):
+        os.rmdir(directory)
+        directory = os.path.dirname(directory)
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+def front_matter_date(value):
+    """
+    Normalises a front matter date ("2026-01-02", or an ISO 8601 date and time, UTC unless it
+    has an offset) to the DATE_FORMAT used in page metadata.
+
+    Raises:
+        ValueError: If the value is not an ISO 8601 date.
+    """
+    from datetime import datetime, timezone
+
+    date = datetime.fromisoformat(str(value))
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.astimezone(timezone.utc).strftime(DATE_FORMAT)
+
+def page_meta(from_path, outline, front=None):
+    """
+    Returns the metadata recorded for a rendered page: the title found while rendering it and
+    its date, taken from its front matter or else the source file's modification time (UTC,
+    ISO 8601).
+
+    Args:
+        from_path (str): The path to the markdown file.
+        outline (PageOutline): The outline collected while rendering the page.
+        front (dict, optional): The page's front matter.
+
+    Returns:
+        dict: {"title", "date"}.
+    """
+    if front and front.get("date"):
+        date = front_matter_date(front["date"])
+    else:
+        date = time.strftime(DATE_FORMAT, time.gmtime(os.path.getmtime(from_path)))
+    return {"title": outline.title, "date": date}
+
+def front_matter_dest(dest_path, public_dir, slug):
+    """
+    Returns the output path of a page whose front matter sets a slug: the slug replaces the file
+    name, or the directory name for index pages, so blog/tom/index.md with slug "bombadil" is
+    written to blog/bombadil/index.html.
+
+    Raises:
+        ValueError: If the slug is not a single path segment, or is set on the site index.
+    """
+    slug = str(slug)
+    if not slug or "/" in slug or "\\" in slug or slug in (".", ".."):
+        raise ValueError(f"Invalid slug {slug!r}")
+    directory, name = os.path.split(dest_path)
+    if name != "index.html":
+        return os.path.join(directory, slug + ".html")
+    if os.path.abspath(directory) == os.path.abspath(public_dir):
+        raise ValueError("The site index cannot have a slug")
+    return os.path.join(os.path.dirname(directory), slug, "index.html")
+
+def is_draft(front):
+    return front.get("draft") is True
+
+def _claim_dest(producers, dest_path, from_path):
+    other = producers.setdefault(dest_path, from_path)
+    if other != from_path:
+        raise ValueError(f"Output {dest_path} is also produced by {other}")
+
+PendingPage = namedtuple("PendingPage", ["from_path", "dest_path", "source", "source_hash", "dest", "deps", "front", "stat"])
+
+def generate_pages_recursively(content_dir, template_path, public_dir, basepath, manifest=None, jobs=1, cache_path=None,
+                               cache_size=None, write_threads=WRITE_THREADS, write_if_changed=False, shard=None,
+                               compressor=None, search_terms=None, drafts=False):
     """
     Generates HTML pages for all markdown files in a content directory, preserving the directory structure.
 
+    Each page is rendered with the nearest section template or the site template, with partials
+    expanded; see TemplateSet. Front matter (see sources.parse_front_matter) is read from the
+    head of each page only: "draft: true" pages are skipped, "template" picks another template,
+    "slug" renames the output (see front_matter_dest) and "date" and "title" override the
+    recorded metadata. Two pages producing the same output are an error. Only pages that get
+    rendered are read in full.
+
+    When a build manifest is given, pages whose size and modification time match the manifest
+    are not read at all; their recorded hash and front matter are reused. Only pages whose source, templates,
+    partials or basepath changed since the manifest was recorded are regenerated, and outputs of
+    deleted sources are removed. The manifest is updated in place, including the link and image
+    URLs (see links.check_links) and the title and date (see page_meta) of every rendered page;
+    saving it is left to the caller.
+
     Args:
         content_dir (str): The path to the content directory containing markdown files.
-        template_path (str): The path to the HTML template file.
+        template_path (str): The path to the site HTML template file.
         public_dir (str): The path to the public directory where generated HTML files will be saved.
+        basepath (str): The base path for the site.
+        manifest (BuildManifest, optional): The manifest of the previous build.
+        jobs (int): The number of worker processes to render with; see render_pages.
+        cache_path (str, optional): The path of a persistent block render cache to use.
+        cache_size (int, optional): The maximum size of the render cache in bytes.
+        write_threads (int): The number of background page writer threads; see render_pages.
+        write_if_changed (bool): Whether to leave outputs whose rendered bytes are unchanged
+            untouched, comparing against the output hashes recorded in the manifest.
+        shard (tuple, optional): (index, count) to build only the pages shard_of assigns to
+            shard index; the manifest then only ever holds that shard's pages.
+        compressor (Compressor, optional): Writes precompressed siblings of rendered pages. Pages
+            that are otherwise unchanged but lack their siblings are re-rendered.
+        search_terms (dict, optional): The title and search terms of every page of the previous
+            build, keyed by source path; updated in place for rendered and removed pages (see
+            search.build_search_index). Pages missing from it are re-rendered. Only used with a
+            manifest.
+        drafts (bool): Whether to render draft pages too.
+
+    Returns:
+        Counter: The number of pages "rendered", left "unchanged" and "removed", the number of
+        "drafts" skipped, plus the cache and write counts from render_pages.
     """
-    for root, dirs, files in os.walk(content_dir):
-        for file in files:
-            if file.endswith(".md"):
-                relative_path = os.path.relpath(root, content_dir)
-                dest_directory = os.path.join(public_dir, relative_path)
-                if not os.path.exists(dest_directory):
-                    os.makedirs(dest_directory)
-                from_path = os.path.join(root, file)
-                dest_path = os.path.join(dest_directory, file[:-3] + ".html")
-                generate_page(from_path, template_path, dest_path, basepath)
-            
\ No newline at end of file
+    stats = Counter()
+    with profiling.stage("discover"):
+        pages = find_markdown_pages(content_dir, public_dir)
+        if shard is not None:
+            index, count = shard
+            pages = [(from_path, dest_path) for from_path, dest_path in pages
+                     if shard_of(os.path.relpath(from_path, content_dir), count) == index]
+    producers = {}
+    templates = TemplateSet(template_path, content_dir, basepath)
+    if manifest is None:
+        selected = []
+        for from_path, dest_path in pages:
+            try:
+                front = read_front_matter(from_path)
+                if is_draft(front) and not drafts:
+                    stats["drafts"] += 1
+                    continue
+                if front.get("slug"):
+                    dest_path = front_matter_dest(dest_path, public_dir, front["slug"])
+                _claim_dest(producers, dest_path, from_path)
+                if front.get("template"):
+                    templates.front_matter_path(front["template"])
+            except (OSError, ValueError) as e:
+                raise RuntimeError(f"Failed to generate page from {from_path}: {e}") from e
+            selected.append((from_path, dest_path, front.get("template")))
+        pages = selected
+        for dest_directory in {os.path.dirname(dest_path) for _, dest_path, _ in pages}:
+            os.makedirs(dest_directory, exist_ok=True)
+        stats += render_pages(pages, template_path, basepath, jobs=jobs, cache_path=cache_path, cache_size=cache_size,
+                              write_threads=write_threads, output_hashes={} if write_if_changed else None,
+                              content_dir=content_dir, compressor=compressor)
+        stats["rendered"] += len(pages)
+        return stats
+
+    settings_match = manifest.settings_match(basepath)
+    manifest.basepath = basepath
+
+    seen = set()
+    pending = []
+    dest_directories = set()
+    for from_path, dest_path in pages:
+        source = os.path.relpath(from_path, content_dir)
+        previous = manifest.pages.get(source)
+        with profiling.stage("hash"):
+            try:
+                st = os.stat(from_path)
+                stat = [st.st_size, st.st_mtime_ns]
+                if previous is not None and previous.get("stat") == stat and "hash" in previous:
+                    source_hash, front = previous["hash"], previous.get("front", {})
+                else:
+                    source_hash, front = None, read_front_matter(from_path)
+                if is_draft(front) and not drafts:
+                    stats["drafts"] += 1
+                    continue
+                if front.get("slug"):
+                    dest_path = front_matter_dest(dest_path, public_dir, front["slug"])
+                _claim_dest(producers, dest_path, from_path)
+                if source_hash is None:
+                    source_hash = hash_file(from_path)
+                _, deps = templates.for_page(from_path, front.get("template"))
+            except (OSError, ValueError) as e:
+                raise RuntimeError(f"Failed to generate page from {from_path}: {e}") from e
+        dest = os.path.relpath(dest_path, public_dir)
+        seen.add(source)
+        if (settings_match and manifest.is_fresh(source, source_hash, dest, deps) and os.path.exists(dest_path)
+                and (compressor is None or not compressor.needs(dest_path))
+                and (search_terms is None or source in search_terms)):
+            previous["stat"] = stat
+            stats["unchanged"] += 1
+            continue
+        if previous is not None and previous.get("dest") != dest:
+            remove_output(public_dir, previous["dest"])
+        dest_directories.add(os.path.dirname(dest_path))
+        pending.append(PendingPage(from_path, dest_path, source, source_hash, dest, deps, front, stat))
+
+    for dest_directory in dest_directories:
+        os.makedirs(dest_directory, exist_ok=True)
+    outlines = {}
+    output_hashes = None
+    if write_if_changed:
+        output_hashes = {}
+        for page in pending:
+            previous = manifest.pages.get(page.source)
+            if previous is not None and previous.get("dest") == page.dest:
+                output_hashes[page.dest_path] = previous.get("output")
+    stats += render_pages([(page.from_path, page.dest_path, page.front.get("template")) for page in pending],
+                          template_path, basepath,
+                          jobs=jobs, cache_path=cache_path, cache_size=cache_size, write_threads=write_threads,
+                          output_hashes=output_hashes, content_dir=content_dir, compressor=compressor,
+                          outlines=outlines, index_terms=search_terms is not None)
+    for page in pending:
+        output_hash = output_hashes.get(page.dest_path) if output_hashes is not None else None
+        outline = outlines[page.dest_path]
+        try:
+            meta = page_meta(page.from_path, outline, page.front)
+        except ValueError as e:
+            raise RuntimeError(f"Failed to generate page from {page.from_path}: {e}") from e
+        manifest.record(page.source, page.source_hash, page.dest, output_hash, page.deps, outline.links, meta,
+                        page.front, page.stat)
+        if search_terms is not None:
+            search_terms[page.source] = {"title": outline.title, "terms": sorted(outline.terms)}
+    stats["rendered"] += len(pending)
+
+    for source in [source for source in manifest.pages if source not in seen]:
+        entry = manifest.remove(source)
+        if search_terms is not None:
+            search_terms.pop(source, None)
+        remove_output(public_dir, entry["dest"])
+        stats["removed"] += 1
+    return stats
@@ -1,49 +1,97 @@
-from typing import Optional
+from types import MappingProxyType
+
+EMPTY_PROPS = MappingProxyType({})
 
 class HtmlNode:
-    def __init__(self, tag: Optional[str] = None, value: Optional[str] = None, children: Optional[list] = None, props: Optional[dict] = None):
+    __slots__ = ("tag", "value", "children", "props")
+
+    def __init__(self, tag: str | None = None, value: str | None = None, children: list | None = None, props: dict | None = None):
         self.tag = tag
         self.value = value
         self.children = children if children is not None else []
-        self.props = props if props is not None else {}
+        self.props = props if props is not None else EMPTY_PROPS
 
     def __repr__(self):
         return f"HtmlNode(tag={self.tag!r}, value={self.value!r}, children={self.children!r}, props={self.props!r})"
-    
+
     def to_html(self):
         raise NotImplementedError("to_html method not implemented yet")
 
+    def iter_html(self):
+        """
+        Yields the HTML of this node as a sequence of string fragments, without joining them.
+        """
+        raise NotImplementedError("iter_html method not implemented yet")
+
+    def write_html(self, fp):
+        """
+        Writes the HTML of this node fragment by fragment to a file-like object.
+        """
+        fp.writelines(self.iter_html())
+
     def props_to_html(self):
-        if self.props is None:
+        if not self.props:
             return ""
-        return_value = ""
-        for key, value in self.props.items():
-            return_value += f' {key}="{value}"'
-        return return_value
+        return "".join([f' {key}="{value}"' for key, value in self.props.items()])
 
 
 class LeafNode(HtmlNode):
-    
-    def __init__(self, tag: Optional[str], value: Optional[str], props: Optional[dict] = None):
-        super().__init__(tag=tag, value=value, children=None, props=props)
-    
+    __slots__ = ()
+
+    def __init__(self, tag: str | None, value: str | None, props: dict | None = None):
+        self.tag = tag
+        self.value = value
+        self.children = None
+        self.props = props if props is not None else EMPTY_PROPS
+
     def to_html(self):
         if self.value is None:
             raise ValueError("LeafNode must have a value to convert to HTML")
         if self.tag is None:
             return self.value
         return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
-    
+
+    def iter_html(self):
+        yield self.to_html()
+
 
 class ParentNode(HtmlNode):
-    
-    def __init__(self, tag: str, children: list, props: Optional[dict] = None):
-        super().__init__(tag=tag, value=None, children=children, props=props)
-    
-    def to_html(self):
+    __slots__ = ()
+
+    def __init__(self, tag: str, children: list, props: dict | None = None):
+        self.tag = tag
+        self.value = None
+        self.children = children
+        self.props = props if props is not None else EMPTY_PROPS
+
+    def _open_tag(self):
         if self.tag is None:
             raise ValueError("ParentNode must have a tag to convert to HTML")
         if self.children is None:
             raise ValueError("ParentNode must have children to convert to HTML")
-        children_html = ''.join(child.to_html() for child in self.children)
-        return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
\ No newline at end of file
+        return f"<{self.tag}{self.props_to_html()}>"
+
+    def to_html(self):
+        return "".join(self.iter_html())
+
+    def iter_html(self):
+        """
+        Yields the HTML of this subtree in document order. The tree is walked with an explicit
+        stack, so nesting depth costs neither recursion nor a generator per level.
+        """
+        yield self._open_tag()
+        stack = [(self, iter(self.children))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if isinstance(child, ParentNode):
+                    yield child._open_tag()
+                    stack.append((child, iter(child.children)))
+                    break
+                elif isinstance(child, LeafNode):
+                    yield child.to_html()
+                else:
+                    yield from child.iter_html()
+            else:
+                stack.pop()
+                yield f"</{node.tag}>"
@@ -0,0 +1,86 @@
+import os
+import posixpath
+from urllib.parse import unquote, urlsplit
+
+
+def resolve_link(url, dest):
+    """
+    Resolves a link or image URL found on a page to a path relative to the public directory.
+
+    Args:
+        url (str): The URL as written in the markdown, before basepath rewriting.
+        dest (str): The output path of the linking page, relative to the public directory.
+
+    Returns:
+        str or None: The target path ("" for the site root), or None for external links and
+        same-page anchors, which are not checked.
+    """
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+    path = unquote(parts.path)
+    if path.startswith("/"):
+        target = path.lstrip("/")
+    else:
+        target = posixpath.join(posixpath.dirname(dest.replace(os.sep, "/")), path)
+    target = posixpath.normpath(target) if target else ""
+    return "" if target == "." else target
+
+
+def link_targets(manifest):
+    """
+    Returns every path a link can point at: the outputs of all recorded pages, all synced static
+    assets and the generated listing pages and feeds, relative to the public directory.
+
+    Args:
+        manifest (BuildManifest): The build manifest.
+
+    Returns:
+        set of str: The target paths, with "/" separators.
+    """
+    targets = {entry["dest"].replace(os.sep, "/") for entry in manifest.pages.values()}
+    targets.update(asset.replace(os.sep, "/") for asset in manifest.assets)
+    targets.update(manifest.generated)
+    return targets
+
+
+def target_exists(target, targets):
+    """
+    Checks whether a resolved link target is produced by the build, either as the file itself,
+    as a directory with an index.html, or as an extensionless link to an .html page.
+    """
+    if target in targets:
+        return True
+    index = posixpath.join(target, "index.html") if target else "index.html"
+    return index in targets or target + ".html" in targets
+
+
+def check_links(manifest, previous_targets=None):
+    """
+    Resolves the recorded links of the pages in a manifest against its recorded outputs and
+    assets, storing each page's broken links in its entry. Pages that were not re-rendered keep
+    their stored result unless the set of targets changed since previous_targets, so a rebuild
+    that only edits pages re-checks just those pages. No page is read or parsed.
+
+    Args:
+        manifest (BuildManifest): The build manifest, updated in place.
+        previous_targets (set, optional): The link_targets of the manifest before the build;
+            None re-checks every page.
+
+    Returns:
+        list of tuple: The (source, url) pairs of all broken internal links, sorted.
+    """
+    targets = link_targets(manifest)
+    recheck_all = previous_targets != targets
+    broken = []
+    for source, entry in manifest.pages.items():
+        if recheck_all or "broken" not in entry:
+            entry["broken"] = [url for url in entry.get("links", ())
+                               if not _link_ok(url, entry["dest"], targets)]
+        broken.extend((source, url) for url in entry["broken"])
+    return sorted(broken)
+
+
+def _link_ok(url, dest, targets):
+    target = resolve_link(url, dest)
+    return target is None or target_exists(target, targets)
@@ -1,32 +1,333 @@
+import argparse
 import sys
-from functions import recursive_directory_copy,generate_pages_recursively
+from collections import Counter
+from functions import sync_directory,generate_pages_recursively,set_inline_memo_size,INLINE_MEMO_SIZE,find_markdown_pages,shard_of,is_draft
+from sources import read_front_matter
+from writer import WRITE_THREADS
+from manifest import BuildManifest, MANIFEST_NAME, shard_manifest_name
 import os
-import shutil
-
-def main():
-
-    basepath = sys.argv[1] if len(sys.argv) > 1 else "/"
-
-    """Delete everything in the  public directory
-    """
-    public_dir = os.path.join(os.getcwd(), "docs")
-    if os.path.exists(public_dir):
-        for filename in os.listdir(public_dir):
-            file_path = os.path.join(public_dir, filename)
-            if os.path.isfile(file_path) or os.path.islink(file_path):
-                os.remove(file_path)
-            elif os.path.isdir(file_path):
-                shutil.rmtree(file_path)
-    """Copy all the static files from static to public"""
-    static_dir = os.path.join(os.getcwd(), "static")
-    if os.path.exists(static_dir):
-        recursive_directory_copy(static_dir, public_dir)
-    
+import profiling
+
+CACHE_DIR = ".cache"
+RENDER_CACHE_NAME = "render.sqlite"
+RENDER_CACHE_SIZE = 256 * 1024 * 1024
+BROKEN_LINKS_SHOWN = 20
+
+def parse_shard(text):
+    """
+    Parses a --shard value of the form "i/N" into (i, N).
+    """
+    index, _, count = text.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, got {text!r}") from None
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 0 and N - 1, got {text!r}")
+    return index, count
+
+def parse_encodings(text):
+    """
+    Parses a --compress value, a comma separated list of encodings, into a tuple.
+    """
+    encodings = tuple(encoding.strip() for encoding in text.split(",") if encoding.strip())
+    for encoding in encodings:
+        if encoding not in ("gzip", "br"):
+            raise argparse.ArgumentTypeError(f"unknown encoding {encoding!r}, expected gzip or br")
+    return encodings
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the static site from content/ into docs/. Use 'serve' to run the dev server "
+                                                 "and 'merge-shards N' to combine sharded builds.")
+    parser.add_argument("basepath", nargs="?", default="/", help="base path the site is served from")
+    parser.add_argument("--incremental", action="store_true", help="only regenerate pages whose inputs changed since the last build")
+    parser.add_argument("-j", "--jobs", type=int, default=1, metavar="N", help="render pages with N worker processes (0 = one per CPU)")
+    parser.add_argument("--checksum-assets", action="store_true", help="compare static files by content hash instead of size and mtime")
+    parser.add_argument("--link-assets", action="store_true", help="hardlink static files into docs/ instead of copying them")
+    parser.add_argument("--render-cache", action="store_true", help="reuse rendered HTML of unchanged blocks from .cache/render.sqlite")
+    parser.add_argument("--render-cache-size", type=int, default=256, metavar="MB", help="maximum size of the render cache")
+    parser.add_argument("--inline-cache-size", type=int, default=INLINE_MEMO_SIZE, metavar="N", help="inline fragments to memoize per process (0 disables)")
+    parser.add_argument("--write-threads", type=int, default=WRITE_THREADS, metavar="N", help="threads writing pages behind rendering (0 writes synchronously)")
+    parser.add_argument("--write-if-changed", action="store_true", help="keep docs/ and only rewrite outputs whose rendered bytes changed")
+    parser.add_argument("--shard", type=parse_shard, metavar="i/N", help="build only shard i of N (numbered from 0); combine with merge-shards")
+    parser.add_argument("--compress", type=parse_encodings, metavar="ENCODINGS", help="also write precompressed siblings of pages and assets (gzip, br or gzip,br)")
+    parser.add_argument("--compress-min-size", type=int, default=1024, metavar="BYTES", help="smallest output to compress")
+    parser.add_argument("--search-index", action="store_true", help="also write a client-side search index to docs/search.json")
+    parser.add_argument("--site-url", metavar="URL", help="also write sitemap.xml and an Atom feed of blog/ with absolute URLs on URL")
+    parser.add_argument("--site-author", metavar="NAME", help="author of the Atom feed (default: author in the front matter of content/index.md, then the site title)")
+    parser.add_argument("--blog-listing", action="store_true", help="also write paginated listing pages of blog/")
+    parser.add_argument("--posts-per-page", type=int, default=10, metavar="N", help="posts per listing page")
+    parser.add_argument("--drafts", action="store_true", help="also render pages marked draft in their front matter")
+    parser.add_argument("--check-links", action="store_true", help="report broken internal links and exit with status 1 if there are any")
+    parser.add_argument("--profile", action="store_true", help="print the slowest pages and a per-stage time breakdown")
+    parser.add_argument("--profile-top", type=int, default=10, metavar="N", help="number of slowest pages to report")
+    parser.add_argument("--profile-trace", metavar="FILE", help="also write a Chrome trace (speedscope/Perfetto compatible) to FILE")
+    return parser.parse_args(argv)
+
+def build(root, basepath="/", incremental=False, jobs=1, checksum_assets=False, link_assets=False,
+          render_cache=False, render_cache_size=RENDER_CACHE_SIZE, write_threads=WRITE_THREADS, write_if_changed=False,
+          shard=None, compressor=None, broken_links=None, search_index=False, site_url=None, blog_listing=False,
+          posts_per_page=10, drafts=False, site_author=None):
+    """
+    Builds the site rooted at a directory: copies static/ and renders content/ with template.html into docs/.
+    Build state (the manifest and search terms) is kept in .cache/, so docs/ only holds what is published.
+
+    Args:
+        root (str): The directory holding content/, static/ and template.html.
+        basepath (str): The base path the site is served from.
+        incremental (bool): Whether to keep docs/ and only regenerate pages whose inputs changed.
+        jobs (int): The number of worker processes to render with.
+        checksum_assets (bool): Whether to compare static files by content hash.
+        link_assets (bool): Whether to hardlink static files instead of copying them.
+        render_cache (bool): Whether to reuse rendered blocks from the cache under .cache/.
+        render_cache_size (int): The maximum size of the render cache in bytes.
+        write_threads (int): The number of threads writing pages behind rendering.
+        write_if_changed (bool): Whether to keep docs/ and only rewrite outputs whose bytes changed.
+            A full build still renders every page, but leaves identical outputs untouched.
+        shard (tuple, optional): (index, count) to render only that shard's pages and record them in
+            the shard's own manifest. Shards never wipe docs/, so several can build into it at
+            once; shard 0 also syncs static/.
+        compressor (Compressor, optional): Writes precompressed siblings of pages and static files.
+        broken_links (list, optional): When given, is extended with the (source, url) pairs of
+            internal links that resolve to no page or asset; see links.check_links. Sharded
+            builds leave the check to merge-shards.
+        search_index (bool): Whether to write docs/search.json (see search.build_search_index).
+            The terms of every page are kept in .cache/.search-terms.json, so incremental builds
+            only tokenize re-rendered pages. Not supported for sharded builds.
+        site_url (str, optional): Also write sitemap.xml and feed.xml with absolute URLs on this
+            origin; see feeds.write_site_meta. Not supported for sharded builds.
+        blog_listing (bool): Also write paginated listing pages of content/blog/.
+        posts_per_page (int): The number of posts per listing page.
+        drafts (bool): Whether to render pages marked as drafts in their front matter.
+        site_author (str, optional): The author of the Atom feed; see feeds.write_site_meta.
+
+    Returns:
+        Counter: The page and asset counts reported by generate_pages_recursively and sync_directory.
+    """
+    public_dir = os.path.join(root, "docs")
+    state_dir = os.path.join(root, CACHE_DIR)
+    manifest_path = os.path.join(state_dir, MANIFEST_NAME if shard is None else shard_manifest_name(*shard))
+    if incremental:
+        manifest = BuildManifest.load(manifest_path)
+    elif write_if_changed or shard is not None:
+        manifest = BuildManifest.load(manifest_path)
+        manifest.invalidate()
+    else:
+        """Delete everything in the  public directory
+        """
+        manifest = BuildManifest()
+        if os.path.exists(public_dir):
+            for filename in os.listdir(public_dir):
+                file_path = os.path.join(public_dir, filename)
+                if os.path.isfile(file_path) or os.path.islink(file_path):
+                    os.remove(file_path)
+                elif os.path.isdir(file_path):
+                    import shutil
+
+                    shutil.rmtree(file_path)
+    check = broken_links is not None and shard is None
+    if check:
+        from links import check_links, link_targets
+
+        previous_targets = link_targets(manifest)
+    else:
+        # Stored results may go stale while links are not checked; the next check redoes them.
+        for entry in manifest.pages.values():
+            entry.pop("broken", None)
+    if shard is not None and (search_index or site_url is not None or blog_listing):
+        raise ValueError("Search indexes, feeds and listings cannot be built by a sharded build")
+    search_terms = None
+    if search_index:
+        from search import (SEARCH_INDEX_NAME, SEARCH_TERMS_NAME, build_search_index, load_search_terms,
+                            save_search_terms, write_search_index)
+
+        search_terms = load_search_terms(os.path.join(state_dir, SEARCH_TERMS_NAME))
+    """Copy the new and changed static files from static to public"""
+    static_dir = os.path.join(root, "static")
+    stats = Counter()
+    if os.path.exists(static_dir) and (shard is None or shard[0] == 0):
+        with profiling.stage("assets"):
+            stats += sync_directory(static_dir, public_dir, manifest, checksum=checksum_assets, link=link_assets,
+                                    compressor=compressor)
+
     """Generate a page from content/index.md using template.html and write it to public/index.html"""
-    content_path = os.path.join(os.getcwd(), "content")
-    template_path = os.path.join(os.getcwd(), "template.html")
-    generate_pages_recursively(content_path, template_path, public_dir, basepath)
-    
+    content_path = os.path.join(root, "content")
+    template_path = os.path.join(root, "template.html")
+    cache_path = os.path.join(root, CACHE_DIR, RENDER_CACHE_NAME) if render_cache else None
+    stats += generate_pages_recursively(content_path, template_path, public_dir, basepath, manifest=manifest, jobs=jobs,
+                                        cache_path=cache_path, cache_size=render_cache_size, write_threads=write_threads,
+                                        write_if_changed=write_if_changed, shard=shard, compressor=compressor,
+                                        search_terms=search_terms, drafts=drafts)
+    if site_url is not None or blog_listing:
+        from feeds import write_site_meta
+
+        with profiling.stage("feeds"):
+            stats += write_site_meta(manifest, public_dir, content_path, template_path, basepath, site_url=site_url,
+                                     listing=blog_listing, per_page=posts_per_page, compressor=compressor,
+                                     author=site_author)
+    if check:
+        with profiling.stage("links"):
+            broken_links.extend(check_links(manifest, previous_targets))
+    os.makedirs(public_dir, exist_ok=True)
+    if search_terms is not None:
+        with profiling.stage("search"):
+            index = build_search_index(search_terms, manifest, basepath)
+            write_search_index(os.path.join(public_dir, SEARCH_INDEX_NAME), index)
+            save_search_terms(os.path.join(state_dir, SEARCH_TERMS_NAME), search_terms)
+        stats["search_pages"] += len(index["pages"])
+        stats["search_terms"] += len(index["terms"])
+    manifest.save(manifest_path)
+    return stats
+
+def merge_shards(root, count, broken_links=None, drafts=False):
+    """
+    Combines the manifests of a build run as count shards into .cache/.manifest.json, after checking
+    that every page in content/ (drafts aside) was produced by exactly one shard, the one it is
+    assigned to.
+
+    Args:
+        root (str): The directory holding content/ and the shard manifests in .cache/.
+        count (int): The number of shards the build was split into.
+        broken_links (list, optional): When given and the merge succeeds, is extended with the
+            broken internal links of the whole site.
+        drafts (bool): Whether the shards were built with --drafts; otherwise draft pages are not
+            expected from any shard.
+
+    Returns:
+        list of str: The problems found. The merged manifest is only written when there are none.
+    """
+    public_dir = os.path.join(root, "docs")
+    state_dir = os.path.join(root, CACHE_DIR)
+    content_dir = os.path.join(root, "content")
+    problems = []
+    merged = BuildManifest()
+    producers = {}
+    for index in range(count):
+        path = os.path.join(state_dir, shard_manifest_name(index, count))
+        if not os.path.exists(path):
+            problems.append(f"shard {index}/{count}: manifest {path} is missing")
+            continue
+        manifest = BuildManifest.load(path)
+        if index == 0:
+            merged.basepath = manifest.basepath
+            merged.assets = manifest.assets
+            merged.assets_dir = manifest.assets_dir
+        elif manifest.basepath != merged.basepath:
+            problems.append(f"shard {index}/{count}: built for basepath {manifest.basepath!r}, not {merged.basepath!r}")
+        for source, entry in manifest.pages.items():
+            producers.setdefault(source, []).append(index)
+            merged.pages[source] = entry
+            if shard_of(source, count) != index:
+                problems.append(f"{source}: produced by shard {index} but assigned to shard {shard_of(source, count)}")
+            if not os.path.isfile(os.path.join(public_dir, entry["dest"])):
+                problems.append(f"{source}: output {entry['dest']} is missing")
+
+    expected = set()
+    for from_path, _ in find_markdown_pages(content_dir, public_dir):
+        try:
+            if not drafts and is_draft(read_front_matter(from_path)):
+                continue
+        except (OSError, ValueError) as e:
+            problems.append(f"{os.path.relpath(from_path, content_dir)}: {e}")
+        expected.add(os.path.relpath(from_path, content_dir))
+    for source in sorted(expected | set(producers)):
+        shards = producers.get(source, [])
+        if source not in expected:
+            problems.append(f"{source}: produced by shard {shards[0]} but no longer in content/")
+        elif not shards:
+            problems.append(f"{source}: not produced by any shard")
+        elif len(shards) > 1:
+            problems.append(f"{source}: produced by shards {', '.join(map(str, shards))}")
+    if not problems:
+        if broken_links is not None:
+            from links import check_links
+
+            broken_links.extend(check_links(merged))
+        merged.save(os.path.join(state_dir, MANIFEST_NAME))
+    return problems
+
+def merge_main(argv):
+    parser = argparse.ArgumentParser(prog="main.py merge-shards", description="Verify and merge the manifests of a sharded build.")
+    parser.add_argument("count", type=int, help="the number of shards (N in --shard i/N)")
+    parser.add_argument("--drafts", action="store_true", help="the shards were built with --drafts")
+    parser.add_argument("--check-links", action="store_true", help="report broken internal links and exit with status 1 if there are any")
+    args = parser.parse_args(argv)
+    broken_links = [] if args.check_links else None
+    problems = merge_shards(os.getcwd(), args.count, broken_links, drafts=args.drafts)
+    for problem in problems:
+        print(problem)
+    if problems:
+        sys.exit(1)
+    print(f"Merged {args.count} shard manifests")
+    if broken_links:
+        print_broken_links(broken_links)
+        sys.exit(1)
+
+def print_broken_links(broken_links, shown=BROKEN_LINKS_SHOWN):
+    """
+    Prints the number of broken internal links and the first few of them.
+    """
+    print(f"{len(broken_links)} broken internal links")
+    for source, url in broken_links[:shown]:
+        print(f"  {source}: broken link {url}")
+    if len(broken_links) > shown:
+        print(f"  ... and {len(broken_links) - shown} more")
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "serve":
+        from server import serve_main
+        return serve_main(argv[1:])
+    if argv and argv[0] == "merge-shards":
+        return merge_main(argv[1:])
+
+    args = parse_args(argv)
+    profiler = profiling.enable() if args.profile or args.profile_trace else None
+    set_inline_memo_size(args.inline_cache_size)
+    if args.shard is not None and (args.search_index or args.site_url or args.blog_listing):
+        print("--search-index, --site-url and --blog-listing cannot be combined with --shard")
+        sys.exit(1)
+    compressor = None
+    if args.compress:
+        from compress import Compressor
+
+        try:
+            compressor = Compressor(args.compress, min_size=args.compress_min_size)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+    broken_links = [] if args.check_links and args.shard is None else None
+    stats = build(os.getcwd(), args.basepath, incremental=args.incremental, jobs=args.jobs,
+                  checksum_assets=args.checksum_assets, link_assets=args.link_assets,
+                  render_cache=args.render_cache, render_cache_size=args.render_cache_size * 1024 * 1024,
+                  write_threads=args.write_threads, write_if_changed=args.write_if_changed, shard=args.shard,
+                  compressor=compressor, broken_links=broken_links,
+                  search_index=args.search_index, site_url=args.site_url, blog_listing=args.blog_listing,
+                  posts_per_page=args.posts_per_page, drafts=args.drafts, site_author=args.site_author)
+    print(f"{stats['rendered']} pages rendered, {stats['unchanged']} unchanged, {stats['removed']} removed, "
+          f"{stats['drafts']} drafts skipped")
+    print(f"{stats['assets_copied']} assets copied, {stats['assets_unchanged']} unchanged, {stats['assets_removed']} removed")
+    if args.write_if_changed:
+        print(f"{stats['written']} outputs written, {stats['skipped']} identical outputs skipped")
+    print(f"{stats['inline_hits']} inline fragments reused, {stats['inline_misses']} rendered")
+    if args.render_cache:
+        print(f"{stats['cache_hits']} cached blocks reused, {stats['cache_misses']} rendered")
+    if compressor is not None:
+        print(f"{stats['compressed']} outputs compressed")
+    if args.site_url or args.blog_listing:
+        print(f"{stats['generated']} listing and feed outputs written")
+    if args.search_index:
+        print(f"{stats['search_terms']} search terms indexed over {stats['search_pages']} pages")
+    if broken_links is not None:
+        print_broken_links(broken_links)
+    if profiler is not None:
+        print(profiler.summary(args.profile_top))
+        if args.profile_trace:
+            profiler.write_trace(args.profile_trace)
+    if broken_links:
+        sys.exit(1)
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,200 @@
+import os
+
+
+MANIFEST_NAME = ".manifest.json"
+
+
+def hash_bytes(data):
+    """
+    Returns a short hex digest of the given bytes, used to detect changed build inputs.
+
+    Args:
+        data (bytes): The bytes to hash.
+
+    Returns:
+        str: The hex digest.
+    """
+    import hashlib
+
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def hash_file(path):
+    """
+    Returns the content hash of a file on disk.
+
+    Args:
+        path (str): The path to the file.
+
+    Returns:
+        str: The hex digest of the file contents.
+    """
+    with open(path, 'rb') as f:
+        return hash_bytes(f.read())
+
+
+def shard_manifest_name(index, count):
+    """
+    Returns the file name of the manifest written by shard index of count.
+    """
+    return f".manifest.shard-{index}-of-{count}.json"
+
+
+class BuildManifest:
+    """
+    Records the inputs every generated page was built from, so that an incremental
+    build can skip pages whose source, templates and basepath are all unchanged.
+
+    Pages are keyed by their source path relative to the content directory. Each entry
+    stores the source content hash, the output path relative to the public directory, the
+    template and partials the page was rendered with ("deps", relative path to content hash),
+    optionally the hash of the output written there, the link and image URLs of its body
+    ("links") and which of them were found broken ("broken", see links.check_links), and the
+    page's "meta": its title and date, so listings and feeds never re-read unchanged pages.
+    The source's front matter ("front") and size and modification time ("stat") let an
+    incremental build skip reading sources that were not touched.
+    Static assets are keyed by their path relative to the static directory and store the
+    size and modification time (and optionally the hash) they were last synced with;
+    "assets_dir" identifies the directory they were synced into (see functions.directory_id).
+    Outputs generated from the pages' metadata (listing pages, sitemap, feed) are listed in
+    "generated", relative to the public directory, so stale ones can be removed.
+    """
+
+    VERSION = 4
+
+    def __init__(self, basepath=None, pages=None, assets=None, generated=None, assets_dir=None):
+        self.basepath = basepath
+        self.pages = pages if pages is not None else {}
+        self.assets = assets if assets is not None else {}
+        self.generated = generated if generated is not None else []
+        self.assets_dir = assets_dir
+
+    def __repr__(self):
+        return f"BuildManifest(basepath={self.basepath!r}, pages={len(self.pages)})"
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a manifest from disk. A missing, unreadable or outdated manifest yields an
+        empty one, which makes the next build a full build.
+
+        Args:
+            path (str): The path to the manifest file.
+
+        Returns:
+            BuildManifest: The loaded manifest.
+        """
+        import json
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if not isinstance(data, dict) or data.get("version") != cls.VERSION:
+            return cls()
+        return cls(
+            basepath=data.get("basepath"),
+            pages=data.get("pages", {}),
+            assets=data.get("assets", {}),
+            generated=data.get("generated", []),
+            assets_dir=data.get("assets_dir"),
+        )
+
+    def save(self, path):
+        """
+        Writes the manifest to disk, replacing any previous manifest atomically.
+
+        Args:
+            path (str): The path to the manifest file.
+        """
+        import json
+
+        data = {
+            "version": self.VERSION,
+            "basepath": self.basepath,
+            "pages": self.pages,
+            "assets": self.assets,
+            "generated": self.generated,
+            "assets_dir": self.assets_dir,
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def settings_match(self, basepath):
+        """
+        Checks whether the site-wide inputs match the ones the manifest was built with.
+        A changed basepath invalidates every page.
+        """
+        return self.basepath == basepath
+
+    def is_fresh(self, source, source_hash, dest, deps=None):
+        """
+        Checks whether a page's recorded entry matches its current source hash, output path and
+        template dependencies.
+
+        Args:
+            source (str): The source path relative to the content directory.
+            source_hash (str): The current hash of the source file.
+            dest (str): The output path relative to the public directory.
+            deps (dict, optional): The current template and partial hashes of the page.
+
+        Returns:
+            bool: True if the page does not need to be regenerated.
+        """
+        entry = self.pages.get(source)
+        return (entry is not None and entry.get("hash") == source_hash and entry.get("dest") == dest
+                and entry.get("deps") == deps)
+
+    def record(self, source, source_hash, dest, output_hash=None, deps=None, links=None, meta=None, front=None,
+               stat=None):
+        """
+        Records the inputs a page was just generated from, the hash of its output if known, the
+        URLs it links to, its metadata and front matter, and the [size, mtime_ns] of its source
+        when hashed. The page's links are then due to be checked again.
+        """
+        entry = {"hash": source_hash, "dest": dest}
+        if deps is not None:
+            entry["deps"] = deps
+        if output_hash is not None:
+            entry["output"] = output_hash
+        if links:
+            entry["links"] = list(dict.fromkeys(links))
+        if meta is not None:
+            entry["meta"] = meta
+        if front:
+            entry["front"] = front
+        if stat is not None:
+            entry["stat"] = stat
+        self.pages[source] = entry
+
+    def dependents(self, dep):
+        """
+        Returns the sources of the pages that were rendered with a template or partial.
+
+        Args:
+            dep (str): The template or partial path relative to the site root.
+
+        Returns:
+            list of str: The source paths relative to the content directory.
+        """
+        return [source for source, entry in self.pages.items() if dep in entry.get("deps", ())]
+
+    def invalidate(self):
+        """
+        Forgets the recorded inputs so that the next build regenerates every page, while
+        keeping the recorded outputs for cleanup and output comparison.
+        """
+        self.basepath = None
+        for entry in self.pages.values():
+            entry.pop("hash", None)
+            entry.pop("stat", None)
+
+    def remove(self, source):
+        """
+        Removes a page from the manifest and returns its entry, if any.
+        """
+        return self.pages.pop(source, None)
@@ -0,0 +1,133 @@
+import contextlib
+import os
+import threading
+import time
+
+
+class Profiler:
+    """
+    Collects wall and CPU time for build stages, per page. Events are plain tuples so that
+    worker processes can send theirs back to the parent to be merged.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    @contextlib.contextmanager
+    def stage(self, name, page=None):
+        start_wall = time.perf_counter()
+        start_cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            self.events.append((
+                name,
+                page,
+                start_wall,
+                time.perf_counter() - start_wall,
+                time.thread_time() - start_cpu,
+                os.getpid(),
+                threading.get_ident(),
+            ))
+
+    def merge(self, events):
+        self.events.extend(events)
+
+    def stage_totals(self):
+        """
+        Returns:
+            dict: Maps stage names to [count, wall seconds, CPU seconds], excluding the per-page totals.
+        """
+        totals = {}
+        for name, _, _, wall, cpu, _, _ in self.events:
+            if name == "page":
+                continue
+            total = totals.setdefault(name, [0, 0.0, 0.0])
+            total[0] += 1
+            total[1] += wall
+            total[2] += cpu
+        return totals
+
+    def slowest_pages(self, top=10):
+        """
+        Returns:
+            list of tuple: (page, wall seconds, CPU seconds) for the slowest pages.
+        """
+        pages = [(page, wall, cpu) for name, page, _, wall, cpu, _, _ in self.events if name == "page"]
+        return sorted(pages, key=lambda item: item[1], reverse=True)[:top]
+
+    def summary(self, top=10):
+        """
+        Formats the slowest pages and the per-stage breakdown as text.
+        """
+        lines = [f"Slowest {top} pages:"]
+        for page, wall, cpu in self.slowest_pages(top):
+            lines.append(f"  {wall * 1000:9.2f} ms wall {cpu * 1000:9.2f} ms cpu  {page}")
+        totals = self.stage_totals()
+        overall = sum(total[1] for total in totals.values()) or 1.0
+        lines.append("Stages:")
+        for name, (count, wall, cpu) in sorted(totals.items(), key=lambda item: item[1][1], reverse=True):
+            lines.append(f"  {name:<12}{count:>8} calls {wall * 1000:10.2f} ms wall {cpu * 1000:10.2f} ms cpu {wall / overall:6.1%}")
+        return "\n".join(lines)
+
+    def write_trace(self, path):
+        """
+        Writes the events in Chrome trace event format, which chrome://tracing, Perfetto and
+        speedscope can open.
+
+        Args:
+            path (str): The path of the JSON file to write.
+        """
+        origin = min((event[2] for event in self.events), default=0.0)
+        trace_events = []
+        for name, page, start, wall, cpu, pid, tid in self.events:
+            trace_events.append({
+                "name": name if page is None or name != "page" else page,
+                "cat": "build",
+                "ph": "X",
+                "ts": (start - origin) * 1e6,
+                "dur": wall * 1e6,
+                "pid": pid,
+                "tid": tid,
+                "args": {"page": page, "cpu_ms": cpu * 1000},
+            })
+        import json
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+
+
+NULL_STAGE = contextlib.nullcontext()
+
+active = None
+
+
+def enable():
+    """
+    Starts collecting profiling events in this process.
+
+    Returns:
+        Profiler: The active profiler.
+    """
+    global active
+    active = Profiler()
+    return active
+
+
+def disable():
+    global active
+    active = None
+
+
+def stage(name, page=None):
+    """
+    Returns a context manager that times a stage when profiling is enabled. When it is not,
+    this returns a shared no-op context manager, so the hooks cost one call and one check.
+
+    Args:
+        name (str): The stage name, e.g. "read" or "to_html".
+        page (str, optional): The source path of the page being built.
+    """
+    if active is None:
+        return NULL_STAGE
+    return active.stage(name, page)
@@ -0,0 +1,122 @@
+import hashlib
+import os
+import sqlite3
+import time
+
+
+FLUSH_ROWS = 1000
+
+
+class RenderCache:
+    """
+    A persistent cache of rendered HTML fragments, keyed by a hash of a markdown block's text,
+    its BlockType and the basepath it was rendered for. Backed by a sqlite database so that
+    several worker processes can share it.
+
+    Lookups and inserts are buffered in memory and written in one transaction by flush(), which
+    also runs whenever flush_rows of them are buffered, so streaming a huge page keeps memory flat.
+    close() also evicts the least recently used fragments until the cache fits in max_bytes.
+    Opening a cache written by a different parser version discards its contents.
+    """
+
+    def __init__(self, path, version, max_bytes=256 * 1024 * 1024, flush_rows=FLUSH_ROWS):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.flush_rows = flush_rows
+        self.hits = 0
+        self.misses = 0
+        self.pending = {}
+        self.used = set()
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS blocks (key TEXT PRIMARY KEY, html TEXT NOT NULL, size INTEGER NOT NULL, last_used INTEGER NOT NULL)"
+            )
+            row = self.connection.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+            if row is None or row[0] != str(version):
+                self.connection.execute("DELETE FROM blocks")
+                self.connection.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('version', ?)", (str(version),))
+
+    def __repr__(self):
+        return f"RenderCache(path={self.path!r}, hits={self.hits}, misses={self.misses})"
+
+    @staticmethod
+    def key(block, block_type, basepath):
+        """
+        Returns the cache key of a block rendered as the given BlockType for a basepath.
+        """
+        data = f"{block_type.value}\0{basepath or ''}\0{block}".encode("utf-8")
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def get(self, key):
+        """
+        Returns the cached HTML fragment for a key, or None.
+        """
+        html = self.pending.get(key)
+        if html is None:
+            row = self.connection.execute("SELECT html FROM blocks WHERE key = ?", (key,)).fetchone()
+            html = row[0] if row is not None else None
+        if html is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.used.add(key)
+        self._flush_if_full()
+        return html
+
+    def put(self, key, html):
+        self.pending[key] = html
+        self._flush_if_full()
+
+    def _flush_if_full(self):
+        if len(self.pending) + len(self.used) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes buffered fragments and access times to the database.
+        """
+        now = time.time_ns()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO blocks (key, html, size, last_used) VALUES (?, ?, ?, ?)",
+                [(key, html, len(html), now) for key, html in self.pending.items()],
+            )
+            self.connection.executemany(
+                "UPDATE blocks SET last_used = ? WHERE key = ?",
+                [(now, key) for key in self.used if key not in self.pending],
+            )
+        self.pending = {}
+        self.used = set()
+
+    def evict(self):
+        """
+        Removes the least recently used fragments until the stored HTML fits in max_bytes.
+
+        Returns:
+            int: The number of fragments removed.
+        """
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM blocks").fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return 0
+        victims = []
+        for key, size in self.connection.execute("SELECT key, size FROM blocks ORDER BY last_used, key"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        with self.connection:
+            self.connection.executemany("DELETE FROM blocks WHERE key = ?", victims)
+        return len(victims)
+
+    def close(self):
+        self.flush()
+        self.evict()
+        self.connection.close()
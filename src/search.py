@@ -0,0 +1,116 @@
+import json
+import os
+
+from writer import write_atomic
+
+
+SEARCH_INDEX_NAME = "search.json"
+SEARCH_TERMS_NAME = ".search-terms.json"
+VERSION = 1
+
+
+def load_search_terms(path):
+    """
+    Loads the per-page search terms saved by the previous build. A missing, unreadable or
+    outdated file yields an empty dict, which makes every page be re-rendered for the index.
+
+    Args:
+        path (str): The path to the terms file.
+
+    Returns:
+        dict: Source path to {"title", "terms"}.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != VERSION:
+        return {}
+    return data.get("pages", {})
+
+
+def save_search_terms(path, search_terms):
+    """
+    Writes the per-page search terms for the next incremental build.
+
+    Args:
+        path (str): The path to the terms file.
+        search_terms (dict): Source path to {"title", "terms"}.
+    """
+    data = {"version": VERSION, "pages": search_terms}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    write_atomic(path, json.dumps(data, separators=(",", ":"), sort_keys=True).encode("utf-8"))
+
+
+def page_url(dest, basepath):
+    """
+    Returns the URL a page is served at: its directory for index.html outputs, else its path.
+
+    Args:
+        dest (str): The output path relative to the public directory.
+        basepath (str): The base path the site is served from, ending in "/".
+    """
+    dest = dest.replace(os.sep, "/")
+    if dest == "index.html":
+        return basepath
+    if dest.endswith("/index.html"):
+        return basepath + dest[:-len("index.html")]
+    return basepath + dest
+
+
+def build_search_index(search_terms, manifest, basepath):
+    """
+    Builds a compact inverted index of the site for client-side search. Pages are numbered in
+    source order and listed as [url, title]; each term maps to the ascending ids of the pages
+    containing it, delta-encoded (the first id, then the gap to each next one), which keeps the
+    posting lists of common terms short once serialized.
+
+    Entries of search_terms whose page is no longer in the manifest are dropped from it.
+
+    Args:
+        search_terms (dict): Source path to {"title", "terms"}, as filled in by
+            generate_pages_recursively.
+        manifest (BuildManifest): The manifest of the build, mapping sources to outputs.
+        basepath (str): The base path the site is served from.
+
+    Returns:
+        dict: The index, with "version", "pages" and "terms".
+    """
+    for source in [source for source in search_terms if source not in manifest.pages]:
+        del search_terms[source]
+    pages = []
+    postings = {}
+    for page_id, source in enumerate(sorted(search_terms)):
+        entry = search_terms[source]
+        pages.append([page_url(manifest.pages[source]["dest"], basepath), entry["title"]])
+        for term in entry["terms"]:
+            postings.setdefault(term, []).append(page_id)
+    terms = {}
+    for term in sorted(postings):
+        ids = postings[term]
+        terms[term] = [ids[0]] + [ids[i] - ids[i - 1] for i in range(1, len(ids))]
+    return {"version": VERSION, "pages": pages, "terms": terms}
+
+
+def decode_postings(deltas):
+    """
+    Returns the page ids of a delta-encoded posting list.
+    """
+    ids = []
+    page_id = 0
+    for delta in deltas:
+        page_id += delta
+        ids.append(page_id)
+    return ids
+
+
+def write_search_index(path, index):
+    """
+    Writes a search index as compact JSON.
+
+    Args:
+        path (str): The destination path, e.g. docs/search.json.
+        index (dict): The index returned by build_search_index.
+    """
+    write_atomic(path, json.dumps(index, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
@@ -0,0 +1,372 @@
+import argparse
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from functions import copy_file, find_markdown_pages, front_matter_dest, is_draft, remove_output, write_page
+from main import build
+from manifest import BuildManifest
+from sources import read_front_matter
+from template import TemplateSet
+
+
+MAX_POLL_INTERVAL = 1.0
+LIVERELOAD_PATH = "/__livereload"
+LIVERELOAD_SCRIPT = (
+    "<script>new EventSource(\"" + LIVERELOAD_PATH + "\").onmessage = function () { location.reload(); };</script>"
+)
+
+
+def inject_livereload(html):
+    """
+    Adds the live-reload client script to an HTML page, just before </body> when there is one.
+
+    Args:
+        html (str): The HTML page.
+
+    Returns:
+        str: The page with the script added.
+    """
+    index = html.rfind("</body>")
+    if index == -1:
+        return html + LIVERELOAD_SCRIPT
+    return html[:index] + LIVERELOAD_SCRIPT + html[index:]
+
+
+def scan_files(path):
+    """
+    Lists every file under a directory (or a single file) with its modification signature.
+
+    Args:
+        path (str): The directory or file to scan.
+
+    Returns:
+        dict: Maps file paths to (mtime_ns, size) tuples.
+    """
+    files = {}
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+    stack = [path]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    stat = entry.stat()
+                    files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+class ReloadNotifier:
+    """
+    Lets server-sent-event connections wait for the next site change.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.generation = 0
+
+    def notify(self):
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+
+    def wait(self, generation, timeout):
+        """
+        Waits until a change newer than the given generation happens, or the timeout passes.
+
+        Returns:
+            int: The current generation.
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+
+
+class SiteWatcher:
+    """
+    Keeps the compiled templates and the page mapping of a built site in memory, and on each
+    poll re-renders only the pages and static files that changed since the previous poll. The
+    template dependencies of each page are recorded in an in-memory BuildManifest, so when a
+    template or partial changes, only the pages that depend on it re-render.
+    Drafts and slugs in front matter are honoured the same way generate_pages_recursively does.
+    """
+
+    def __init__(self, root, basepath="/", notifier=None, drafts=False):
+        self.content_dir = os.path.join(root, "content")
+        self.static_dir = os.path.join(root, "static")
+        self.template_path = os.path.join(root, "template.html")
+        self.public_dir = os.path.join(root, "docs")
+        self.basepath = basepath
+        self.notifier = notifier
+        self.drafts = drafts
+        self.templates = TemplateSet(self.template_path, self.content_dir, basepath)
+        self.pages = {}
+        self.manifest = BuildManifest(basepath=basepath)
+        for from_path, _ in find_markdown_pages(self.content_dir, self.public_dir):
+            try:
+                front = read_front_matter(from_path)
+                dest_path = self.dest_for(from_path, front)
+                if dest_path is not None:
+                    self.pages[from_path] = dest_path
+                    self.record(from_path, dest_path, self.templates.for_page(from_path, front.get("template"))[1])
+            except (OSError, ValueError):
+                continue
+        self.snapshot = self.scan()
+
+    def scan(self):
+        files = {}
+        for path in (self.content_dir, self.static_dir, self.template_path, self.templates.partials_dir):
+            if os.path.exists(path):
+                files.update(scan_files(path))
+        return files
+
+    def dest_for(self, from_path, front):
+        """
+        Returns the output path of a page given its front matter, or None for a draft that is
+        not rendered.
+
+        Raises:
+            ValueError: If the front matter sets an invalid slug.
+        """
+        if is_draft(front) and not self.drafts:
+            return None
+        relative_path = os.path.relpath(from_path, self.content_dir)
+        dest_path = os.path.join(self.public_dir, relative_path[:-3] + ".html")
+        if front.get("slug"):
+            dest_path = front_matter_dest(dest_path, self.public_dir, front["slug"])
+        return dest_path
+
+    def record(self, from_path, dest_path, deps):
+        self.manifest.record(os.path.relpath(from_path, self.content_dir), None,
+                             os.path.relpath(dest_path, self.public_dir), deps=deps)
+
+    def forget(self, from_path):
+        """
+        Removes the output of a page that was deleted or is no longer rendered.
+        """
+        remove_output(self.public_dir, os.path.relpath(self.pages.pop(from_path), self.public_dir))
+        self.manifest.remove(os.path.relpath(from_path, self.content_dir))
+
+    def render(self, from_path):
+        """
+        Re-renders one page, removing its previous output when it became a draft or its slug changed.
+        """
+        try:
+            front = read_front_matter(from_path)
+            dest_path = self.dest_for(from_path, front)
+            previous = self.pages.get(from_path)
+            if previous is not None and previous != dest_path:
+                self.forget(from_path)
+            if dest_path is None:
+                return
+            for other, other_dest in self.pages.items():
+                if other_dest == dest_path and other != from_path:
+                    raise ValueError(f"Output {dest_path} is also produced by {other}")
+            self.pages[from_path] = dest_path
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            template, deps = self.templates.for_page(from_path, front.get("template"))
+            self.record(from_path, dest_path, deps)
+            write_page(from_path, template, dest_path)
+        except (OSError, ValueError) as e:
+            print(f"Failed to generate page from {from_path}: {e}")
+        except RuntimeError as e:
+            print(e)
+
+    def page_deps(self, from_path):
+        try:
+            return self.templates.for_page(from_path, read_front_matter(from_path).get("template"))[1]
+        except (OSError, ValueError):
+            return None
+
+    def reload_templates(self, paths=None):
+        """
+        Recompiles the templates and re-renders the pages whose template or partials changed.
+
+        Args:
+            paths (list of str, optional): The template and partial files that were modified.
+                Only the pages recorded as depending on them are re-rendered, without reading
+                any other page. Without it every page's dependencies are resolved again, which
+                is needed when a file was added or deleted: that can change which template a
+                page uses.
+
+        Returns:
+            set of str: The source paths of the re-rendered pages.
+        """
+        self.templates = TemplateSet(self.template_path, self.content_dir, self.basepath)
+        rendered = set()
+        if paths is not None:
+            sources = set()
+            for path in paths:
+                sources.update(self.manifest.dependents(self.templates.relative(path)))
+            for source in sorted(sources):
+                rendered.add(os.path.join(self.content_dir, source))
+        else:
+            for from_path in list(self.pages):
+                deps = self.page_deps(from_path)
+                entry = self.manifest.pages.get(os.path.relpath(from_path, self.content_dir), {})
+                if deps is None or deps != entry.get("deps"):
+                    rendered.add(from_path)
+        for from_path in sorted(rendered):
+            self.render(from_path)
+        return rendered
+
+    def poll(self):
+        """
+        Applies every change since the previous poll to the public directory.
+
+        Returns:
+            list of str: The changed source paths.
+        """
+        snapshot = self.scan()
+        changed = [path for path, signature in snapshot.items() if self.snapshot.get(path) != signature]
+        removed = [path for path in self.snapshot if path not in snapshot]
+        previous, self.snapshot = self.snapshot, snapshot
+        if not changed and not removed:
+            return []
+
+        templates = [path for path in changed + removed
+                     if path.endswith(".html") and not path.startswith(self.static_dir + os.sep)]
+        rendered = set()
+        if templates:
+            modified = all(path in previous and path in snapshot for path in templates)
+            rendered = self.reload_templates(templates if modified else None)
+        for path in changed:
+            if path.startswith(self.content_dir + os.sep) and path.endswith(".md"):
+                if path not in rendered:
+                    self.render(path)
+            elif path.startswith(self.static_dir + os.sep):
+                dest_path = os.path.join(self.public_dir, os.path.relpath(path, self.static_dir))
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                copy_file(path, dest_path)
+        for path in removed:
+            if path in self.pages:
+                self.forget(path)
+            elif path.startswith(self.static_dir + os.sep):
+                remove_output(self.public_dir, os.path.relpath(path, self.static_dir))
+
+        if self.notifier is not None:
+            self.notifier.notify()
+        return changed + removed
+
+    def run(self, interval, stop_event, max_interval=MAX_POLL_INTERVAL):
+        """
+        Polls until stop_event is set. The delay between polls starts at interval and doubles
+        after every poll that finds nothing, up to max_interval, so an idle site is not scanned
+        many times a second; the first change drops it back to interval.
+        """
+        delay = interval
+        while not stop_event.wait(delay):
+            start = time.perf_counter()
+            paths = self.poll()
+            if paths:
+                print(f"Rebuilt {len(paths)} changed file(s) in {(time.perf_counter() - start) * 1000:.1f} ms")
+                delay = interval
+            else:
+                delay = min(delay * 2, max(interval, max_interval))
+
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    """
+    Serves the public directory, adds the live-reload script to HTML pages, and streams
+    reload events to browsers on LIVERELOAD_PATH.
+    """
+
+    def __init__(self, *args, notifier=None, **kwargs):
+        self.notifier = notifier
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        if self.path == LIVERELOAD_PATH:
+            return self.send_events()
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and self.path.split("?", 1)[0].endswith("/"):
+            path = os.path.join(path, "index.html")
+        if self.notifier is not None and path.endswith(".html") and os.path.isfile(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                body = inject_livereload(f.read()).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        return super().do_GET()
+
+    def send_events(self):
+        if self.notifier is None:
+            self.send_error(404)
+            return
+        generation = self.notifier.generation
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            while True:
+                current = self.notifier.wait(generation, timeout=15)
+                if current != generation:
+                    generation = current
+                    self.wfile.write(b"data: reload\n\n")
+                else:
+                    self.wfile.write(b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+
+def serve(root, port=8888, basepath="/", watch=False, interval=0.05, drafts=False):
+    """
+    Builds the site incrementally and serves docs/ over HTTP. With watch enabled, content/,
+    static/ and template.html are polled for changes, backing off to MAX_POLL_INTERVAL while
+    nothing changes; changed pages are re-rendered and open browsers reload through a
+    server-sent-events endpoint. Pages and static files are replaced atomically, so a browser
+    never loads a half-written file.
+
+    Args:
+        root (str): The directory holding content/, static/ and template.html.
+        port (int): The port to listen on.
+        basepath (str): The base path pages are rendered for.
+        watch (bool): Whether to watch sources and live-reload browsers.
+        interval (float): Seconds between polls of the watched files right after a change.
+        drafts (bool): Whether to render pages marked as drafts in their front matter.
+    """
+    build(root, basepath, incremental=True, drafts=drafts)
+    notifier = ReloadNotifier() if watch else None
+    handler = functools.partial(LiveReloadHandler, directory=os.path.join(root, "docs"), notifier=notifier)
+    httpd = ThreadingHTTPServer(("", port), handler)
+    httpd.daemon_threads = True
+    stop_event = threading.Event()
+    if watch:
+        watcher = SiteWatcher(root, basepath, notifier, drafts)
+        threading.Thread(target=watcher.run, args=(interval, stop_event), daemon=True).start()
+    print(f"Serving on http://localhost:{httpd.server_address[1]}/")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        httpd.server_close()
+
+
+def serve_main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py serve", description="Serve docs/, optionally rebuilding and live-reloading on changes.")
+    parser.add_argument("--watch", action="store_true", help="re-render changed pages and reload open browsers")
+    parser.add_argument("--port", type=int, default=8888, help="port to listen on")
+    parser.add_argument("--basepath", default="/", help="base path pages are rendered for")
+    parser.add_argument("--interval", type=float, default=0.05, help="seconds between polls right after a change; idle polling backs off to 1 second")
+    parser.add_argument("--drafts", action="store_true", help="also render pages marked draft in their front matter")
+    args = parser.parse_args(argv)
+    serve(os.getcwd(), port=args.port, basepath=args.basepath, watch=args.watch, interval=args.interval,
+          drafts=args.drafts)
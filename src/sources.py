@@ -0,0 +1,187 @@
+import codecs
+import os
+
+
+MMAP_THRESHOLD = 1024 * 1024
+
+
+def decode_source(data):
+    """
+    Decodes markdown source bytes. UTF-8 is tried first and strictly; only when that fails is
+    charset_normalizer imported to detect the encoding. Line endings are normalised to "\\n" the
+    same way text mode reads normalise them.
+
+    Args:
+        data (bytes-like): The raw file contents.
+
+    Returns:
+        str: The decoded text.
+
+    Raises:
+        UnicodeDecodeError: If the data is not UTF-8 and no other encoding fits it.
+    """
+    try:
+        text = str(data, 'utf-8')
+    except UnicodeDecodeError:
+        from charset_normalizer import from_bytes
+
+        match = from_bytes(bytes(data)).best()
+        if match is None:
+            raise
+        text = str(match)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def read_source(f, size=None):
+    """
+    Reads and decodes an open binary file in one go. Files of MMAP_THRESHOLD bytes or more are
+    decoded straight from a memory map, so the raw bytes are never copied into a bytes object.
+
+    Args:
+        f (file): A file opened in binary mode, positioned at its start.
+        size (int, optional): The file size, if the caller already has it.
+
+    Returns:
+        str: The decoded text.
+    """
+    if size is None:
+        size = os.fstat(f.fileno()).st_size
+    if size and size >= MMAP_THRESHOLD:
+        import mmap
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return decode_source(mapped)
+    return decode_source(f.read())
+
+
+def source_encoding(path):
+    """
+    Returns the encoding decode_source would decode a markdown file with, so that files too
+    large to decode in one go can be read in text mode under the same policy: "utf-8" when the
+    whole file is valid UTF-8, checked chunk by chunk, otherwise the detected encoding. Text
+    mode then normalises line endings the same way decode_source does.
+
+    Args:
+        path (str): The path to the markdown file.
+
+    Returns:
+        str: The encoding name.
+
+    Raises:
+        UnicodeDecodeError: If the file is not UTF-8 and no other encoding fits it.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with open(path, 'rb') as f:
+        try:
+            for chunk in iter(lambda: f.read(MMAP_THRESHOLD), b""):
+                decoder.decode(chunk)
+            decoder.decode(b"", final=True)
+            return 'utf-8'
+        except UnicodeDecodeError as e:
+            error = e
+    from charset_normalizer import from_path
+
+    match = from_path(path).best()
+    if match is None:
+        raise error
+    return match.encoding
+
+
+FRONT_MATTER_SEPARATORS = {"---": ":", "+++": "="}
+
+
+def _front_matter_value(value):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    return value
+
+
+def parse_front_matter(lines):
+    """
+    Parses the front matter at the start of a markdown document: "key: value" lines between
+    "---" lines (YAML style) or "key = value" lines between "+++" lines (TOML style). Only
+    flat scalar values are supported; quoted strings are unquoted and true/false become bools.
+    Lines are consumed up to and including the closing delimiter, so the rest of the iterator
+    is the body.
+
+    Args:
+        lines (iterator of str): The document lines; must be an iterator when the body is read
+            from it afterwards.
+
+    Returns:
+        tuple: (dict of front matter, the first line after it or None). Without front matter
+        the dict is empty and the first line is returned unconsumed.
+
+    Raises:
+        ValueError: If the front matter is not closed.
+    """
+    first = next(lines, None)
+    if first is None:
+        return {}, None
+    separator = FRONT_MATTER_SEPARATORS.get(first.strip())
+    if separator is None:
+        return {}, first
+    delimiter = first.strip()
+    front = {}
+    for line in lines:
+        stripped = line.strip()
+        if stripped == delimiter:
+            return front, next(lines, None)
+        if not stripped or stripped.startswith("#") or separator not in stripped:
+            continue
+        key, _, value = stripped.partition(separator)
+        front[key.strip()] = _front_matter_value(value)
+    raise ValueError(f"Front matter is not closed with {delimiter!r}")
+
+
+def split_front_matter(text):
+    """
+    Splits a markdown document into its front matter and its body.
+
+    Args:
+        text (str): The document.
+
+    Returns:
+        tuple: (dict of front matter, str body).
+    """
+    if not text.startswith(("---", "+++")):
+        return {}, text
+    lines = iter(text.splitlines(keepends=True))
+    front, first = parse_front_matter(lines)
+    if first is None:
+        return front, ""
+    return front, first + "".join(lines)
+
+
+def read_front_matter(path):
+    """
+    Reads the front matter of a markdown file without reading or decoding its body: files that
+    do not start with a delimiter cost one line, others stop just after the closing delimiter.
+    The front matter is decoded with decode_source, like the whole file is when it is rendered.
+
+    Args:
+        path (str): The path to the markdown file.
+
+    Returns:
+        dict: The front matter, empty if there is none.
+
+    Raises:
+        ValueError: If the front matter is not closed or cannot be decoded.
+    """
+    with open(path, 'rb') as f:
+        first = f.readline()
+        if not first.startswith((b"---", b"+++")):
+            return {}
+        delimiter = first[:3]
+        header = [first]
+        for line in f:
+            header.append(line)
+            if line.strip() == delimiter:
+                break
+    front, _ = split_front_matter(decode_source(b"".join(header)))
+    return front
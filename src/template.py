@@ -0,0 +1,249 @@
+import os
+import re
+
+from manifest import hash_bytes
+
+
+SLOT_PATTERN = re.compile(r"\{\{\s*(title|content)\s*\}\}", re.IGNORECASE)
+
+
+def rebase_url(url, basepath):
+    """
+    Rewrites a site-absolute URL (one starting with "/") so it is served from the given base path.
+    Relative and external URLs are returned unchanged.
+
+    Args:
+        url (str): The URL to rewrite.
+        basepath (str): The base path for the site, e.g. "/static_site_generator/".
+
+    Returns:
+        str: The rewritten URL.
+    """
+    if basepath and basepath != "/" and url.startswith("/"):
+        return basepath + url[1:]
+    return url
+
+
+class Template:
+    """
+    An HTML template compiled once per build. The template text is split at the first
+    {{ Title }} and {{ Content }} placeholders, and the basepath rewrite of its own href="/ and
+    src="/ attributes is applied up front, so rendering a page is a single join.
+    """
+
+    def __init__(self, content, basepath="/"):
+        if basepath and basepath != "/":
+            content = content.replace("href=\"/", f"href=\"{basepath}").replace("src=\"/", f"src=\"{basepath}")
+        self.basepath = basepath
+        self.pieces = []
+        self.slots = []
+        position = 0
+        for match in SLOT_PATTERN.finditer(content):
+            slot = match.group(1).lower()
+            if slot in self.slots:
+                continue
+            self.pieces.append(content[position:match.start()])
+            self.slots.append(slot)
+            position = match.end()
+        self.pieces.append(content[position:])
+
+    def __repr__(self):
+        return f"Template(slots={self.slots!r}, basepath={self.basepath!r})"
+
+    @classmethod
+    def from_file(cls, path, basepath="/"):
+        """
+        Reads and compiles a template file.
+
+        Args:
+            path (str): The path to the HTML template file.
+            basepath (str): The base path for the site.
+
+        Returns:
+            Template: The compiled template.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read(), basepath)
+
+    def render(self, title, content):
+        """
+        Fills the template with a page title and body.
+
+        Args:
+            title (str): The page title.
+            content (str): The rendered HTML body.
+
+        Returns:
+            str: The final HTML page.
+        """
+        values = {"title": title, "content": content}
+        parts = [self.pieces[0]]
+        for slot, piece in zip(self.slots, self.pieces[1:]):
+            parts.append(values[slot])
+            parts.append(piece)
+        return "".join(parts)
+
+    def render_to(self, fp, title, write_content):
+        """
+        Writes the filled template to a file-like object, letting the caller stream the body.
+
+        Args:
+            fp (file-like): The text stream to write to.
+            title (str): The page title.
+            write_content (callable): Called with fp to write the rendered HTML body in place
+                of the {{ Content }} slot.
+        """
+        fp.write(self.pieces[0])
+        for slot, piece in zip(self.slots, self.pieces[1:]):
+            if slot == "title":
+                fp.write(title)
+            else:
+                write_content(fp)
+            fp.write(piece)
+
+
+PARTIAL_PATTERN = re.compile(r"\{\{>\s*([\w./-]+)\s*\}\}")
+
+SECTION_TEMPLATE_NAME = "_template.html"
+PARTIALS_DIR = "partials"
+
+
+class TemplateSet:
+    """
+    Resolves, compiles and caches the templates of a site for one build.
+
+    A page uses the _template.html of the nearest content directory that has one, falling back
+    to the site template. Templates may include partials from the partials/ directory next to
+    the site template with {{> name }}, and partials may include other partials.
+
+    Each compiled template is kept with its dependencies: a dict mapping the path of the
+    template and of every partial it includes, relative to the site root, to its content hash.
+    Incremental builds record these per page, so editing a partial re-renders only its users.
+    """
+
+    def __init__(self, template_path, content_dir=None, basepath="/", partials_dir=None):
+        self.template_path = template_path
+        self.content_dir = content_dir
+        self.basepath = basepath
+        self.root = os.path.dirname(os.path.abspath(template_path))
+        self.partials_dir = partials_dir if partials_dir is not None else os.path.join(self.root, PARTIALS_DIR)
+        self.sources = {}
+        self.templates = {}
+        self.sections = {}
+
+    def __repr__(self):
+        return f"TemplateSet(template_path={self.template_path!r}, compiled={len(self.templates)})"
+
+    def read(self, path):
+        """
+        Returns the text and content hash of a template or partial file, reading it only once.
+        """
+        source = self.sources.get(path)
+        if source is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+            source = self.sources[path] = (data.decode("utf-8"), hash_bytes(data))
+        return source
+
+    def relative(self, path):
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def resolve(self, from_path):
+        """
+        Returns the path of the template a page is rendered with.
+
+        Args:
+            from_path (str): The path to the markdown file.
+        """
+        if self.content_dir is None:
+            return self.template_path
+        directory = os.path.dirname(from_path)
+        template_path = self.sections.get(directory)
+        if template_path is None:
+            candidate = os.path.join(directory, SECTION_TEMPLATE_NAME)
+            if os.path.isfile(candidate):
+                template_path = candidate
+            elif os.path.abspath(directory) == os.path.abspath(self.content_dir) or directory == os.path.dirname(directory):
+                template_path = self.template_path
+            else:
+                template_path = self.resolve(directory)
+            self.sections[directory] = template_path
+        return template_path
+
+    def expand(self, text, dependencies, including=()):
+        """
+        Replaces every {{> name }} in a template text with the named partial, recursively.
+
+        Args:
+            text (str): The template text.
+            dependencies (dict): Collects the relative path and hash of every partial used.
+            including (tuple): The partials currently being expanded, to detect include cycles.
+
+        Raises:
+            ValueError: If a partial does not exist or includes itself.
+        """
+        def replace(match):
+            name = match.group(1)
+            if name in including:
+                raise ValueError(f"Partial {name!r} includes itself: {' -> '.join(including + (name,))}")
+            path = os.path.join(self.partials_dir, name + ".html")
+            try:
+                partial, partial_hash = self.read(path)
+            except FileNotFoundError:
+                raise ValueError(f"Partial {name!r} not found at {path}") from None
+            dependencies[self.relative(path)] = partial_hash
+            return self.expand(partial, dependencies, including + (name,))
+
+        return PARTIAL_PATTERN.sub(replace, text)
+
+    def front_matter_path(self, template):
+        """
+        Returns the path of a template chosen by a page's front matter.
+
+        Args:
+            template (str): The template path, relative to the site root.
+
+        Raises:
+            ValueError: If the path is absolute or resolves outside the site root and the
+                content directory.
+        """
+        path = os.path.normpath(os.path.join(self.root, template))
+        resolved = os.path.realpath(path)
+        allowed = [os.path.realpath(self.root)]
+        if self.content_dir is not None:
+            allowed.append(os.path.realpath(self.content_dir))
+        if os.path.isabs(template) or not any(os.path.commonpath([resolved, directory]) == directory
+                                              for directory in allowed):
+            raise ValueError(f"Template {template!r} is outside the site root")
+        return path
+
+    def compile(self, template_path):
+        """
+        Returns the compiled template at a path and its dependencies, compiling it on first use.
+
+        Returns:
+            tuple: (Template, dict of relative path to content hash).
+        """
+        compiled = self.templates.get(template_path)
+        if compiled is None:
+            text, template_hash = self.read(template_path)
+            dependencies = {self.relative(template_path): template_hash}
+            template = Template(self.expand(text, dependencies), self.basepath)
+            compiled = self.templates[template_path] = (template, dependencies)
+        return compiled
+
+    def for_page(self, from_path, template=None):
+        """
+        Returns the compiled template for a page and its dependencies; see compile.
+
+        Args:
+            from_path (str): The path to the markdown file.
+            template (str, optional): A template chosen by the page's front matter, relative to
+                the site root; overrides the section and site templates.
+
+        Raises:
+            ValueError: If the template is outside the site root; see front_matter_path.
+        """
+        if template:
+            return self.compile(self.front_matter_path(template))
+        return self.compile(self.resolve(from_path))
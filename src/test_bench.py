@@ -0,0 +1,31 @@
+import unittest
+import tempfile
+import os
+
+from bench import STAGES, compare, generate_corpus, parse_mix, run_benchmark
+
+
+class TestBench(unittest.TestCase):
+    def test_corpus_is_deterministic(self):
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            size = generate_corpus(first, pages=6, page_size=512, depth=2, seed=3)
+            self.assertEqual(generate_corpus(second, pages=6, page_size=512, depth=2, seed=3), size)
+            path = os.path.join("content", "section1", "section0", "page1.md")
+            with open(os.path.join(first, path)) as f1, open(os.path.join(second, path)) as f2:
+                self.assertEqual(f1.read(), f2.read())
+
+    def test_run_benchmark_reports_every_stage(self):
+        results = run_benchmark(pages=4, page_size=512, depth=1)
+        self.assertEqual(list(results["stages"]), STAGES)
+        for key in ["pages_per_sec", "mb_per_sec", "peak_rss_mb", "build_seconds"]:
+            self.assertIn(key, results)
+        self.assertEqual(compare(results, results)[-1].split()[-1], "1.00x")
+
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix("paragraph=3,code"), {"paragraph": 3.0, "code": 1.0})
+        with self.assertRaises(ValueError):
+            parse_mix("table=1")
+
+
+if __name__ == "__main__":
+    unittest.main()
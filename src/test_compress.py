@@ -0,0 +1,105 @@
+import unittest
+import tempfile
+import gzip
+import os
+
+from compress import Compressor
+from functions import generate_pages_recursively, sync_directory
+from manifest import BuildManifest
+
+
+PAGE = "# Title\n\n" + "Some compressible text. " * 100
+STYLE = "body { color: black; }\n" * 100
+
+
+class TestCompressor(unittest.TestCase):
+    def test_compress_bytes_roundtrip_is_deterministic(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "index.html")
+            data = PAGE.encode()
+            compressor = Compressor(min_size=100)
+            self.assertTrue(compressor.compress_bytes(path, data))
+            with open(path + ".gz", 'rb') as f:
+                first = f.read()
+            compressor.compress_bytes(path, data)
+            with open(path + ".gz", 'rb') as f:
+                self.assertEqual(f.read(), first)
+            self.assertEqual(gzip.decompress(first), data)
+            self.assertEqual(compressor.take_stats()["compressed"], 2)
+            self.assertEqual(compressor.take_stats()["compressed"], 0)
+
+    def test_small_and_binary_outputs_lose_siblings(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "index.html")
+            compressor = Compressor(min_size=100)
+            compressor.compress_bytes(path, PAGE.encode())
+            self.assertFalse(compressor.compress_bytes(path, b"<p>tiny</p>"))
+            self.assertFalse(os.path.exists(path + ".gz"))
+            self.assertFalse(compressor.compress_bytes(os.path.join(tmpdir, "a.png"), PAGE.encode()))
+
+    def test_compress_file_matches_compress_bytes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "style.css")
+            with open(path, 'w') as f:
+                f.write(STYLE)
+            compressor = Compressor(min_size=100)
+            self.assertTrue(compressor.needs(path))
+            compressor.compress_file(path)
+            self.assertFalse(compressor.needs(path))
+            with open(path + ".gz", 'rb') as f:
+                streamed = f.read()
+            compressor.compress_bytes(path, STYLE.encode())
+            with open(path + ".gz", 'rb') as f:
+                self.assertEqual(f.read(), streamed)
+
+    def test_unknown_encoding(self):
+        with self.assertRaises(ValueError):
+            Compressor(("zstd",))
+
+
+class TestCompressedBuild(unittest.TestCase):
+    def build(self, root, manifest, compressor):
+        stats = sync_directory(os.path.join(root, "static"), os.path.join(root, "docs"), manifest, compressor=compressor)
+        stats += generate_pages_recursively(os.path.join(root, "content"), os.path.join(root, "template.html"),
+                                            os.path.join(root, "docs"), "/", manifest=manifest, compressor=compressor)
+        return stats
+
+    def test_only_changed_outputs_are_recompressed(self):
+        with tempfile.TemporaryDirectory() as root:
+            for directory in ("content", "static"):
+                os.makedirs(os.path.join(root, directory))
+            with open(os.path.join(root, "template.html"), 'w') as f:
+                f.write("<title>{{ Title }}</title>{{ Content }}")
+            with open(os.path.join(root, "content", "index.md"), 'w') as f:
+                f.write(PAGE)
+            with open(os.path.join(root, "content", "small.md"), 'w') as f:
+                f.write("# Small")
+            with open(os.path.join(root, "static", "style.css"), 'w') as f:
+                f.write(STYLE)
+            docs = os.path.join(root, "docs")
+            manifest = BuildManifest()
+            compressor = Compressor(min_size=256)
+
+            stats = self.build(root, manifest, compressor)
+            self.assertEqual(stats["compressed"], 2)
+            self.assertEqual(sorted(os.listdir(docs)), ["index.html", "index.html.gz", "small.html",
+                                                        "style.css", "style.css.gz"])
+            with open(os.path.join(docs, "index.html"), 'rb') as f, gzip.open(os.path.join(docs, "index.html.gz")) as g:
+                self.assertEqual(g.read(), f.read())
+
+            stats = self.build(root, manifest, compressor)
+            self.assertEqual((stats["compressed"], stats["unchanged"]), (0, 2))
+
+            os.remove(os.path.join(docs, "style.css.gz"))
+            with open(os.path.join(root, "content", "index.md"), 'a') as f:
+                f.write("\n\nMore text.")
+            stats = self.build(root, manifest, compressor)
+            self.assertEqual((stats["compressed"], stats["rendered"], stats["assets_unchanged"]), (2, 1, 1))
+
+            os.remove(os.path.join(root, "content", "index.md"))
+            self.build(root, manifest, compressor)
+            self.assertFalse(os.path.exists(os.path.join(docs, "index.html.gz")))
+
+
+if __name__ == "__main__":
+    unittest.main()
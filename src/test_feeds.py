@@ -0,0 +1,82 @@
+import unittest
+import tempfile
+import os
+
+from feeds import FEED_NAME, SITEMAP_NAME, blog_posts, listing_dests
+from fixtures import read, write
+from main import build
+from manifest import BuildManifest, MANIFEST_NAME
+
+
+class TestBlogPosts(unittest.TestCase):
+    def test_newest_first_without_section_index(self):
+        manifest = BuildManifest(pages={
+            "blog/index.md": {"dest": "blog/index.html", "meta": {"title": "Blog", "date": "2026-01-03T00:00:00Z"}},
+            "blog/old.md": {"dest": "blog/old.html", "meta": {"title": "Old", "date": "2026-01-01T00:00:00Z"}},
+            "blog/new.md": {"dest": "blog/new.html", "meta": {"title": "New", "date": "2026-01-02T00:00:00Z"}},
+            "about.md": {"dest": "about.html", "meta": {"title": "About", "date": "2026-01-04T00:00:00Z"}},
+        })
+        self.assertEqual([source for source, _ in blog_posts(manifest)], ["blog/new.md", "blog/old.md"])
+
+    def test_listing_dests(self):
+        self.assertEqual(listing_dests(0, 10, "blog", set()), ["blog/index.html"])
+        self.assertEqual(listing_dests(21, 10, "blog", set()),
+                         ["blog/index.html", "blog/page/2/index.html", "blog/page/3/index.html"])
+        self.assertEqual(listing_dests(5, 10, "blog", {"blog/index.html"}), ["blog/page/1/index.html"])
+
+
+class TestSiteMetaBuild(unittest.TestCase):
+    def test_adding_a_post_renders_only_that_post(self):
+        with tempfile.TemporaryDirectory() as root:
+            write(root, "template.html", "<title>{{ Title }}</title>{{ Content }}")
+            write(root, "content/index.md", "# Home")
+            write(root, "content/blog/first.md", "# First post", mtime=1_700_000_000)
+            write(root, "content/blog/second.md", "# Second post", mtime=1_700_100_000)
+            build(root, site_url="https://example.com/", blog_listing=True, posts_per_page=1)
+            listing = read(root, "blog/index.html")
+            self.assertIn('<a href="/blog/second.html">Second post</a>', listing)
+            self.assertIn('<a href="/blog/page/2/">Older posts</a>', listing)
+            self.assertIn("First post", read(root, "blog/page/2/index.html"))
+            self.assertIn("<loc>https://example.com/blog/page/2/</loc>", read(root, SITEMAP_NAME))
+            self.assertIn("<title>Home</title>", read(root, FEED_NAME))
+            self.assertIn("<author><name>Home</name></author>", read(root, FEED_NAME))
+
+            write(root, "content/blog/third.md", "# Third post", mtime=1_700_200_000)
+            stats = build(root, incremental=True, site_url="https://example.com", blog_listing=True, posts_per_page=1)
+            self.assertEqual(stats["rendered"], 1)
+            self.assertIn("Third post", read(root, "blog/index.html"))
+            self.assertIn("First post", read(root, "blog/page/3/index.html"))
+
+            os.remove(os.path.join(root, "content", "blog", "third.md"))
+            os.remove(os.path.join(root, "content", "blog", "second.md"))
+            build(root, incremental=True, site_url="https://example.com", blog_listing=True, posts_per_page=1)
+            self.assertFalse(os.path.exists(os.path.join(root, "docs", "blog", "page")))
+            manifest = BuildManifest.load(os.path.join(root, ".cache", MANIFEST_NAME))
+            self.assertEqual(manifest.generated, ["blog/index.html", FEED_NAME, SITEMAP_NAME])
+
+    def test_content_page_taking_over_the_listing_index_is_kept(self):
+        with tempfile.TemporaryDirectory() as root:
+            write(root, "template.html", "<title>{{ Title }}</title>{{ Content }}")
+            write(root, "content/index.md", "# Home")
+            write(root, "content/blog/first.md", "# First post")
+            build(root, blog_listing=True)
+            self.assertIn("First post", read(root, "blog/index.html"))
+
+            write(root, "content/blog/index.md", "# Welcome to the blog")
+            build(root, incremental=True, blog_listing=True)
+            self.assertIn("Welcome to the blog", read(root, "blog/index.html"))
+            self.assertIn("First post", read(root, "blog/page/1/index.html"))
+
+    def test_feed_author(self):
+        with tempfile.TemporaryDirectory() as root:
+            write(root, "template.html", "<title>{{ Title }}</title>{{ Content }}")
+            write(root, "content/index.md", "---\nauthor: Tom Bombadil\n---\n# Home")
+            write(root, "content/blog/first.md", "# First post")
+            build(root, site_url="https://example.com")
+            self.assertIn("<author><name>Tom Bombadil</name></author>", read(root, FEED_NAME))
+            build(root, site_url="https://example.com", site_author="Goldberry & co")
+            self.assertIn("<author><name>Goldberry &amp; co</name></author>", read(root, FEED_NAME))
+
+
+if __name__ == "__main__":
+    unittest.main()
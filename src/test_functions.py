@@ -2,6 +2,7 @@ import unittest
 import tempfile
 import os
 
+from fixtures import read, write
 from textnode import TextNode, TextType
 from functions import extract_markdown_images, extract_markdown_links, markdown_to_blocks, split_nodes_delimiter
 
@@ -316,4 +317,524 @@ def hello():
 
             self.assertIn("<h1>Code Example</h1>", output)
             self.assertIn("<pre>def hello():", output)
-            self.assertIn("print(\"Hello, World!\")", output)
\ No newline at end of file
+            self.assertIn("print(\"Hello, World!\")", output)
+
+class TestIncrementalBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        self.content_dir = os.path.join(self.root, "content")
+        self.public_dir = os.path.join(self.root, "docs")
+        self.template_path = write(self.root, "template.html", "<title>{{ Title }}</title>{{ Content }}")
+        write(self.root, "content/index.md", "# Home\n\n[Post](/blog/post)")
+        write(self.root, "content/blog/post.md", "# Post\n\nHello")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def build(self, manifest, basepath="/"):
+        from functions import generate_pages_recursively
+        return generate_pages_recursively(self.content_dir, self.template_path, self.public_dir, basepath, manifest=manifest)
+
+    def test_unchanged_pages_are_skipped(self):
+        from manifest import BuildManifest
+
+        manifest = BuildManifest()
+        stats = self.build(manifest)
+        self.assertEqual(stats["rendered"], 2)
+
+        write(self.root, "content/index.md", "# Home\n\nEdited")
+        stats = self.build(manifest)
+        self.assertEqual((stats["rendered"], stats["unchanged"]), (1, 1))
+        with open(os.path.join(self.public_dir, "index.html")) as f:
+            self.assertIn("<p>Edited</p>", f.read())
+
+    def test_template_and_basepath_invalidate_every_page(self):
+        from manifest import BuildManifest
+
+        manifest = BuildManifest()
+        self.build(manifest)
+        write(self.root, "template.html", "<h1>{{ Title }}</h1>{{ Content }}")
+        self.assertEqual(self.build(manifest)["rendered"], 2)
+        self.assertEqual(self.build(manifest, basepath="/site/")["rendered"], 2)
+        self.assertEqual(self.build(manifest, basepath="/site/")["rendered"], 0)
+
+    def test_deleted_sources_remove_outputs(self):
+        from manifest import BuildManifest
+
+        manifest = BuildManifest()
+        self.build(manifest)
+        os.remove(os.path.join(self.content_dir, "blog", "post.md"))
+        stats = self.build(manifest)
+        self.assertEqual(stats["removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.public_dir, "blog")))
+        self.assertTrue(os.path.exists(os.path.join(self.public_dir, "index.html")))
+        self.assertNotIn(os.path.join("blog", "post.md"), manifest.pages)
+
+    def test_partial_edit_rerenders_only_its_users(self):
+        from manifest import BuildManifest
+
+        write(self.root, "partials/sidebar.html", "<aside>Archive</aside>")
+        write(self.root, "content/blog/_template.html", "{{> sidebar }}{{ Content }}")
+        manifest = BuildManifest()
+        self.assertEqual(self.build(manifest)["rendered"], 2)
+        self.assertEqual(manifest.dependents("partials/sidebar.html"), [os.path.join("blog", "post.md")])
+
+        write(self.root, "partials/sidebar.html", "<aside>Tags</aside>")
+        stats = self.build(manifest)
+        self.assertEqual((stats["rendered"], stats["unchanged"]), (1, 1))
+        with open(os.path.join(self.public_dir, "blog", "post.html")) as f:
+            self.assertEqual(f.read(), "<aside>Tags</aside><div><h1>Post</h1><p>Hello</p></div>")
+
+        os.remove(os.path.join(self.content_dir, "blog", "_template.html"))
+        stats = self.build(manifest)
+        self.assertEqual((stats["rendered"], stats["unchanged"]), (1, 1))
+
+    def test_write_if_changed_skips_identical_outputs(self):
+        from functions import generate_pages_recursively
+        from manifest import BuildManifest
+
+        manifest = BuildManifest()
+        generate_pages_recursively(self.content_dir, self.template_path, self.public_dir, "/",
+                                   manifest=manifest, write_if_changed=True)
+        index_path = os.path.join(self.public_dir, "index.html")
+        os.utime(index_path, ns=(0, 0))
+
+        manifest.invalidate()
+        write(self.root, "content/blog/post.md", "# Post\n\nEdited")
+        stats = generate_pages_recursively(self.content_dir, self.template_path, self.public_dir, "/",
+                                           manifest=manifest, jobs=2, write_if_changed=True)
+        self.assertEqual((stats["rendered"], stats["written"], stats["skipped"]), (2, 1, 1))
+        self.assertEqual(os.stat(index_path).st_mtime_ns, 0)
+        self.assertIn("output", manifest.pages["index.md"])
+
+    def test_write_if_changed_compares_existing_files_without_manifest(self):
+        from functions import generate_pages_recursively
+
+        generate_pages_recursively(self.content_dir, self.template_path, self.public_dir, "/")
+        write(self.root, "docs/index.html", "stale")
+        stats = generate_pages_recursively(self.content_dir, self.template_path, self.public_dir, "/",
+                                           write_if_changed=True)
+        self.assertEqual((stats["written"], stats["skipped"]), (1, 1))
+        with open(os.path.join(self.public_dir, "index.html")) as f:
+            self.assertIn("<title>Home</title>", f.read())
+
+
+    def test_untouched_sources_are_not_read(self):
+        from manifest import BuildManifest
+
+        manifest = BuildManifest()
+        self.build(manifest)
+        post = os.path.join(self.content_dir, "blog", "post.md")
+        mtime_ns = os.stat(post).st_mtime_ns
+        write(self.root, "content/blog/post.md", "# Tsop\n\nOlleh")
+        os.utime(post, ns=(mtime_ns, mtime_ns))
+        stats = self.build(manifest)
+        self.assertEqual((stats["rendered"], stats["unchanged"]), (0, 2))
+
+        os.utime(post, ns=(mtime_ns + 1, mtime_ns + 1))
+        stats = self.build(manifest)
+        self.assertEqual(stats["rendered"], 1)
+
+
+class TestFrontMatterPages(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        self.content_dir = os.path.join(self.root, "content")
+        self.public_dir = os.path.join(self.root, "docs")
+        self.template_path = os.path.join(self.root, "template.html")
+        write(self.root, "template.html", "<title>{{ Title }}</title>{{ Content }}")
+        write(self.root, "layouts/post.html", "<h1>Post: {{ Title }}</h1>{{ Content }}")
+        write(self.root, "content/index.md", "# Home")
+        write(self.root, "content/blog/tom/index.md", "---\ntitle: Tom\nslug: bombadil\ntemplate: layouts/post.html\n"
+                                                   "date: 2026-01-02\n---\nNo header here")
+        write(self.root, "content/blog/draft.md", "+++\ndraft = true\n+++\n# Draft")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def build(self, manifest=None, drafts=False):
+        from functions import generate_pages_recursively
+        return generate_pages_recursively(self.content_dir, self.template_path, self.public_dir, "/",
+                                          manifest=manifest, drafts=drafts)
+
+    def test_duplicate_outputs_are_rejected(self):
+        from manifest import BuildManifest
+
+        write(self.root, "content/blog/bombadil/index.md", "# Also Tom")
+        for manifest in (None, BuildManifest()):
+            with self.assertRaisesRegex(RuntimeError, "also produced by"):
+                self.build(manifest)
+
+    def test_front_matter_controls_output(self):
+        from manifest import BuildManifest
+
+        manifest = BuildManifest()
+        stats = self.build(manifest)
+        self.assertEqual((stats["rendered"], stats["drafts"]), (2, 1))
+        self.assertEqual(read(self.root, os.path.join("blog", "bombadil", "index.html")), "<h1>Post: Tom</h1><p>No header here</p>")
+        self.assertFalse(os.path.exists(os.path.join(self.public_dir, "blog", "draft.html")))
+        entry = manifest.pages[os.path.join("blog", "tom", "index.md")]
+        self.assertEqual(entry["meta"], {"title": "Tom", "date": "2026-01-02T00:00:00Z"})
+        self.assertEqual(entry["front"]["template"], "layouts/post.html")
+        self.assertIn(os.path.join("layouts", "post.html").replace(os.sep, "/"), entry["deps"])
+
+        stats = self.build(manifest, drafts=True)
+        self.assertEqual((stats["rendered"], stats["unchanged"]), (1, 2))
+        write(self.root, "content/blog/draft.md", "+++\ndraft = true\n+++\n# Draft again")
+        stats = self.build(manifest)
+        self.assertEqual((stats["drafts"], stats["removed"]), (1, 1))
+        self.assertFalse(os.path.exists(os.path.join(self.public_dir, "blog", "draft.html")))
+
+    def test_without_manifest(self):
+        stats = self.build()
+        self.assertEqual((stats["rendered"], stats["drafts"]), (2, 1))
+        self.assertIn("Post: Tom", read(self.root, os.path.join("blog", "bombadil", "index.html")))
+
+    def test_streamed_page_skips_front_matter(self):
+        import functions
+
+        threshold = functions.STREAM_THRESHOLD
+        functions.STREAM_THRESHOLD = 1
+        try:
+            self.build()
+        finally:
+            functions.STREAM_THRESHOLD = threshold
+        self.assertEqual(read(self.root, os.path.join("blog", "bombadil", "index.html")), "<h1>Post: Tom</h1><p>No header here</p>")
+
+    def test_invalid_slug(self):
+        write(self.root, "content/blog/bad.md", "---\nslug: ../escape\n---\n# Bad")
+        with self.assertRaisesRegex(RuntimeError, "bad.md"):
+            self.build()
+
+    def test_template_outside_the_site_root(self):
+        from manifest import BuildManifest
+
+        secret = os.path.join(os.path.dirname(self.root), "secret.html")
+        for template in ("../" + os.path.basename(secret), secret):
+            write(self.root, "content/blog/bad.md", f"---\ntemplate: {template}\n---\n# Bad")
+            for manifest in (None, BuildManifest()):
+                with self.assertRaisesRegex(RuntimeError, "bad.md.*outside the site root"):
+                    self.build(manifest)
+
+
+class TestParallelRendering(unittest.TestCase):
+    def test_parallel_output_matches_serial(self):
+        from functions import generate_pages_recursively
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            content_dir = os.path.join(tmpdir, "content")
+            template_path = os.path.join(tmpdir, "template.html")
+            for i in range(12):
+                page_dir = os.path.join(content_dir, f"section{i % 3}")
+                os.makedirs(page_dir, exist_ok=True)
+                with open(os.path.join(page_dir, f"page{i}.md"), 'w') as f:
+                    f.write(f"# Page {i}\n\nSome **bold** text and a [link](/page{i}).\n\n- a\n- b")
+            with open(template_path, 'w') as f:
+                f.write("<title>{{ Title }}</title><link href=\"/index.css\">{{ Content }}")
+
+            serial_dir = os.path.join(tmpdir, "serial")
+            parallel_dir = os.path.join(tmpdir, "parallel")
+            generate_pages_recursively(content_dir, template_path, serial_dir, "/site/")
+            stats = generate_pages_recursively(content_dir, template_path, parallel_dir, "/site/", jobs=3)
+            self.assertEqual(stats["rendered"], 12)
+
+            for root, _, files in os.walk(serial_dir):
+                for file in files:
+                    serial_path = os.path.join(root, file)
+                    parallel_path = os.path.join(parallel_dir, os.path.relpath(serial_path, serial_dir))
+                    with open(serial_path, 'rb') as f1, open(parallel_path, 'rb') as f2:
+                        self.assertEqual(f1.read(), f2.read())
+
+    def test_parallel_error_names_failing_file(self):
+        from functions import render_pages
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            template_path = os.path.join(tmpdir, "template.html")
+            with open(template_path, 'w') as f:
+                f.write("{{ Title }}{{ Content }}")
+            pages = []
+            for name, text in [("good.md", "# Good"), ("bad.md", "No title here")]:
+                path = os.path.join(tmpdir, name)
+                with open(path, 'w') as f:
+                    f.write(text)
+                pages.append((path, os.path.join(tmpdir, name[:-3] + ".html")))
+
+            with self.assertRaises(RuntimeError) as cm:
+                render_pages(pages, template_path, "/", jobs=2)
+            self.assertIn("bad.md", str(cm.exception))
+
+
+class TestBasepathRewriting(unittest.TestCase):
+    def test_links_are_rebased_when_emitted(self):
+        from functions import markdown_to_html_node
+
+        node = markdown_to_html_node("[Home](/index) and ![pic](/images/a.png)", basepath="/site/")
+        self.assertEqual(node.to_html(), '<p><a href="/site/index">Home</a> and <img src="/site/images/a.png" alt="pic"></img></p>')
+
+        node = markdown_to_html_node("[ext](https://x.dev)", basepath="/site/")
+        self.assertEqual(node.to_html(), '<p><a href="https://x.dev">ext</a></p>')
+
+    def test_code_blocks_are_not_rebased(self):
+        from functions import markdown_to_html_node
+
+        node = markdown_to_html_node('```\n<a href="/x">\n```', basepath="/site/")
+        self.assertEqual(node.to_html(), '<pre><a href="/x"></pre>')
+
+
+class TestInlineLexer(unittest.TestCase):
+    def test_several_links_and_images_in_one_node(self):
+        from functions import split_nodes_link, split_nodes_image, text_to_textnodes
+
+        node = TextNode("[a](/a) and [b](/b) then ![c](/c.png)", TextType.TEXT)
+        self.assertEqual(
+            split_nodes_image(split_nodes_link([node])),
+            [
+                TextNode("a", TextType.LINK, url="/a"),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("b", TextType.LINK, url="/b"),
+                TextNode(" then ", TextType.TEXT),
+                TextNode("c", TextType.IMAGE, url="/c.png"),
+            ],
+        )
+        self.assertEqual(text_to_textnodes(node.text), split_nodes_image(split_nodes_link([node])))
+
+    def test_delimiters_inside_links_are_not_split(self):
+        from functions import text_to_textnodes
+
+        self.assertEqual(
+            text_to_textnodes("see [snake_case](https://x.dev/a_b) _now_"),
+            [
+                TextNode("see ", TextType.TEXT),
+                TextNode("snake_case", TextType.LINK, url="https://x.dev/a_b"),
+                TextNode(" ", TextType.TEXT),
+                TextNode("now", TextType.ITALIC),
+            ],
+        )
+
+    def test_code_protects_other_delimiters(self):
+        from functions import text_to_textnodes
+
+        self.assertEqual(
+            text_to_textnodes("`a_b **c**` and ***q***"),
+            [
+                TextNode("a_b **c**", TextType.CODE),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("*q", TextType.BOLD),
+                TextNode("*", TextType.TEXT),
+            ],
+        )
+
+    def test_unmatched_delimiter_raises(self):
+        from functions import text_to_textnodes
+
+        with self.assertRaises(Exception):
+            text_to_textnodes("an **unclosed bold")
+
+    def test_empty_text(self):
+        from functions import text_to_textnodes
+
+        self.assertEqual(text_to_textnodes(""), [TextNode("", TextType.TEXT)])
+
+
+class TestStreamingPipeline(unittest.TestCase):
+    MARKDOWN = "# Title\n\n\nA **para**\nline two\n\n\n\n- a\n- [b](/b)\n\n```\ncode\n```\n\n> quote\n"
+
+    def test_iter_blocks_matches_markdown_to_blocks(self):
+        import io
+        from functions import iter_blocks
+
+        self.assertEqual(
+            list(iter_blocks(io.StringIO(self.MARKDOWN))),
+            ["# Title", "A **para**\nline two", "- a\n- [b](/b)", "```\ncode\n```", "> quote"],
+        )
+        self.assertEqual(list(iter_blocks(io.StringIO(self.MARKDOWN))), markdown_to_blocks(self.MARKDOWN))
+
+    def test_write_markdown_html_matches_to_html(self):
+        import io
+        from functions import write_markdown_html, markdown_to_html_node
+
+        for markdown in [self.MARKDOWN, "# Only one block"]:
+            out = io.StringIO()
+            write_markdown_html(io.StringIO(markdown), out, basepath="/site/")
+            self.assertEqual(out.getvalue(), markdown_to_html_node(markdown, basepath="/site/").to_html())
+
+    def test_stream_page_matches_render_page(self):
+        from functions import stream_page, render_page
+        from template import Template
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            md_path = os.path.join(tmpdir, "big.md")
+            with open(md_path, 'w') as f:
+                f.write(self.MARKDOWN * 3)
+            template = Template("<title>{{ Title }}</title><a href=\"/\">{{ Content }}</a>", "/site/")
+            dest_path = os.path.join(tmpdir, "big.html")
+            stream_page(md_path, template, dest_path)
+            with open(dest_path) as f:
+                self.assertEqual(f.read(), render_page(self.MARKDOWN * 3, template))
+
+    def test_stream_page_decodes_like_read_source(self):
+        from functions import stream_page, render_page
+        from sources import read_source
+        from template import Template
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            md_path = os.path.join(tmpdir, "big.md")
+            with open(md_path, 'wb') as f:
+                f.write("# Résumé\r\n\r\nCafé crème, naïve façade et œuvre déjà célèbre à Noël.\r\n".encode("cp1252") * 4)
+            with open(md_path, 'rb') as f:
+                markdown = read_source(f)
+            template = Template("<title>{{ Title }}</title>{{ Content }}", "/")
+            dest_path = os.path.join(tmpdir, "big.html")
+            stream_page(md_path, template, dest_path)
+            with open(dest_path) as f:
+                self.assertEqual(f.read(), render_page(markdown, template))
+
+
+class TestClassifyBlock(unittest.TestCase):
+    def test_items_are_stripped(self):
+        from functions import classify_block, BlockType
+
+        self.assertEqual(classify_block("- one\n  -  two"), (BlockType.UNORDERED_LIST, ["one", "two"], 0))
+        self.assertEqual(classify_block("1. one\n10. ten"), (BlockType.ORDERED_LIST, ["one", "ten"], 0))
+        self.assertEqual(classify_block("> a -> b\n>"), (BlockType.QUOTE, ["a -> b", ""], 0))
+        self.assertEqual(classify_block("### Title\nmore"), (BlockType.HEADER, ["Title\nmore"], 3))
+        self.assertEqual(classify_block("```\ncode\n```"), (BlockType.CODE, ["code"], 0))
+        self.assertEqual(classify_block("- one\n1. two"), (BlockType.PARAGRAPH, ["- one\n1. two"], 0))
+
+    def test_quote_paragraphs(self):
+        from functions import markdown_to_html_node
+
+        node = markdown_to_html_node('> "A **quote**"\n>\n> -- Someone')
+        self.assertEqual(node.to_html(), '<blockquote><p>"A <b>quote</b>"</p><p>-- Someone</p></blockquote>')
+
+
+class TestSyncDirectory(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmpdir.name, "static")
+        self.dest = os.path.join(self.tmpdir.name, "docs")
+        write(self.src, "index.css", "body {}")
+        write(self.src, "images/a.png", "png")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_only_changed_files_are_copied(self):
+        from functions import sync_directory
+        from manifest import BuildManifest
+
+        manifest = BuildManifest()
+        stats = sync_directory(self.src, self.dest, manifest)
+        self.assertEqual(stats["assets_copied"], 2)
+        self.assertEqual(os.stat(os.path.join(self.dest, "index.css")).st_mtime_ns, os.stat(os.path.join(self.src, "index.css")).st_mtime_ns)
+
+        stats = sync_directory(self.src, self.dest, manifest)
+        self.assertEqual((stats["assets_copied"], stats["assets_unchanged"]), (0, 2))
+
+        write(self.src, "index.css", "body { color: red }")
+        stats = sync_directory(self.src, self.dest, manifest)
+        self.assertEqual((stats["assets_copied"], stats["assets_unchanged"]), (1, 1))
+        with open(os.path.join(self.dest, "index.css")) as f:
+            self.assertEqual(f.read(), "body { color: red }")
+
+    def test_replaced_destination_is_copied_again(self):
+        import shutil
+        from functions import sync_directory
+        from manifest import BuildManifest
+
+        manifest = BuildManifest()
+        sync_directory(self.src, self.dest, manifest)
+        os.remove(os.path.join(self.dest, "index.css"))
+        stats = sync_directory(self.src, self.dest, manifest)
+        self.assertEqual((stats["assets_copied"], stats["assets_unchanged"]), (0, 2))
+
+        shutil.rmtree(self.dest)
+        stats = sync_directory(self.src, self.dest, manifest)
+        self.assertEqual((stats["assets_copied"], stats["assets_unchanged"]), (2, 0))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "index.css")))
+
+    def test_unchanged_destination_without_manifest(self):
+        from functions import sync_directory
+
+        sync_directory(self.src, self.dest)
+        stats = sync_directory(self.src, self.dest)
+        self.assertEqual(stats["assets_unchanged"], 2)
+
+    def test_stale_assets_are_removed_but_pages_kept(self):
+        from functions import sync_directory
+        from manifest import BuildManifest
+
+        manifest = BuildManifest()
+        sync_directory(self.src, self.dest, manifest)
+        with open(os.path.join(self.dest, "index.html"), 'w') as f:
+            f.write("page")
+        os.remove(os.path.join(self.src, "images", "a.png"))
+        stats = sync_directory(self.src, self.dest, manifest)
+        self.assertEqual(stats["assets_removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "images")))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "index.html")))
+
+    def test_checksum_ignores_touched_files(self):
+        from functions import sync_directory
+        from manifest import BuildManifest
+
+        manifest = BuildManifest()
+        sync_directory(self.src, self.dest, manifest, checksum=True)
+        write(self.src, "index.css", "body {}")
+        stats = sync_directory(self.src, self.dest, manifest, checksum=True)
+        self.assertEqual(stats["assets_copied"], 0)
+
+    def test_link(self):
+        from functions import sync_directory
+
+        sync_directory(self.src, self.dest, link=True)
+        self.assertTrue(os.path.samefile(os.path.join(self.src, "index.css"), os.path.join(self.dest, "index.css")))
+
+
+class TestInlineMemo(unittest.TestCase):
+    def tearDown(self):
+        from functions import set_inline_memo_size, INLINE_MEMO_SIZE
+
+        set_inline_memo_size(INLINE_MEMO_SIZE)
+
+    def test_memoized_output_matches_unmemoized(self):
+        from functions import markdown_to_html_node, set_inline_memo_size
+
+        markdown = "# Nav\n\n- [Home](/)\n- [About](/about)\n\n> **quoted** `code`\n\n- [Home](/)"
+        set_inline_memo_size(0)
+        expected = markdown_to_html_node(markdown, basepath="/site/").to_html()
+        set_inline_memo_size(16)
+        self.assertEqual(markdown_to_html_node(markdown, basepath="/site/").to_html(), expected)
+        self.assertEqual(markdown_to_html_node(markdown, basepath="/site/").to_html(), expected)
+
+    def test_hits_misses_and_eviction(self):
+        from functions import InlineMemo
+
+        memo = InlineMemo(2)
+        self.assertEqual(memo.render("[a](/a)", "/site/"), '<a href="/site/a">a</a>')
+        memo.render("[a](/a)", "/site/")
+        memo.render("[a](/a)", "/")
+        memo.render("b")
+        self.assertEqual(list(memo.fragments), [("[a](/a)", "/"), ("b", None)])
+        stats = memo.take_stats()
+        self.assertEqual((stats["inline_hits"], stats["inline_misses"]), (1, 3))
+        self.assertEqual(memo.take_stats()["inline_hits"], 0)
+
+    def test_render_pages_reports_memo_stats(self):
+        from functions import render_pages, set_inline_memo_size
+
+        set_inline_memo_size(16)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            template_path = os.path.join(tmpdir, "template.html")
+            with open(template_path, 'w') as f:
+                f.write("{{ Title }}{{ Content }}")
+            pages = []
+            for name in ("a", "b"):
+                source = os.path.join(tmpdir, name + ".md")
+                with open(source, 'w') as f:
+                    f.write(f"# {name}\n\n- [Home](/)\n- [About](/about)")
+                pages.append((source, os.path.join(tmpdir, name + ".html")))
+            stats = render_pages(pages, template_path, "/")
+            self.assertEqual((stats["inline_hits"], stats["inline_misses"]), (2, 4))
@@ -55,5 +55,50 @@ class TestParentNode(unittest.TestCase):
             "<div><span><b>grandchild</b></span></div>",
         )
 
+class TestStreamingHtml(unittest.TestCase):
+    def test_iter_html_yields_fragments(self):
+        node = ParentNode("ul", [ParentNode("li", [LeafNode("b", "one")]), ParentNode("li", [LeafNode(None, "two")])], {"class": "x"})
+        fragments = list(node.iter_html())
+        self.assertGreater(len(fragments), 1)
+        self.assertEqual("".join(fragments), '<ul class="x"><li><b>one</b></li><li>two</li></ul>')
+        self.assertEqual(node.to_html(), "".join(fragments))
+
+    def test_write_html(self):
+        import io
+
+        node = ParentNode("div", [ParentNode("p", [LeafNode("i", "deep")])])
+        out = io.StringIO()
+        node.write_html(out)
+        self.assertEqual(out.getvalue(), "<div><p><i>deep</i></p></div>")
+
+    def test_deep_tree_does_not_recurse(self):
+        node = LeafNode(None, "x")
+        for _ in range(5000):
+            node = ParentNode("span", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<span>" * 5000 + "x"))
+
+    def test_invalid_children_raise_while_iterating(self):
+        with self.assertRaises(ValueError):
+            ParentNode("div", [ParentNode(None, [])]).to_html()
+        with self.assertRaises(ValueError):
+            ParentNode("div", [LeafNode("p", None)]).to_html()
+
+
+
+class TestCompactNodes(unittest.TestCase):
+    def test_nodes_have_no_instance_dict(self):
+        for node in [HtmlNode("div"), LeafNode("b", "x"), ParentNode("p", [])]:
+            self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_leaves_share_empty_props_and_have_no_children(self):
+        a = LeafNode(None, "a")
+        b = LeafNode("b", "b")
+        self.assertIs(a.props, b.props)
+        self.assertIsNone(a.children)
+        with self.assertRaises(TypeError):
+            a.props["class"] = "x"
+
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
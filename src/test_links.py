@@ -0,0 +1,100 @@
+import unittest
+import tempfile
+import io
+import os
+
+from fixtures import write
+from functions import PageOutline, markdown_to_html, markdown_to_html_node, write_markdown_html, generate_pages_recursively
+from links import check_links, link_targets, resolve_link
+from manifest import BuildManifest
+from render_cache import RenderCache
+
+
+MARKDOWN = """# Title
+
+See [home](/) and ![a picture](/images/a.png).
+
+> A [quoted](../other) link
+
+```
+[not a link](/code)
+```
+
+- [item](https://example.com)
+- `[code](/span)` and [anchor](#top)"""
+
+URLS = ["/", "/images/a.png", "../other", "https://example.com", "#top"]
+
+
+class TestLinkCollection(unittest.TestCase):
+    def test_every_render_path_collects_the_same_urls(self):
+        outline = PageOutline()
+        markdown_to_html_node(MARKDOWN, "/site/", outline)
+        self.assertEqual(outline.links, URLS)
+
+        outline = PageOutline()
+        write_markdown_html(io.StringIO(MARKDOWN), io.StringIO(), "/site/", outline=outline)
+        self.assertEqual(outline.links, URLS)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = RenderCache(os.path.join(tmpdir, "render.sqlite"), 1)
+            for _ in range(2):
+                outline = PageOutline()
+                markdown_to_html(MARKDOWN, "/site/", cache, outline)
+                self.assertEqual(outline.links, URLS)
+            self.assertGreater(cache.hits, 0)
+            cache.close()
+
+
+class TestResolveLink(unittest.TestCase):
+    def test_resolve(self):
+        self.assertEqual(resolve_link("/blog/post", "index.html"), "blog/post")
+        self.assertEqual(resolve_link("/", "blog/post/index.html"), "")
+        self.assertEqual(resolve_link("../tom/?x=1#top", "blog/post/index.html"), "blog/tom")
+        self.assertEqual(resolve_link("/a%20b.png", "index.html"), "a b.png")
+        self.assertEqual(resolve_link("../../../up", "blog/index.html"), "../../up")
+        self.assertIsNone(resolve_link("https://example.com/x", "index.html"))
+        self.assertIsNone(resolve_link("mailto:me@example.com", "index.html"))
+        self.assertIsNone(resolve_link("#top", "index.html"))
+
+
+class TestCheckLinks(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmpdir.name, "content")
+        self.public = os.path.join(self.tmpdir.name, "docs")
+        self.template = write(self.tmpdir.name, "template.html", "<title>{{ Title }}</title>{{ Content }}")
+        write(self.content, "index.md", "# Home\n\n[post](/blog/post) [about](/about.html) ![logo](/logo.png)")
+        write(self.content, "blog/post.md", "# Post\n\n[home](../) [missing](missing)")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def build(self, manifest):
+        previous_targets = link_targets(manifest)
+        generate_pages_recursively(self.content, self.template, self.public, "/", manifest=manifest)
+        return check_links(manifest, previous_targets)
+
+    def test_reports_and_rechecks_broken_links(self):
+        manifest = BuildManifest(assets={"logo.png": {}})
+        self.assertEqual(self.build(manifest), [("blog/post.md", "missing"), ("index.md", "/about.html")])
+
+        write(self.content, "about.md", "# About")
+        self.assertEqual(self.build(manifest), [("blog/post.md", "missing")])
+
+        write(self.content, "blog/post.md", "# Post\n\n[home](../)")
+        self.assertEqual(self.build(manifest), [])
+
+        os.remove(os.path.join(self.content, "about.md"))
+        self.assertEqual(self.build(manifest), [("index.md", "/about.html")])
+
+    def test_unchanged_pages_are_not_rechecked(self):
+        manifest = BuildManifest(assets={"logo.png": {}})
+        self.build(manifest)
+        manifest.pages["index.md"]["links"].append("/stale")
+        self.assertEqual(len(self.build(manifest)), 2)
+        self.assertEqual(len(check_links(manifest)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+import tempfile
+import contextlib
+import io
+import os
+import subprocess
+import sys
+
+from fixtures import write
+from main import build, merge_shards, parse_shard, print_broken_links
+from manifest import BuildManifest, MANIFEST_NAME, shard_manifest_name
+from functions import shard_of
+
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestShardedBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        for i in range(20):
+            write(self.root, f"content/section{i % 4}/page{i}.md", f"# Page {i}\n\nText with a [link](/page{i}).")
+        write(self.root, "content/index.md", "# Home")
+        write(self.root, "static/index.css", "body {}")
+        write(self.root, "template.html", "<title>{{ Title }}</title>{{ Content }}")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def read_tree(self, directory):
+        files = {}
+        for root, _, names in os.walk(directory):
+            for name in names:
+                path = os.path.join(root, name)
+                with open(path, 'rb') as f:
+                    files[os.path.relpath(path, directory)] = f.read()
+        return files
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("1/4"), (1, 4))
+        for text in ("4/4", "x/2", "1", "0/0"):
+            with self.assertRaises(Exception):
+                parse_shard(text)
+
+    def test_shard_assignment_is_stable(self):
+        self.assertEqual(shard_of("blog/post.md", 7), shard_of(os.path.join("blog", "post.md"), 7))
+        counts = [0] * 4
+        for i in range(400):
+            counts[shard_of(f"section/page{i}.md", 4)] += 1
+        self.assertTrue(all(count > 50 for count in counts))
+
+    def test_shard_processes_match_single_build(self):
+        build(self.root, "/site/")
+        expected = self.read_tree(os.path.join(self.root, "docs"))
+        os.remove(os.path.join(self.root, ".cache", MANIFEST_NAME))
+        for page in expected:
+            if page.endswith(".html"):
+                os.remove(os.path.join(self.root, "docs", page))
+
+        env = dict(os.environ, PYTHONPATH=SRC_DIR)
+        processes = [
+            subprocess.Popen([sys.executable, os.path.join(SRC_DIR, "main.py"), "/site/", "--shard", f"{i}/3"],
+                             cwd=self.root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            for i in range(3)
+        ]
+        for process in processes:
+            _, stderr = process.communicate()
+            self.assertEqual(process.returncode, 0, stderr)
+        result = subprocess.run([sys.executable, os.path.join(SRC_DIR, "main.py"), "merge-shards", "3"],
+                                cwd=self.root, env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+
+        self.assertEqual(self.read_tree(os.path.join(self.root, "docs")), expected)
+        merged = BuildManifest.load(os.path.join(self.root, ".cache", MANIFEST_NAME))
+        self.assertEqual(len(merged.pages), 21)
+        self.assertIn("index.css", merged.assets)
+        self.assertEqual(build(self.root, "/site/", incremental=True)["unchanged"], 21)
+
+    def test_merge_reports_missing_and_duplicate_pages(self):
+        for i in range(2):
+            build(self.root, shard=(i, 2))
+        self.assertEqual(merge_shards(self.root, 2), [])
+
+        state_dir = os.path.join(self.root, ".cache")
+        first = BuildManifest.load(os.path.join(state_dir, shard_manifest_name(0, 2)))
+        second_path = os.path.join(state_dir, shard_manifest_name(1, 2))
+        second = BuildManifest.load(second_path)
+        source, entry = next(iter(first.pages.items()))
+        second.pages[source] = entry
+        second.save(second_path)
+        problems = merge_shards(self.root, 2)
+        self.assertIn(f"{source}: produced by shards 0, 1", problems)
+        self.assertIn(f"{source}: produced by shard 1 but assigned to shard 0", problems)
+
+        os.remove(second_path)
+        problems = merge_shards(self.root, 2)
+        self.assertTrue(any("manifest" in problem and "missing" in problem for problem in problems))
+        self.assertTrue(any("not produced by any shard" in problem for problem in problems))
+
+    def test_check_links_reports_a_capped_list_and_fails(self):
+        env = dict(os.environ, PYTHONPATH=SRC_DIR)
+        main_py = os.path.join(SRC_DIR, "main.py")
+        result = subprocess.run([sys.executable, main_py], cwd=self.root, env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertNotIn("broken", result.stdout)
+
+        result = subprocess.run([sys.executable, main_py, "--incremental", "--check-links"], cwd=self.root, env=env,
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 1, result.stderr)
+        self.assertIn("20 broken internal links", result.stdout)
+        self.assertEqual(result.stdout.count(": broken link "), 20)
+
+        write(self.root, "content/page0.md", "# Page 0")
+        result = subprocess.run([sys.executable, main_py, "--incremental", "--check-links"], cwd=self.root, env=env,
+                                capture_output=True, text=True)
+        self.assertIn("19 broken internal links", result.stdout)
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            print_broken_links([("a.md", "/x"), ("b.md", "/y"), ("c.md", "/z")], shown=2)
+        self.assertEqual(out.getvalue().splitlines(),
+                         ["3 broken internal links", "  a.md: broken link /x", "  b.md: broken link /y", "  ... and 1 more"])
+
+    def test_merge_ignores_drafts(self):
+        write(self.root, "content/draft.md", "---\ndraft: true\n---\n# Draft")
+        for i in range(2):
+            build(self.root, shard=(i, 2))
+        self.assertEqual(merge_shards(self.root, 2), [])
+        for i in range(2):
+            build(self.root, shard=(i, 2), drafts=True)
+        self.assertEqual(merge_shards(self.root, 2, drafts=True), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
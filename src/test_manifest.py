@@ -0,0 +1,66 @@
+import unittest
+import tempfile
+import os
+
+from manifest import BuildManifest, hash_bytes, hash_file
+
+
+class TestBuildManifest(unittest.TestCase):
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "manifest.json")
+            manifest = BuildManifest(basepath="/")
+            manifest.record("index.md", "123", "index.html", deps={"template.html": "abc"})
+            manifest.save(path)
+
+            loaded = BuildManifest.load(path)
+            self.assertTrue(loaded.settings_match("/"))
+            self.assertTrue(loaded.is_fresh("index.md", "123", "index.html", {"template.html": "abc"}))
+            self.assertFalse(loaded.is_fresh("index.md", "456", "index.html", {"template.html": "abc"}))
+            self.assertFalse(loaded.is_fresh("index.md", "123", "index.html", {"template.html": "def"}))
+            self.assertFalse(loaded.is_fresh("other.md", "123", "other.html", {"template.html": "abc"}))
+
+    def test_missing_or_corrupt_manifest_is_empty(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "manifest.json")
+            self.assertEqual(BuildManifest.load(path).pages, {})
+
+            with open(path, 'w') as f:
+                f.write("not json")
+            self.assertEqual(BuildManifest.load(path).pages, {})
+
+            with open(path, 'w') as f:
+                f.write('{"version": 0, "pages": {"a.md": {}}}')
+            self.assertEqual(BuildManifest.load(path).pages, {})
+
+    def test_settings_match(self):
+        manifest = BuildManifest(basepath="/")
+        self.assertTrue(manifest.settings_match("/"))
+        self.assertFalse(manifest.settings_match("/site/"))
+
+    def test_dependents(self):
+        manifest = BuildManifest(basepath="/")
+        manifest.record("a.md", "1", "a.html", deps={"template.html": "t", "partials/nav.html": "n"})
+        manifest.record("b.md", "2", "b.html", deps={"template.html": "t"})
+        self.assertEqual(manifest.dependents("partials/nav.html"), ["a.md"])
+        self.assertEqual(sorted(manifest.dependents("template.html")), ["a.md", "b.md"])
+
+    def test_invalidate_keeps_outputs(self):
+        manifest = BuildManifest(basepath="/")
+        manifest.record("index.md", "123", "index.html", "out")
+        manifest.invalidate()
+        self.assertFalse(manifest.settings_match("/"))
+        self.assertFalse(manifest.is_fresh("index.md", "123", "index.html"))
+        self.assertEqual(manifest.pages["index.md"], {"dest": "index.html", "output": "out"})
+
+    def test_hash_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "a.md")
+            with open(path, 'wb') as f:
+                f.write(b"# Title")
+            self.assertEqual(hash_file(path), hash_bytes(b"# Title"))
+            self.assertNotEqual(hash_file(path), hash_bytes(b"# Other"))
+
+
+if __name__ == "__main__":
+    unittest.main()
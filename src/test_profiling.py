@@ -0,0 +1,57 @@
+import unittest
+import tempfile
+import json
+import os
+
+import profiling
+
+
+class TestProfiling(unittest.TestCase):
+    def tearDown(self):
+        profiling.disable()
+
+    def test_disabled_stage_is_shared_noop(self):
+        profiling.disable()
+        self.assertIs(profiling.stage("read"), profiling.stage("write"))
+        with profiling.stage("read"):
+            pass
+
+    def test_summary_and_trace(self):
+        profiler = profiling.enable()
+        for page in ["a.md", "b.md"]:
+            with profiling.stage("page", page):
+                with profiling.stage("parse"):
+                    sum(range(1000 if page == "a.md" else 100000))
+        self.assertEqual(profiler.stage_totals()["parse"][0], 2)
+        self.assertEqual(profiler.slowest_pages(1)[0][0], "b.md")
+        self.assertIn("parse", profiler.summary())
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "trace.json")
+            profiler.write_trace(path)
+            with open(path) as f:
+                events = json.load(f)["traceEvents"]
+            self.assertEqual(len(events), 4)
+            self.assertTrue(all(event["ph"] == "X" for event in events))
+
+    def test_build_records_page_stages_across_workers(self):
+        from functions import generate_pages_recursively
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            content_dir = os.path.join(tmpdir, "content")
+            os.makedirs(content_dir)
+            for i in range(3):
+                with open(os.path.join(content_dir, f"p{i}.md"), 'w') as f:
+                    f.write(f"# Page {i}\n\ntext")
+            template_path = os.path.join(tmpdir, "template.html")
+            with open(template_path, 'w') as f:
+                f.write("{{ Title }}{{ Content }}")
+
+            profiler = profiling.enable()
+            generate_pages_recursively(content_dir, template_path, os.path.join(tmpdir, "docs"), "/", jobs=2)
+            self.assertEqual(len(profiler.slowest_pages(10)), 3)
+            self.assertEqual(profiler.stage_totals()["parse"][0], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+import tempfile
+import os
+
+from render_cache import RenderCache
+from functions import (
+    BlockType,
+    PARSER_VERSION,
+    markdown_to_html,
+    markdown_to_html_node,
+    render_pages,
+)
+from template import Template
+
+
+MARKDOWN = """# Heading
+
+A paragraph with **bold** and a [link](/page).
+
+- one
+- two
+
+```
+code
+```
+
+> a quote"""
+
+
+class TestRenderCache(unittest.TestCase):
+    def test_put_flush_and_get(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cache", "render.sqlite")
+            cache = RenderCache(path, 1)
+            key = RenderCache.key("text", BlockType.PARAGRAPH, "/")
+            self.assertIsNone(cache.get(key))
+            cache.put(key, "<p>text</p>")
+            self.assertEqual(cache.get(key), "<p>text</p>")
+            cache.close()
+
+            cache = RenderCache(path, 1)
+            self.assertEqual(cache.get(key), "<p>text</p>")
+            self.assertEqual((cache.hits, cache.misses), (1, 0))
+            cache.close()
+
+    def test_flushes_in_batches(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "render.sqlite")
+            cache = RenderCache(path, 1, flush_rows=3)
+            for i in range(7):
+                cache.put(f"k{i}", f"<p>{i}</p>")
+                self.assertLess(len(cache.pending), 3)
+            self.assertEqual(cache.connection.execute("SELECT COUNT(*) FROM blocks").fetchone()[0], 6)
+            cache.close()
+
+            cache = RenderCache(path, 1)
+            self.assertEqual([cache.get(f"k{i}") for i in range(7)], [f"<p>{i}</p>" for i in range(7)])
+            cache.close()
+
+    def test_key_depends_on_type_and_basepath(self):
+        key = RenderCache.key("text", BlockType.PARAGRAPH, "/")
+        self.assertNotEqual(key, RenderCache.key("text", BlockType.QUOTE, "/"))
+        self.assertNotEqual(key, RenderCache.key("text", BlockType.PARAGRAPH, "/site/"))
+        self.assertNotEqual(key, RenderCache.key("other", BlockType.PARAGRAPH, "/"))
+
+    def test_version_change_clears_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "render.sqlite")
+            cache = RenderCache(path, 1)
+            cache.put("k", "<p>old</p>")
+            cache.close()
+
+            cache = RenderCache(path, 2)
+            self.assertIsNone(cache.get("k"))
+            cache.close()
+
+    def test_evicts_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "render.sqlite")
+            cache = RenderCache(path, 1, max_bytes=25)
+            cache.put("old", "x" * 10)
+            cache.flush()
+            cache.put("new", "y" * 10)
+            cache.flush()
+            cache.get("old")
+            cache.put("newest", "z" * 10)
+            cache.close()
+
+            cache = RenderCache(path, 1, max_bytes=25)
+            self.assertIsNone(cache.get("new"))
+            self.assertEqual(cache.get("old"), "x" * 10)
+            self.assertEqual(cache.get("newest"), "z" * 10)
+            cache.close()
+
+
+class TestCachedRendering(unittest.TestCase):
+    def test_cached_output_matches_uncached(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = RenderCache(os.path.join(tmpdir, "render.sqlite"), PARSER_VERSION)
+            expected = markdown_to_html_node(MARKDOWN, basepath="/site/").to_html()
+            self.assertEqual(markdown_to_html(MARKDOWN, "/site/", cache), expected)
+            self.assertEqual(cache.hits, 0)
+            self.assertEqual(markdown_to_html(MARKDOWN, "/site/", cache), expected)
+            self.assertEqual(cache.hits, 5)
+            self.assertEqual(markdown_to_html("", None, cache), "<div></div>")
+            self.assertEqual(markdown_to_html("# Only", None, cache), "<h1>Only</h1>")
+            cache.close()
+
+    def test_render_pages_reuses_unchanged_blocks(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            template_path = os.path.join(tmpdir, "template.html")
+            with open(template_path, 'w') as f:
+                f.write("<title>{{ Title }}</title>{{ Content }}")
+            source = os.path.join(tmpdir, "page.md")
+            with open(source, 'w') as f:
+                f.write(MARKDOWN)
+            cache_path = os.path.join(tmpdir, ".cache", "render.sqlite")
+            cached = os.path.join(tmpdir, "page.html")
+
+            stats = render_pages([(source, cached)], template_path, "/", cache_path=cache_path)
+            self.assertEqual(stats["cache_misses"], 5)
+
+            with open(source, 'a') as f:
+                f.write("\n\nA new paragraph.")
+            stats = render_pages([(source, cached)], template_path, "/", cache_path=cache_path)
+            self.assertEqual((stats["cache_hits"], stats["cache_misses"]), (5, 1))
+
+            template = Template.from_file(template_path, "/")
+            with open(source) as f, open(cached) as g:
+                self.assertEqual(g.read(), template.render("Heading", markdown_to_html_node(f.read(), "/").to_html()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import tempfile
+import json
+import os
+
+from functions import PageOutline, markdown_to_html_node
+from fixtures import write
+from main import build
+from search import SEARCH_INDEX_NAME, build_search_index, decode_postings, page_url
+from manifest import BuildManifest
+
+
+class TestPageOutlineTerms(unittest.TestCase):
+    def test_terms_come_from_plain_text(self):
+        outline = PageOutline(terms=True)
+        markdown_to_html_node("# Title\n\nSome **Bold** [link text](/url) ![alt](/a.png) a\n\n```\nprint(x)\n```", outline=outline)
+        self.assertEqual(outline.terms, {"title", "some", "bold", "link", "text", "print"})
+        self.assertEqual(outline.links, ["/url", "/a.png"])
+
+    def test_terms_are_not_collected_by_default(self):
+        outline = PageOutline()
+        markdown_to_html_node("Some text", outline=outline)
+        self.assertIsNone(outline.terms)
+
+
+class TestSearchIndex(unittest.TestCase):
+    def test_postings_are_delta_encoded(self):
+        manifest = BuildManifest(pages={source: {"dest": source[:-3] + ".html"} for source in ("a.md", "b.md", "c.md")})
+        search_terms = {
+            "a.md": {"title": "A", "terms": ["common", "first"]},
+            "b.md": {"title": "B", "terms": ["middle"]},
+            "c.md": {"title": "C", "terms": ["common"]},
+            "gone.md": {"title": "Gone", "terms": ["common"]},
+        }
+        index = build_search_index(search_terms, manifest, "/site/")
+        self.assertNotIn("gone.md", search_terms)
+        self.assertEqual(index["pages"], [["/site/a.html", "A"], ["/site/b.html", "B"], ["/site/c.html", "C"]])
+        self.assertEqual(index["terms"]["common"], [0, 2])
+        self.assertEqual(decode_postings(index["terms"]["common"]), [0, 2])
+        self.assertEqual(decode_postings(index["terms"]["middle"]), [1])
+
+    def test_page_url(self):
+        self.assertEqual(page_url("index.html", "/"), "/")
+        self.assertEqual(page_url(os.path.join("blog", "index.html"), "/site/"), "/site/blog/")
+        self.assertEqual(page_url("about.html", "/"), "/about.html")
+
+
+class TestSearchIndexBuild(unittest.TestCase):
+    def read_index(self, root):
+        with open(os.path.join(root, "docs", SEARCH_INDEX_NAME)) as f:
+            index = json.load(f)
+        return {term: [index["pages"][i][1] for i in decode_postings(ids)] for term, ids in index["terms"].items()}
+
+    def test_incremental_build_updates_index(self):
+        with tempfile.TemporaryDirectory() as root:
+            write(root, "template.html", "<title>{{ Title }}</title>{{ Content }}")
+            write(root, "content/index.md", "# Home\n\nWelcome to the elves")
+            write(root, "content/blog/elves.md", "# Elves\n\nAbout elves")
+            build(root, search_index=True)
+            self.assertEqual([name for name in os.listdir(os.path.join(root, "docs")) if name.startswith(".")], [])
+            terms = self.read_index(root)
+            self.assertEqual(terms["elves"], ["Elves", "Home"])
+            self.assertEqual(terms["welcome"], ["Home"])
+
+            write(root, "content/index.md", "# Home\n\nWelcome to the dwarves")
+            os.remove(os.path.join(root, "content", "blog", "elves.md"))
+            write(root, "content/tom.md", "# Tom\n\nBombadil")
+            stats = build(root, incremental=True, search_index=True)
+            self.assertEqual((stats["rendered"], stats["removed"]), (2, 1))
+            terms = self.read_index(root)
+            self.assertNotIn("elves", terms)
+            self.assertEqual(terms["dwarves"], ["Home"])
+            self.assertEqual(terms["bombadil"], ["Tom"])
+
+            stats = build(root, incremental=True, search_index=True)
+            self.assertEqual((stats["rendered"], stats["unchanged"]), (0, 2))
+            self.assertEqual(self.read_index(root), terms)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+import unittest
+import tempfile
+import os
+import threading
+import time
+
+from fixtures import read, write
+from server import ReloadNotifier, SiteWatcher, inject_livereload, LIVERELOAD_SCRIPT
+
+
+class TestSiteWatcher(unittest.TestCase):
+    def setUp(self):
+        from main import build
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        write(self.root, "content/index.md", "# Home\n\nWelcome")
+        write(self.root, "content/blog/post.md", "# Post\n\nHello")
+        write(self.root, "static/index.css", "body {}")
+        write(self.root, "template.html", "<title>{{ Title }}</title>{{ Content }}")
+        build(self.root)
+        self.notifier = ReloadNotifier()
+        self.watcher = SiteWatcher(self.root, notifier=self.notifier)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_poll_without_changes_does_nothing(self):
+        self.assertEqual(self.watcher.poll(), [])
+        self.assertEqual(self.notifier.generation, 0)
+
+    def test_changed_page_is_rerendered(self):
+        write(self.root, "content/blog/post.md", "# Post\n\nEdited")
+        changed = self.watcher.poll()
+        self.assertEqual(changed, [os.path.join(self.root, "content", "blog", "post.md")])
+        self.assertIn("<p>Edited</p>", read(self.root, "blog/post.html"))
+        self.assertEqual(self.notifier.generation, 1)
+
+    def test_template_change_rerenders_every_page(self):
+        write(self.root, "template.html", "<h1>{{ Title }}</h1>{{ Content }}")
+        self.watcher.poll()
+        self.assertTrue(read(self.root, "index.html").startswith("<h1>Home</h1>"))
+        self.assertTrue(read(self.root, "blog/post.html").startswith("<h1>Post</h1>"))
+
+    def test_section_template_change_rerenders_only_its_pages(self):
+        write(self.root, "content/blog/_template.html", "<h2>{{ Title }}</h2>{{ Content }}")
+        index = read(self.root, "index.html")
+        self.watcher.poll()
+        self.assertTrue(read(self.root, "blog/post.html").startswith("<h2>Post</h2>"))
+        self.assertEqual(read(self.root, "index.html"), index)
+        self.assertFalse(os.path.exists(os.path.join(self.root, "docs", "blog", "_template.html")))
+
+    def test_template_and_page_change_render_the_page_once(self):
+        rendered = []
+        render = self.watcher.render
+        self.watcher.render = lambda from_path: rendered.append(from_path) or render(from_path)
+        write(self.root, "template.html", "<h1>{{ Title }}</h1>{{ Content }}")
+        write(self.root, "content/blog/post.md", "# Post\n\nEdited")
+        self.watcher.poll()
+        self.assertEqual(sorted(rendered), [os.path.join(self.root, "content", "blog", "post.md"),
+                                            os.path.join(self.root, "content", "index.md")])
+        self.assertEqual(read(self.root, "blog/post.html"), "<h1>Post</h1><div><h1>Post</h1><p>Edited</p></div>")
+
+    def test_partial_change_rerenders_only_its_dependents(self):
+        from main import build
+
+        os.makedirs(os.path.join(self.root, "partials"))
+        write(self.root, "partials/nav.html", "<nav>old</nav>")
+        write(self.root, "content/blog/_template.html", "{{> nav }}<h2>{{ Title }}</h2>{{ Content }}")
+        build(self.root)
+        self.watcher = SiteWatcher(self.root)
+        self.assertEqual(self.watcher.manifest.dependents("partials/nav.html"), [os.path.join("blog", "post.md")])
+        index_path = os.path.join(self.root, "docs", "index.html")
+        os.utime(index_path, ns=(0, 0))
+
+        write(self.root, "partials/nav.html", "<nav>new</nav>")
+        self.watcher.poll()
+        self.assertTrue(read(self.root, "blog/post.html").startswith("<nav>new</nav><h2>Post</h2>"))
+        self.assertEqual(os.stat(index_path).st_mtime_ns, 0)
+
+    def test_new_deleted_and_static_files(self):
+        write(self.root, "content/new.md", "# New")
+        write(self.root, "static/index.css", "body { color: red }")
+        os.remove(os.path.join(self.root, "content", "blog", "post.md"))
+        self.watcher.poll()
+        self.assertIn("New", read(self.root, "new.html"))
+        self.assertEqual(read(self.root, "index.css"), "body { color: red }")
+        self.assertFalse(os.path.exists(os.path.join(self.root, "docs", "blog")))
+
+    def read_pages(self):
+        pages = {}
+        for root, _, names in os.walk(os.path.join(self.root, "docs")):
+            for name in names:
+                if name.endswith(".html"):
+                    path = os.path.join(root, name)
+                    with open(path) as f:
+                        pages[os.path.relpath(path, self.root)] = f.read()
+        return pages
+
+    def test_outputs_are_replaced_not_rewritten_in_place(self):
+        page_inode = os.stat(os.path.join(self.root, "docs", "blog", "post.html")).st_ino
+        css_inode = os.stat(os.path.join(self.root, "docs", "index.css")).st_ino
+        write(self.root, "content/blog/post.md", "# Post\n\nEdited")
+        write(self.root, "static/index.css", "body { color: red }")
+        self.watcher.poll()
+        self.assertNotEqual(os.stat(os.path.join(self.root, "docs", "blog", "post.html")).st_ino, page_inode)
+        self.assertNotEqual(os.stat(os.path.join(self.root, "docs", "index.css")).st_ino, css_inode)
+        self.assertEqual([name for name in os.listdir(os.path.join(self.root, "docs")) if name.endswith(".tmp")], [])
+
+    def test_idle_polling_backs_off(self):
+        polls = []
+        stop_event = threading.Event()
+        self.watcher.poll = lambda: polls.append(time.perf_counter()) or []
+        thread = threading.Thread(target=self.watcher.run, args=(0.01, stop_event, 0.08))
+        thread.start()
+        time.sleep(0.5)
+        stop_event.set()
+        thread.join()
+        self.assertLess(len(polls), 12)
+        self.assertGreater(polls[-1] - polls[-2], 0.07)
+
+    def test_drafts_and_slugs_match_the_batch_build(self):
+        from main import build
+
+        write(self.root, "content/draft.md", "---\ndraft: true\n---\n# Draft")
+        write(self.root, "content/blog/post.md", "---\nslug: hello\n---\n# Post\n\nHello")
+        self.watcher.poll()
+        watched = self.read_pages()
+        self.assertIn(os.path.join("docs", "blog", "hello.html"), watched)
+        build(self.root)
+        self.assertEqual(watched, self.read_pages())
+
+        self.watcher = SiteWatcher(self.root)
+        write(self.root, "content/draft.md", "# Draft")
+        write(self.root, "content/blog/post.md", "---\nslug: hello\ndraft: true\n---\n# Post")
+        self.watcher.poll()
+        watched = self.read_pages()
+        self.assertIn(os.path.join("docs", "draft.html"), watched)
+        build(self.root)
+        self.assertEqual(watched, self.read_pages())
+
+
+class TestLiveReload(unittest.TestCase):
+    def test_inject_livereload(self):
+        self.assertEqual(inject_livereload("<body>x</body>"), f"<body>x{LIVERELOAD_SCRIPT}</body>")
+        self.assertEqual(inject_livereload("x"), "x" + LIVERELOAD_SCRIPT)
+
+    def test_notifier_wakes_waiters(self):
+        notifier = ReloadNotifier()
+        results = []
+        thread = threading.Thread(target=lambda: results.append(notifier.wait(0, timeout=5)))
+        thread.start()
+        notifier.notify()
+        thread.join()
+        self.assertEqual(results, [1])
+        self.assertEqual(notifier.wait(1, timeout=0), 1)
+
+    def test_handler_serves_pages_and_events(self):
+        import functools
+        import http.client
+        from http.server import ThreadingHTTPServer
+        from server import LiveReloadHandler, LIVERELOAD_PATH
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, "index.html"), 'w') as f:
+                f.write("<body>home</body>")
+            class QuietHandler(LiveReloadHandler):
+                def log_message(self, *args):
+                    pass
+
+            notifier = ReloadNotifier()
+            handler = functools.partial(QuietHandler, directory=tmpdir, notifier=notifier)
+            httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+            httpd.daemon_threads = True
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", httpd.server_address[1], timeout=5)
+                conn.request("GET", "/")
+                self.assertIn(LIVERELOAD_SCRIPT, conn.getresponse().read().decode())
+
+                events = http.client.HTTPConnection("127.0.0.1", httpd.server_address[1], timeout=5)
+                events.request("GET", LIVERELOAD_PATH)
+                response = events.getresponse()
+                self.assertEqual(response.getheader("Content-Type"), "text/event-stream")
+                notifier.notify()
+                self.assertEqual(response.fp.readline(), b"data: reload\n")
+                events.close()
+            finally:
+                httpd.shutdown()
+                httpd.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import tempfile
+import os
+
+import sources
+from sources import decode_source, parse_front_matter, read_front_matter, read_source, source_encoding, split_front_matter
+
+
+def read_markdown(path):
+    with open(path, 'rb') as f:
+        return read_source(f)
+
+
+class TestDecodeSource(unittest.TestCase):
+    def test_utf8(self):
+        self.assertEqual(decode_source("# Café ✓".encode("utf-8")), "# Café ✓")
+
+    def test_line_endings_are_normalised(self):
+        self.assertEqual(decode_source(b"# A\r\n\r\nb\rc\n"), "# A\n\nb\nc\n")
+
+    def test_falls_back_to_detected_encoding(self):
+        text = "# Résumé\n\nCafé crème, naïve façade et œuvre déjà célèbre à Noël.\n" * 4
+        decoded = decode_source(text.encode("cp1252"))
+        self.assertTrue(decoded.startswith("# Résumé\n\nCafé"))
+
+
+class TestReadSource(unittest.TestCase):
+    def test_small_and_mapped_reads_match(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "a.md")
+            text = "# Title\r\n\r\nSome ünïcode text.\r\n" * 1000
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                f.write(text)
+            with open(path, 'r', encoding='utf-8') as f:
+                expected = f.read()
+            self.assertEqual(read_markdown(path), expected)
+
+            threshold = sources.MMAP_THRESHOLD
+            sources.MMAP_THRESHOLD = 1
+            try:
+                self.assertEqual(read_markdown(path), expected)
+            finally:
+                sources.MMAP_THRESHOLD = threshold
+
+    def test_empty_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "a.md")
+            open(path, 'wb').close()
+            sources.MMAP_THRESHOLD, threshold = 0, sources.MMAP_THRESHOLD
+            try:
+                self.assertEqual(read_markdown(path), "")
+            finally:
+                sources.MMAP_THRESHOLD = threshold
+
+    def test_source_encoding(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "a.md")
+            text = "# Résumé\n\nCafé crème, naïve façade et œuvre déjà célèbre à Noël.\n" * 4
+            with open(path, 'wb') as f:
+                f.write(text.encode("utf-8"))
+            sources.MMAP_THRESHOLD, threshold = 7, sources.MMAP_THRESHOLD
+            try:
+                self.assertEqual(source_encoding(path), "utf-8")
+            finally:
+                sources.MMAP_THRESHOLD = threshold
+            with open(path, 'wb') as f:
+                f.write(text.encode("cp1252"))
+            with open(path, 'r', encoding=source_encoding(path)) as f:
+                self.assertEqual(f.read(), read_markdown(path))
+
+
+
+class TestFrontMatter(unittest.TestCase):
+    def test_yaml_and_toml_styles(self):
+        front, body = split_front_matter('---\ntitle: "Hello: world"\ndraft: true\n# comment\ndate: 2026-01-02\n---\n# Body\n')
+        self.assertEqual(front, {"title": "Hello: world", "draft": True, "date": "2026-01-02"})
+        self.assertEqual(body, "# Body\n")
+        front, body = split_front_matter("+++\nslug = 'short'\ndraft = false\n+++\n# Body")
+        self.assertEqual(front, {"slug": "short", "draft": False})
+        self.assertEqual(body, "# Body")
+
+    def test_without_front_matter(self):
+        self.assertEqual(split_front_matter("# Title\n---\n"), ({}, "# Title\n---\n"))
+        self.assertEqual(split_front_matter("----\ntext"), ({}, "----\ntext"))
+        self.assertEqual(parse_front_matter(iter([])), ({}, None))
+
+    def test_unclosed_front_matter(self):
+        with self.assertRaises(ValueError):
+            split_front_matter("---\ntitle: x\n# Body")
+
+    def test_read_front_matter_stops_at_closing_delimiter(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "page.md")
+            with open(path, 'wb') as f:
+                f.write(b"---\ndraft: true\n---\n# Body\n\xff\xfe not utf-8")
+            self.assertEqual(read_front_matter(path), {"draft": True})
+
+    def test_read_front_matter_decodes_like_the_render_path(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "page.md")
+            with open(path, 'wb') as f:
+                f.write("---\r\ntitle: Crème brûlée à la française, déjà vue\r\n---\r\n# Body".encode("cp1252"))
+            self.assertEqual(read_front_matter(path), split_front_matter(read_markdown(path))[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
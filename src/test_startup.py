@@ -0,0 +1,73 @@
+import unittest
+import tempfile
+import os
+import subprocess
+import sys
+
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules a plain build of a small site must not import; each is only needed by an opt-in
+# feature or a code path that small sites never reach. (shutil is not listed: argparse's help
+# formatter imports it.)
+LAZY_MODULES = {
+    "charset_normalizer",
+    "concurrent.futures",
+    "http.server",
+    "mmap",
+    "multiprocessing",
+    "sqlite3",
+    "typing",
+    "urllib.parse",
+}
+
+# Median cumulative import time of main with cached bytecode, in microseconds, over IMPORT_RUNS
+# runs. Measured at about 18.5 ms on the reference machine (52 ms before the startup work); the
+# margin absorbs noise but not a heavy module such as json, hashlib or urllib.parse creeping back.
+IMPORT_BUDGET_US = 25_000
+IMPORT_RUNS = 5
+
+
+def parse_importtime(stderr):
+    """
+    Parses -X importtime output into a dict of module name to cumulative microseconds.
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class TestColdStart(unittest.TestCase):
+    def run_importtime(self, args, cwd, env=None):
+        env = dict(env or os.environ, PYTHONPATH=SRC_DIR)
+        result = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=cwd, env=env,
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        return parse_importtime(result.stderr)
+
+    def test_small_build_imports_only_what_it_uses(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.makedirs(os.path.join(tmpdir, "content"))
+            with open(os.path.join(tmpdir, "content", "index.md"), 'w') as f:
+                f.write("# Home\n\nHello [world](/world).")
+            with open(os.path.join(tmpdir, "template.html"), 'w') as f:
+                f.write("<title>{{ Title }}</title>{{ Content }}")
+            modules = self.run_importtime([os.path.join(SRC_DIR, "main.py")], tmpdir)
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, "docs", "index.html")))
+        self.assertEqual(LAZY_MODULES & set(modules), set())
+
+    def test_import_time_budget(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            env = dict(os.environ, PYTHONPYCACHEPREFIX=tmpdir)
+            env.pop("PYTHONDONTWRITEBYTECODE", None)
+            self.run_importtime(["-c", "import main"], SRC_DIR, env)
+            times = sorted(self.run_importtime(["-c", "import main"], SRC_DIR, env)["main"] for _ in range(IMPORT_RUNS))
+        self.assertLess(times[IMPORT_RUNS // 2], IMPORT_BUDGET_US)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import tempfile
+import os
+
+from fixtures import write
+from template import Template, TemplateSet, rebase_url
+
+
+class TestTemplate(unittest.TestCase):
+    def test_render_fills_slots(self):
+        template = Template("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        self.assertEqual(template.render("Home", "<p>hi</p>"), "<title>Home</title><body><p>hi</p></body>")
+
+    def test_slots_are_case_and_space_insensitive(self):
+        template = Template("<h1>{{title}}</h1>{{  content }}")
+        self.assertEqual(template.render("T", "C"), "<h1>T</h1>C")
+
+    def test_only_first_occurrence_is_a_slot(self):
+        template = Template("{{ Content }}{{ Title }}{{ Content }}")
+        self.assertEqual(template.render("T", "C"), "CT{{ Content }}")
+
+    def test_basepath_is_applied_to_template(self):
+        template = Template('<link href="/index.css"><script src="/app.js"></script><a href="https://x/">{{ Content }}', "/site/")
+        self.assertEqual(
+            template.render("T", '<a href="/raw">'),
+            '<link href="/site/index.css"><script src="/site/app.js"></script><a href="https://x/"><a href="/raw">',
+        )
+
+    def test_rebase_url(self):
+        self.assertEqual(rebase_url("/blog/tom", "/site/"), "/site/blog/tom")
+        self.assertEqual(rebase_url("/blog/tom", "/"), "/blog/tom")
+        self.assertEqual(rebase_url("https://boot.dev", "/site/"), "https://boot.dev")
+        self.assertEqual(rebase_url("images/a.png", "/site/"), "images/a.png")
+
+
+
+class TestTemplateSet(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        self.content_dir = os.path.join(self.root, "content")
+        os.makedirs(os.path.join(self.content_dir, "blog", "2024"))
+        write(self.root, "template.html", "{{> header }}<main>{{ Content }}</main>")
+        write(self.root, "content/blog/_template.html", "{{> header }}<article>{{ Content }}</article>{{> footer }}")
+        write(self.root, "partials/header.html", '<title>{{ Title }}</title>{{> nav/main }}')
+        write(self.root, "partials/nav/main.html", '<a href="/">Home</a>')
+        write(self.root, "partials/footer.html", "<footer></footer>")
+        self.templates = TemplateSet(os.path.join(self.root, "template.html"), self.content_dir, "/site/")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_pages_use_nearest_section_template(self):
+        index, index_deps = self.templates.for_page(os.path.join(self.content_dir, "index.md"))
+        post, post_deps = self.templates.for_page(os.path.join(self.content_dir, "blog", "2024", "post.md"))
+        self.assertEqual(index.render("Home", "<p>hi</p>"),
+                         '<title>Home</title><a href="/site/">Home</a><main><p>hi</p></main>')
+        self.assertEqual(post.render("Post", "<p>hi</p>"),
+                         '<title>Post</title><a href="/site/">Home</a><article><p>hi</p></article><footer></footer>')
+        self.assertEqual(sorted(index_deps), ["partials/header.html", "partials/nav/main.html", "template.html"])
+        self.assertEqual(sorted(post_deps), ["content/blog/_template.html", "partials/footer.html",
+                                             "partials/header.html", "partials/nav/main.html"])
+
+    def test_compiled_templates_are_cached(self):
+        first = self.templates.for_page(os.path.join(self.content_dir, "blog", "a.md"))
+        second = self.templates.for_page(os.path.join(self.content_dir, "blog", "2024", "b.md"))
+        self.assertIs(first[0], second[0])
+
+    def test_without_content_dir_uses_site_template(self):
+        templates = TemplateSet(os.path.join(self.root, "template.html"))
+        template, _ = templates.for_page(os.path.join(self.content_dir, "blog", "a.md"))
+        self.assertIn("<main>", template.render("A", ""))
+
+    def test_front_matter_template_must_stay_in_the_site_root(self):
+        page = os.path.join(self.content_dir, "index.md")
+        template, deps = self.templates.for_page(page, "content/blog/../blog/_template.html")
+        self.assertEqual(list(deps)[0], "content/blog/_template.html")
+        os.symlink("/etc", os.path.join(self.root, "escape"))
+        for value in ("../../etc/passwd", "/etc/passwd", "escape/passwd"):
+            with self.assertRaisesRegex(ValueError, "outside the site root"):
+                self.templates.for_page(page, value)
+
+    def test_missing_and_recursive_partials(self):
+        write(self.root, "partials/footer.html", "{{> missing }}")
+        with self.assertRaisesRegex(ValueError, "not found"):
+            self.templates.for_page(os.path.join(self.content_dir, "blog", "a.md"))
+        write(self.root, "partials/nav/main.html", "{{> header }}")
+        with self.assertRaisesRegex(ValueError, "includes itself"):
+            TemplateSet(os.path.join(self.root, "template.html"), self.content_dir).for_page(os.path.join(self.content_dir, "a.md"))
+
+if __name__ == "__main__":
+    unittest.main()
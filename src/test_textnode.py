@@ -37,5 +37,19 @@ class TestTextNode(unittest.TestCase):
         expected_repr = "TextNode('Sample text', TextType.ITALIC, 'https://example.com')"
         self.assertEqual(repr(node), expected_repr)
 
+    def test_dispatch_table(self):
+        cases = [
+            (TextNode("b", TextType.BOLD), "<b>b</b>"),
+            (TextNode("i", TextType.ITALIC), "<i>i</i>"),
+            (TextNode("c", TextType.CODE), "<code>c</code>"),
+            (TextNode("l", TextType.LINK, "/x"), '<a href="/site/x">l</a>'),
+            (TextNode("a", TextType.IMAGE, "/i.png"), '<img src="/site/i.png" alt="a"></img>'),
+        ]
+        for node, expected in cases:
+            self.assertEqual(node.text_node_to_html_node("/site/").to_html(), expected)
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(TextNode("x", TextType.TEXT), "__dict__"))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
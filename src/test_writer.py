@@ -0,0 +1,57 @@
+import unittest
+import tempfile
+import os
+
+from writer import PageWriter, write_atomic
+
+
+class TestWriteAtomic(unittest.TestCase):
+    def test_replaces_file_without_leaving_temp_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "index.html")
+            write_atomic(path, b"old")
+            write_atomic(path, b"new")
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), b"new")
+            self.assertEqual(os.listdir(tmpdir), ["index.html"])
+
+
+class TestPageWriter(unittest.TestCase):
+    def test_writes_all_pages(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with PageWriter(threads=3, max_pending=2) as writer:
+                for i in range(50):
+                    writer.write(os.path.join(tmpdir, f"{i}.html"), f"<p>{i} ✓</p>")
+            self.assertEqual(len(os.listdir(tmpdir)), 50)
+            with open(os.path.join(tmpdir, "7.html"), encoding='utf-8') as f:
+                self.assertEqual(f.read(), "<p>7 ✓</p>")
+
+    def test_write_error_fails_flush_and_later_writes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            writer = PageWriter(threads=2)
+            missing = os.path.join(tmpdir, "missing", "index.html")
+            writer.write(missing, "<p>x</p>")
+            with self.assertRaisesRegex(RuntimeError, "Failed to write .*missing"):
+                writer.flush()
+            with self.assertRaises(RuntimeError):
+                writer.write(os.path.join(tmpdir, "a.html"), "<p>a</p>")
+            with self.assertRaises(RuntimeError):
+                writer.close()
+
+    def test_render_pages_fails_on_write_error(self):
+        from functions import render_pages
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            template_path = os.path.join(tmpdir, "template.html")
+            with open(template_path, 'w') as f:
+                f.write("{{ Title }}{{ Content }}")
+            source = os.path.join(tmpdir, "a.md")
+            with open(source, 'w') as f:
+                f.write("# A")
+            pages = [(source, os.path.join(tmpdir, "out", "a.html")), (source, os.path.join(tmpdir, "b.html"))]
+            with self.assertRaisesRegex(RuntimeError, "Failed to write"):
+                render_pages(pages, template_path, "/", write_threads=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
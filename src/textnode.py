@@ -1,5 +1,7 @@
 from enum import Enum
-from typing import Optional
+
+from htmlnode import LeafNode
+from template import rebase_url
 
 class TextType(Enum):
     TEXT = "text"
@@ -10,7 +12,9 @@ class TextType(Enum):
     IMAGE = "image"
 
 class TextNode:
-    def __init__(self, text: str, text_type: TextType, url: Optional[str] = None):
+    __slots__ = ("text", "text_type", "url")
+
+    def __init__(self, text: str, text_type: TextType, url: str | None = None):
         self.text = text
         self.text_type = text_type
         self.url = url
@@ -23,24 +27,28 @@ class TextNode:
     def __repr__(self):
         return f"TextNode({self.text!r}, {self.text_type}, {self.url!r})"
     
-    def text_node_to_html_node(self):
-        from htmlnode import LeafNode
-
-        if self.text_type == TextType.TEXT:
-            return LeafNode(tag=None, value=self.text)
-        elif self.text_type == TextType.BOLD:
-            return LeafNode(tag="b", value=self.text)
-        elif self.text_type == TextType.ITALIC:
-            return LeafNode(tag="i", value=self.text)
-        elif self.text_type == TextType.CODE:
-            return LeafNode(tag="code", value=self.text)
-        elif self.text_type == TextType.LINK:
-            if self.url is None:
-                raise ValueError("Link TextNode must have a URL")
-            return LeafNode(tag="a", value=self.text, props={"href": self.url})
-        elif self.text_type == TextType.IMAGE:
-            if self.url is None:
-                raise ValueError("Image TextNode must have a URL")
-            return LeafNode(tag="img", value="", props={"src": self.url, "alt": self.text})
-        else:
-            raise ValueError(f"Unsupported TextType: {self.text_type}")
\ No newline at end of file
+    def text_node_to_html_node(self, basepath=None):
+        convert = TEXT_TYPE_TO_HTML.get(self.text_type)
+        if convert is None:
+            raise ValueError(f"Unsupported TextType: {self.text_type}")
+        return convert(self, basepath)
+
+
+def _link_to_html(node, basepath):
+    if node.url is None:
+        raise ValueError("Link TextNode must have a URL")
+    return LeafNode(tag="a", value=node.text, props={"href": rebase_url(node.url, basepath)})
+
+def _image_to_html(node, basepath):
+    if node.url is None:
+        raise ValueError("Image TextNode must have a URL")
+    return LeafNode(tag="img", value="", props={"src": rebase_url(node.url, basepath), "alt": node.text})
+
+TEXT_TYPE_TO_HTML = {
+    TextType.TEXT: lambda node, basepath: LeafNode(tag=None, value=node.text),
+    TextType.BOLD: lambda node, basepath: LeafNode(tag="b", value=node.text),
+    TextType.ITALIC: lambda node, basepath: LeafNode(tag="i", value=node.text),
+    TextType.CODE: lambda node, basepath: LeafNode(tag="code", value=node.text),
+    TextType.LINK: _link_to_html,
+    TextType.IMAGE: _image_to_html,
+}
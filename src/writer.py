@@ -0,0 +1,128 @@
+import os
+import threading
+
+import profiling
+
+
+WRITE_THREADS = 4
+MAX_PENDING = 64
+
+
+def write_atomic(path, data):
+    """
+    Writes bytes to a file through a temporary sibling and a rename, so readers never see a
+    partially written file.
+
+    Args:
+        path (str): The destination path.
+        data (bytes): The file contents.
+    """
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class PageWriter:
+    """
+    Writes rendered pages behind the renderer on a pool of threads, so rendering the next page
+    overlaps with writing the previous one. At most max_pending pages wait in the queue; write()
+    blocks beyond that, which bounds memory when the disk is slower than rendering.
+
+    The first failed write is remembered: later write() calls and flush() raise it as a
+    RuntimeError naming the output file, so a write error fails the build. With a Compressor,
+    the writer threads also write each page's precompressed siblings.
+    """
+
+    def __init__(self, threads=WRITE_THREADS, max_pending=MAX_PENDING, compressor=None):
+        import queue
+
+        self.compressor = compressor
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.error = None
+        self.threads = [threading.Thread(target=self._run, name=f"page-writer-{i}", daemon=True) for i in range(threads)]
+        for thread in self.threads:
+            thread.start()
+
+    def __repr__(self):
+        return f"PageWriter(threads={len(self.threads)}, pending={self.queue.qsize()})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.close(raise_error=False)
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                path, data = item
+                if self.error is None:
+                    try:
+                        if isinstance(data, str):
+                            data = data.encode("utf-8")
+                        with profiling.stage("write", path):
+                            write_atomic(path, data)
+                        if self.compressor is not None:
+                            with profiling.stage("compress", path):
+                                self.compressor.compress_bytes(path, data)
+                    except Exception as e:
+                        self.error = RuntimeError(f"Failed to write {path}: {e}")
+                        self.error.__cause__ = e
+            finally:
+                self.queue.task_done()
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise self.error
+
+    def write(self, path, data):
+        """
+        Queues a page to be written, waiting while the queue is full.
+
+        Args:
+            path (str): The destination path.
+            data (str or bytes): The page HTML, encoded as UTF-8 when given as text.
+
+        Raises:
+            RuntimeError: If an earlier write failed.
+        """
+        self._raise_error()
+        self.queue.put((path, data))
+
+    def flush(self):
+        """
+        Waits until every queued page is written.
+
+        Raises:
+            RuntimeError: If any write failed.
+        """
+        self.queue.join()
+        self._raise_error()
+
+    def close(self, raise_error=True):
+        """
+        Waits for the queued pages and stops the writer threads.
+
+        Args:
+            raise_error (bool): Whether to raise a write error; False when already unwinding from another error.
+        """
+        if self.threads:
+            for _ in self.threads:
+                self.queue.put(None)
+            for thread in self.threads:
+                thread.join()
+            self.threads = []
+        if raise_error:
+            self._raise_error()